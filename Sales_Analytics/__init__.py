@@ -1,5 +1,14 @@
 from .data_loader import DataLoader
 from .stream_operations import StreamOperations
 from .sales_analytics import SalesAnalytics
+from .expressions import Expression, col, lit
+from .report_cache import ReportCache
+from .partitioned_dataset import PartitionedDataset
+from .indexes import TableIndexes
+from .sketches import BloomFilter, HyperLogLog, KLLSketch
+from .deduplication import Deduplicator
+from .report_runner import ReportRequest, ReportRunner
 
-__all__ = ['DataLoader', 'StreamOperations', 'SalesAnalytics']
\ No newline at end of file
+__all__ = ['DataLoader', 'StreamOperations', 'SalesAnalytics', 'Expression', 'col', 'lit',
+           'ReportCache', 'PartitionedDataset', 'TableIndexes', 'BloomFilter', 'HyperLogLog',
+           'KLLSketch', 'Deduplicator', 'ReportRequest', 'ReportRunner']
\ No newline at end of file
@@ -0,0 +1,353 @@
+import random
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # optional dependency
+    pa = pc = None
+
+try:
+    from .expressions import Expression
+    from .parallel import (factorize_keys, key_index, pack_codes, parallel_apply,
+                           parallel_group_aggregate, unpack_codes)
+except ImportError:
+    from expressions import Expression
+    from parallel import (factorize_keys, key_index, pack_codes, parallel_apply,
+                          parallel_group_aggregate, unpack_codes)
+
+
+def copy_on_write_enabled() -> bool:
+    """Check whether pandas defers copies until shared data is written to."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    try:
+        return pd.get_option('mode.copy_on_write') is True
+    except KeyError:
+        return False
+
+
+def to_dataframe(data: Any) -> pd.DataFrame:
+    """
+    Get a DataFrame for a DataFrame or Arrow table.
+
+    DataFrames are shallow-copied, so the result shares column buffers
+    with the input.
+    """
+    if pa is not None and isinstance(data, pa.Table):
+        return data.to_pandas()
+    return data.copy(deep=False)
+
+
+class PandasBackend:
+    """
+    Default execution backend: pandas DataFrames.
+
+    Backends implement the primitive operations StreamOperations and
+    SalesAnalytics are built from, on their own native table type.
+    """
+
+    name = 'pandas'
+
+    def wrap(self, data: Any, copy: bool = False) -> pd.DataFrame:
+        """Convert input data to the native table type (sharing buffers unless copy)."""
+        return to_dataframe(data).copy() if copy else to_dataframe(data)
+
+    def to_pandas(self, data: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+        """Convert a native table to a DataFrame the caller may modify."""
+        return data.copy(deep=copy)
+
+    def num_rows(self, data: pd.DataFrame) -> int:
+        return len(data)
+
+    def evaluate(self, func: Union[Expression, Callable], data: pd.DataFrame,
+                 workers: int = 1) -> pd.Series:
+        """
+        Evaluate a predicate or mapper over every row.
+
+        Column expressions are computed on whole columns at once; plain
+        callables fall back to a row-by-row apply, split across worker
+        processes when workers > 1 (see parallel.parallel_apply).
+        """
+        if isinstance(func, Expression):
+            return func.evaluate(data)
+        if len(data) == 0:
+            return pd.Series(index=data.index, dtype=object)
+        if workers > 1:
+            return parallel_apply(func, data, workers)
+        return data.apply(func, axis=1)
+
+    def to_series(self, values: pd.Series) -> pd.Series:
+        """Convert evaluated values to a Series."""
+        return values
+
+    def any(self, mask: pd.Series) -> bool:
+        return bool(mask.any())
+
+    def all(self, mask: pd.Series) -> bool:
+        return bool(mask.all())
+
+    def first_true(self, mask: pd.Series) -> Optional[int]:
+        """Position of the first true value, or None."""
+        positions = np.flatnonzero(mask.astype(bool).to_numpy())
+        return int(positions[0]) if len(positions) else None
+
+    def filter(self, data: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
+        return data if mask.all() else data[mask]
+
+    def take(self, data: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+        return data.iloc[positions]
+
+    def slice(self, data: pd.DataFrame, start: int, stop: Optional[int] = None) -> pd.DataFrame:
+        return data.iloc[start:stop]
+
+    def sort(self, data: pd.DataFrame, key: str, ascending: bool) -> pd.DataFrame:
+        return data.sort_values(by=key, ascending=ascending, kind='stable')
+
+    def unique(self, data: pd.DataFrame, column: Optional[str]) -> List[Any]:
+        """Distinct values of a column (or distinct rows) in order of appearance."""
+        if column:
+            return data[column].unique().tolist()
+        return data.drop_duplicates().values.tolist()
+
+    def column(self, data: pd.DataFrame, column: str) -> np.ndarray:
+        """Column values as a NumPy array."""
+        return data[column].to_numpy()
+
+    def column_list(self, data: pd.DataFrame, column: str) -> List[Any]:
+        """Column values as Python objects."""
+        return data[column].tolist()
+
+    def row(self, data: pd.DataFrame, position: int) -> pd.Series:
+        return data.iloc[position]
+
+    def sample_row(self, data: pd.DataFrame) -> pd.Series:
+        return data.sample(1).iloc[0]
+
+    def group_aggregate(self, data: pd.DataFrame, keys: List[str],
+                        stats: Dict[str, List[str]], workers: int = 1) -> pd.DataFrame:
+        """
+        Group rows and aggregate columns.
+
+        Args:
+            data: Rows to aggregate
+            keys: Grouping columns (missing values form their own group)
+            stats: Column -> statistics among 'sum', 'count', 'min', 'max'
+            workers: Processes to hash-partition the groups across (see
+                parallel.parallel_group_aggregate)
+
+        Returns:
+            DataFrame indexed by the keys in order of first appearance,
+            with (column, statistic) columns
+        """
+        if workers > 1:
+            return parallel_group_aggregate(data, keys, stats, workers, dropna=False, sort=False)
+        return (data.groupby(keys, dropna=False, observed=True, sort=False)
+                .agg(stats))
+
+
+class ArrowBackend(PandasBackend):
+    """
+    Columnar backend on Apache Arrow tables (requires pyarrow).
+
+    Column expressions, filters, sorts, slices and the grouped aggregation
+    behind SalesAnalytics reports run as multithreaded Arrow compute
+    kernels on zero-copy columnar buffers. Row-wise callables, and
+    expressions Arrow cannot evaluate (e.g. a timestamp compared with a
+    date string), are evaluated through pandas on the referenced columns.
+    Results match the pandas backend except that collected frames always
+    carry a fresh RangeIndex.
+    """
+
+    name = 'arrow'
+
+    def __init__(self):
+        if pa is None:
+            raise ImportError("The arrow backend requires pyarrow (pip install pyarrow)")
+        self._kernels = {
+            'add': pc.add, 'sub': pc.subtract, 'mul': pc.multiply, 'pow': pc.power,
+            # True division always yields floats, as in pandas
+            'truediv': lambda a, b: pc.divide(_as_float(a), _as_float(b)),
+            # Comparisons with a missing value are False (True for !=), as in
+            # pandas, so masks never hold nulls and ~, & and | agree as well
+            'eq': _compare(pc.equal, False), 'ne': _compare(pc.not_equal, True),
+            'lt': _compare(pc.less, False), 'le': _compare(pc.less_equal, False),
+            'gt': _compare(pc.greater, False), 'ge': _compare(pc.greater_equal, False),
+            'and': pc.and_kleene, 'or': pc.or_kleene, 'xor': pc.xor,
+            'invert': pc.invert, 'neg': pc.negate, 'abs': pc.abs,
+            'isin': lambda values, candidates: pc.is_in(
+                values, value_set=pa.array(candidates)),
+            'between': _compare(lambda values, low, high: pc.and_kleene(
+                pc.greater_equal(values, low), pc.less_equal(values, high)), False),
+        }
+
+    def wrap(self, data: Any, copy: bool = False) -> 'pa.Table':
+        # Arrow buffers are immutable, so sharing them is always safe
+        if isinstance(data, pa.Table):
+            return data
+        return pa.Table.from_pandas(data, preserve_index=False)
+
+    def to_pandas(self, data: 'pa.Table', copy: bool = True) -> pd.DataFrame:
+        # Arrow buffers are immutable, so the converted frame is always independent
+        return data.to_pandas()
+
+    def num_rows(self, data: 'pa.Table') -> int:
+        return data.num_rows
+
+    def _arrow_evaluate(self, expr: Expression, data: 'pa.Table') -> Any:
+        if expr.op == 'col':
+            return data.column(expr.operands[0])
+        if expr.op == 'lit':
+            return expr.operands[0]
+        kernel = self._kernels.get(expr.op)
+        if kernel is None:
+            raise NotImplementedError(expr.op)
+        return kernel(*(self._arrow_evaluate(operand, data) for operand in expr.operands))
+
+    def evaluate(self, func: Union[Expression, Callable], data: 'pa.Table',
+                 workers: int = 1) -> Any:
+        if isinstance(func, Expression):
+            try:
+                result = self._arrow_evaluate(func, data)
+            except (NotImplementedError, TypeError, pa.ArrowInvalid,
+                    pa.ArrowNotImplementedError, pa.ArrowTypeError):
+                columns = [c for c in data.column_names if c in func.columns()]
+                result = func.evaluate(data.select(columns).to_pandas())
+            if isinstance(result, (pa.Array, pa.ChunkedArray)):
+                return result
+            if isinstance(result, pa.Scalar):
+                result = result.as_py()
+            if isinstance(result, pd.Series):
+                return pa.array(result.to_numpy(), from_pandas=True)
+            return pa.array(np.full(data.num_rows, result))
+        values = super().evaluate(func, data.to_pandas(), workers)
+        return pa.array(values.to_numpy(), from_pandas=True)
+
+    def to_series(self, values: Any) -> pd.Series:
+        return values.to_pandas()
+
+    def any(self, mask: Any) -> bool:
+        return bool(pc.any(mask).as_py())
+
+    def all(self, mask: Any) -> bool:
+        # Missing values count as False, as in pandas
+        return bool(pc.all(pc.fill_null(mask, False)).as_py())
+
+    def first_true(self, mask: Any) -> Optional[int]:
+        position = pc.index(pc.fill_null(mask, False), True).as_py()
+        return None if position < 0 else position
+
+    def filter(self, data: 'pa.Table', mask: Any) -> 'pa.Table':
+        return data.filter(mask, null_selection_behavior='drop')
+
+    def take(self, data: 'pa.Table', positions: np.ndarray) -> 'pa.Table':
+        return data.take(pa.array(positions, type=pa.int64()))
+
+    def slice(self, data: 'pa.Table', start: int, stop: Optional[int] = None) -> 'pa.Table':
+        start = min(max(start, 0), data.num_rows)
+        stop = data.num_rows if stop is None else min(max(stop, start), data.num_rows)
+        return data.slice(start, stop - start)
+
+    def sort(self, data: 'pa.Table', key: str, ascending: bool) -> 'pa.Table':
+        return data.sort_by([(key, 'ascending' if ascending else 'descending')])
+
+    def unique(self, data: 'pa.Table', column: Optional[str]) -> List[Any]:
+        if column:
+            return pd.Series(pc.unique(data.column(column)).to_pandas()).tolist()
+        return super().unique(data.to_pandas(), None)
+
+    def column(self, data: 'pa.Table', column: str) -> np.ndarray:
+        return data.column(column).to_numpy()
+
+    def column_list(self, data: 'pa.Table', column: str) -> List[Any]:
+        return data.column(column).to_pandas().tolist()
+
+    def row(self, data: 'pa.Table', position: int) -> pd.Series:
+        return data.slice(position, 1).to_pandas().iloc[0]
+
+    def sample_row(self, data: 'pa.Table') -> pd.Series:
+        return self.row(data, random.randrange(data.num_rows))
+
+    def group_aggregate(self, data: pd.DataFrame, keys: List[str],
+                        stats: Dict[str, List[str]], workers: int = 1) -> pd.DataFrame:
+        # Arrow's grouped aggregation is already multithreaded, so workers
+        # is not used.
+        #
+        # Keys are grouped by their pandas factorization codes, so every
+        # key dtype (periods, categoricals, missing values) comes back
+        # exactly as the pandas backend would return it. The codes are
+        # packed into one int64 per row whenever they fit, so Arrow hashes
+        # a single column instead of one per key.
+        codes, uniques = factorize_keys(data, keys)
+        combined = pack_codes(codes, uniques)
+        if combined is not None:
+            columns = {'__key': combined}
+        else:
+            columns = {f"__key{i}": key_codes for i, key_codes in enumerate(codes)}
+        group_keys = list(columns)
+        columns['__row'] = np.arange(len(data), dtype=np.int64)
+        table = pa.table({**{name: pa.array(values) for name, values in columns.items()},
+                          **{column: pa.array(data[column].to_numpy(), from_pandas=True)
+                             for column in stats}})
+
+        aggregations = [('__row', 'min')]
+        aggregations += [(column, stat) for column, column_stats in stats.items()
+                         for stat in column_stats]
+        grouped = table.group_by(group_keys).aggregate(aggregations)
+        # Order groups by first appearance, like groupby(sort=False)
+        grouped = grouped.take(pc.sort_indices(grouped.column('__row_min')))
+
+        if combined is not None:
+            group_codes = unpack_codes(grouped.column('__key').to_numpy(), uniques)
+        else:
+            group_codes = [grouped.column(name).to_numpy() for name in group_keys]
+        index = key_index(group_codes, uniques, keys)
+        result = {}
+        for column, column_stats in stats.items():
+            for stat in column_stats:
+                values = grouped.column(f"{column}_{stat}").to_pandas()
+                if stat == 'sum':
+                    # pandas sums of all-missing groups are 0, Arrow's are null
+                    values = values.fillna(0)
+                result[(column, stat)] = values.to_numpy()
+        return pd.DataFrame(result, index=index)
+
+
+def _as_float(value: Any) -> Any:
+    """Cast an Arrow integer array to float64 (other values pass through)."""
+    if isinstance(value, (pa.Array, pa.ChunkedArray)) and pa.types.is_integer(value.type):
+        return pc.cast(value, pa.float64())
+    return value
+
+
+def _compare(kernel: Callable, missing: bool) -> Callable:
+    """Wrap an Arrow comparison so rows with a missing operand yield ``missing``."""
+    def compare(*operands: Any) -> Any:
+        result = kernel(*operands)
+        if isinstance(result, pa.Scalar):
+            return missing if not result.is_valid else result.as_py()
+        return pc.fill_null(result, missing)
+    return compare
+
+
+BACKENDS = {'pandas': PandasBackend, 'arrow': ArrowBackend}
+
+
+def get_backend(backend: Union[str, PandasBackend] = 'pandas') -> PandasBackend:
+    """
+    Resolve a backend name or instance.
+
+    Args:
+        backend: 'pandas', 'arrow', or a backend instance
+
+    Returns:
+        Backend instance
+    """
+    if isinstance(backend, PandasBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[backend]()
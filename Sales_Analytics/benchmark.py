@@ -0,0 +1,282 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_loader import DataLoader
+from stream_operations import StreamOperations
+from sales_analytics import REPORT_GROUPINGS, SalesAnalytics
+from expressions import col
+from synthetic_data import dataset_sizes, write_sales_csv
+
+# Step name -> {'seconds': best wall time, 'peak_mb': peak traced allocation}
+Results = Dict[str, Dict[str, float]]
+
+
+def measure(func: Callable[[], Any], repeat: int = 1,
+            trace_memory: bool = True) -> Tuple[Any, Dict[str, float]]:
+    """
+    Time a function and record its peak memory.
+
+    Wall time is the best of `repeat` untraced runs; peak memory comes
+    from one extra run under tracemalloc (Python and numpy allocations),
+    so tracing overhead never inflates the timings.
+
+    Args:
+        func: Function to benchmark (called without arguments)
+        repeat: Number of timed runs
+        trace_memory: Whether to measure peak memory
+
+    Returns:
+        Tuple of (last result, {'seconds': ..., 'peak_mb': ...})
+    """
+    best = float('inf')
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    stats = {'seconds': best}
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        stats['peak_mb'] = peak / 1024 ** 2
+    return result, stats
+
+
+def _stream_operations(stream: StreamOperations) -> Dict[str, Callable[[], Any]]:
+    """Benchmark cases for every StreamOperations operation."""
+    return {
+        'filter': lambda: stream.filter((col('Total Revenue') > 100000) &
+                                        (col('Sales Channel') == 'Online')).count(),
+        'map': lambda: stream.map(col('Total Profit') / col('Units Sold')),
+        'sorted_by': lambda: stream.sorted_by('Total Profit', ascending=False).collect(),
+        'limit': lambda: stream.limit(1000).collect(),
+        'skip': lambda: stream.skip(1000).collect(),
+        'distinct': lambda: stream.distinct('Country'),
+        'collect': lambda: stream.collect(),
+        'count': lambda: stream.count(),
+        'reduce_sum': lambda: stream.reduce_sum('Total Revenue'),
+        'reduce_sum (exact)': lambda: stream.reduce_sum('Total Revenue', exact=True),
+        'reduce_custom': lambda: stream.reduce_custom('Total Profit', max, float('-inf')),
+        'reduce_custom (generic)': lambda: stream.reduce_custom(
+            'Units Sold', lambda acc, x: acc + x, 0),
+        # Worst cases for short-circuiting operations: every row is examined
+        'any_match': lambda: stream.any_match(col('Total Revenue') < 0),
+        'all_match': lambda: stream.all_match(col('Total Revenue') > 0),
+        'none_match': lambda: stream.none_match(col('Total Revenue') < 0),
+        'find_first': lambda: stream.find_first(col('Total Revenue') < 0),
+        'find_any': lambda: stream.find_any(),
+    }
+
+
+def _reports(analytics: SalesAnalytics) -> Dict[str, Callable[[], Any]]:
+    """Benchmark cases for every SalesAnalytics report."""
+    return {
+        'total_revenue_by_region': analytics.total_revenue_by_region,
+        'top_countries_by_revenue': analytics.top_countries_by_revenue,
+        'revenue_by_item_type': analytics.revenue_by_item_type,
+        'sales_channel_comparison': analytics.sales_channel_comparison,
+        'order_priority_analysis': analytics.order_priority_analysis,
+        'monthly_revenue_trend': analytics.monthly_revenue_trend,
+        'top_profitable_items_by_region': analytics.top_profitable_items_by_region,
+        'profit_margin_by_category': analytics.profit_margin_by_category,
+        'yearly_comparison': analytics.yearly_comparison,
+        'rolling_window': analytics.rolling_window,
+        'cumulative_totals': analytics.cumulative_totals,
+        'period_over_period': analytics.period_over_period,
+        'year_over_year': analytics.year_over_year,
+        'high_value_orders': analytics.high_value_orders,
+        'low_margin_items': analytics.low_margin_items,
+        'custom_aggregation': lambda: analytics.custom_aggregation(
+            ['Region', 'Year'], {'Total Revenue': 'sum', 'Units Sold': 'mean'}),
+    }
+
+
+def _grouped_reports(data: pd.DataFrame, cubes: bool = True) -> List[Any]:
+    """Run every grouped report once on a fresh, uncached SalesAnalytics."""
+    analytics = SalesAnalytics(data, cache=False)
+    if not cubes:
+        analytics.cube_dimensions = []
+    return [getattr(analytics, report)() for report in REPORT_GROUPINGS]
+
+
+def benchmark_dataset(path: str, repeat: int = 1, trace_memory: bool = True,
+                      log: Callable[[str], None] = lambda line: None) -> Results:
+    """
+    Benchmark the loading pipeline, stream operations and reports on a CSV.
+
+    Each DataLoader step runs on a shallow copy of the previous step's
+    output, since parse_dates and add_calculated_fields modify their input.
+
+    Args:
+        path: CSV file with the sales schema
+        repeat: Timed runs per step (best is kept)
+        trace_memory: Whether to measure peak memory per step
+        log: Called with a formatted line after each step
+
+    Returns:
+        Step name -> measurements
+    """
+    results: Results = {}
+
+    def run(name: str, func: Callable[[], Any]) -> Any:
+        result, stats = measure(func, repeat, trace_memory)
+        results[name] = stats
+        log(_format_row(name, stats))
+        return result
+
+    loader = DataLoader(path)
+    data = run('DataLoader.load_data', loader.load_data)
+    run('DataLoader.apply_transformations (fused)', lambda: loader.apply_transformations(
+        [DataLoader.clean_data, DataLoader.parse_dates, DataLoader.add_calculated_fields],
+        fused=True))
+    for step in (DataLoader.clean_data, DataLoader.parse_dates,
+                 DataLoader.add_calculated_fields, DataLoader.optimize_dtypes):
+        source = data
+        data = run(f'DataLoader.{step.__name__}',
+                   lambda: step(source.copy(deep=False)))
+
+    stream = StreamOperations(data)
+    for name, func in _stream_operations(stream).items():
+        run(f'StreamOperations.{name}', func)
+
+    run('SalesAnalytics.cube', lambda: SalesAnalytics(data, cache=False).cube)
+    # Every grouped report on a fresh instance, cube builds included,
+    # against the same reports each grouping the rows
+    run('SalesAnalytics grouped reports (cubes)', lambda: _grouped_reports(data, cubes=True))
+    run('SalesAnalytics grouped reports (row groupbys)',
+        lambda: _grouped_reports(data, cubes=False))
+    analytics = SalesAnalytics(data, cache=False)
+    analytics.cube
+    for name, func in _reports(analytics).items():
+        run(f'SalesAnalytics.{name}', func)
+    # Compared across dataset sizes, shows append cost is independent of
+    # the rows already held
+    batch = data.iloc[:1_000]
+    run('SalesAnalytics.append (1,000 rows)', lambda: analytics.append(batch))
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Results], baseline: Dict[str, Results],
+                        tolerance: float = 0.25, min_seconds: float = 0.005) -> pd.DataFrame:
+    """
+    Compare benchmark results with a stored baseline.
+
+    Args:
+        results: Dataset size -> step results
+        baseline: Baseline in the same shape
+        tolerance: Allowed slowdown before a step counts as a regression
+            (0.25 = 25% slower)
+        min_seconds: Steps faster than this in both runs are ignored as noise
+
+    Returns:
+        DataFrame with one row per step present in both, including
+        'Ratio' (current / baseline seconds) and a boolean 'Regression'
+    """
+    rows = []
+    for size, steps in results.items():
+        for step, stats in steps.items():
+            before = baseline.get(size, {}).get(step)
+            if before is None:
+                continue
+            ratio = stats['seconds'] / before['seconds'] if before['seconds'] else np.inf
+            noisy = max(stats['seconds'], before['seconds']) < min_seconds
+            rows.append({'Rows': size, 'Step': step,
+                         'Baseline s': before['seconds'], 'Current s': stats['seconds'],
+                         'Ratio': ratio,
+                         'Baseline MB': before.get('peak_mb', np.nan),
+                         'Current MB': stats.get('peak_mb', np.nan),
+                         'Regression': not noisy and ratio > 1 + tolerance})
+    return pd.DataFrame(rows, columns=['Rows', 'Step', 'Baseline s', 'Current s', 'Ratio',
+                                       'Baseline MB', 'Current MB', 'Regression'])
+
+
+def _format_row(name: str, stats: Dict[str, float]) -> str:
+    memory = f"{stats['peak_mb']:10.1f} MB" if 'peak_mb' in stats else ''
+    return f"  {name:<45} {stats['seconds']:10.4f} s{memory}"
+
+
+def _dataset_path(rows: int, seed: int, data_dir: str) -> str:
+    """Path of a generated dataset, creating it on first use."""
+    path = os.path.join(data_dir, f"synthetic_sales_{rows}_{seed}.csv")
+    if not os.path.exists(path):
+        print(f"Generating {rows:,} rows -> {path}")
+        write_sales_csv(path + '.tmp', rows, seed)
+        os.replace(path + '.tmp', path)
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point; returns 1 if any step regressed."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark DataLoader steps, StreamOperations and SalesAnalytics reports "
+                    "on synthetic sales data.")
+    parser.add_argument('--sizes', default='10k',
+                        help="Comma-separated dataset sizes, e.g. '10k,1M,10M' (default: 10k)")
+    parser.add_argument('--data', help="Benchmark this CSV instead of synthetic data")
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'sales_benchmark'),
+                        help="Directory where generated datasets are cached")
+    parser.add_argument('--seed', type=int, default=0, help="Generator seed (default: 0)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per step (default: 3)")
+    parser.add_argument('--no-memory', action='store_true', help="Skip peak memory measurement")
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against this JSON results file")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help="Write results to --baseline instead of comparing")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown before a step is a regression (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    if args.data:
+        datasets = {os.path.basename(args.data): args.data}
+    else:
+        os.makedirs(args.data_dir, exist_ok=True)
+        datasets = {str(rows): _dataset_path(rows, args.seed, args.data_dir)
+                    for rows in dataset_sizes(args.sizes)}
+
+    results = {}
+    for label, path in datasets.items():
+        print(f"\nDataset {label} ({path})")
+        results[label] = benchmark_dataset(path, args.repeat, not args.no_memory, log=print)
+
+    document = {
+        'metadata': {'python': platform.python_version(), 'pandas': pd.__version__,
+                     'numpy': np.__version__, 'platform': platform.platform(),
+                     'seed': args.seed, 'repeat': args.repeat},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    if args.baseline and args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(document, f, indent=2)
+        print(f"\n✓ Baseline saved to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        comparison = compare_to_baseline(results, baseline, args.tolerance)
+        regressions = comparison[comparison['Regression']]
+        print(f"\nCompared {len(comparison)} steps with {args.baseline}")
+        if len(regressions):
+            print(f"✗ {len(regressions)} regression(s) over {args.tolerance:.0%}:")
+            print(regressions.round(4).to_string(index=False))
+            return 1
+        print("✓ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
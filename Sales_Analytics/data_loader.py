@@ -1,48 +1,732 @@
+import glob
+import json
+import multiprocessing
+import os
+import pickle
+import time
+import zipfile
+import numpy as np
 import pandas as pd
-from typing import Callable, List
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
+from typing import Any, Callable, Collection, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from functools import reduce
 
+try:
+    from .deduplication import DEFAULT_KEY, Deduplicator, Key, key_columns
+    from .expressions import Expression
+    from .indexes import TableIndexes
+    from .parallel import _can_fork
+    from .partitioned_dataset import PartitionedDataset, _read_partition
+    from .sketches import HyperLogLog, KLLSketch
+except ImportError:
+    from deduplication import DEFAULT_KEY, Deduplicator, Key, key_columns
+    from expressions import Expression
+    from indexes import TableIndexes
+    from parallel import _can_fork
+    from partitioned_dataset import PartitionedDataset, _read_partition
+    from sketches import HyperLogLog, KLLSketch
+
+# Receives one stage record from a traced apply_transformations call
+StageCallback = Callable[[Dict[str, Any]], None]
+
+# Separates a zip archive from a member inside it, e.g. 'exports.zip::2017/sales.csv'
+ARCHIVE_MEMBER = '::'
+
+# Columns of a sales export, in file order
+SOURCE_COLUMNS = ('Region', 'Country', 'Item Type', 'Sales Channel', 'Order Priority',
+                  'Order Date', 'Order ID', 'Ship Date', 'Units Sold', 'Unit Price',
+                  'Unit Cost', 'Total Revenue', 'Total Cost', 'Total Profit')
+
+# Field added by add_calculated_fields -> source columns it is computed from
+DERIVED_FIELDS = {
+    'Profit Margin': ('Total Profit', 'Total Revenue'),
+    'Processing Days': ('Ship Date', 'Order Date'),
+    'Revenue Per Unit': ('Total Revenue', 'Units Sold'),
+    'Year': ('Order Date',),
+    'Month': ('Order Date',),
+    'Year-Month': ('Order Date',),
+}
+
+_TRACE_FIELDS = ('stage', 'position', 'wall_seconds', 'cpu_seconds', 'rows_in', 'rows_out',
+                 'memory_in_bytes', 'memory_out_bytes', 'memory_delta_bytes')
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    """Deep memory usage of a DataFrame, including its index."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _archive_members(path: str) -> List[str]:
+    """
+    List the CSV members of a zip archive as 'archive.zip::member' sources.
+    
+    Args:
+        path: Path to zip file
+        
+    Returns:
+        Member sources in archive order
+    """
+    with zipfile.ZipFile(path) as archive:
+        members = [name for name in archive.namelist()
+                   if name.lower().endswith('.csv') and not name.startswith('__MACOSX/')]
+    if not members:
+        raise ValueError(f"No CSV files in archive '{path}'")
+    return [f"{path}{ARCHIVE_MEMBER}{name}" for name in members]
+
+
+@contextmanager
+def _open_csv(source: str) -> Iterator[Any]:
+    """
+    Open a CSV source for pd.read_csv, decompressing on the fly.
+    
+    Zip members are streamed from the archive; .gz, .bz2, .xz, .zst and
+    single-member .zip files are decompressed by pandas as it parses
+    (.zst needs the zstandard package). Nothing is extracted to disk.
+    
+    Args:
+        source: File path or 'archive.zip::member' source
+        
+    Returns:
+        Path or open binary file to pass to pd.read_csv
+    """
+    archive, separator, member = source.partition(ARCHIVE_MEMBER)
+    if not separator:
+        yield source
+        return
+    with zipfile.ZipFile(archive) as zipped, zipped.open(member) as f:
+        yield f
+
+
+def _read_file(path: str, transformations: Optional[List[Callable]] = None,
+               columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read one CSV file and apply transformations to it.
+    
+    Module-level so it can run in worker processes.
+    
+    Args:
+        path: Path to CSV file (possibly compressed) or zip member source
+        transformations: Transformation functions to apply in order
+        columns: Columns to read (defaults to all)
+        
+    Returns:
+        Loaded (and transformed) DataFrame
+    """
+    with _open_csv(path) as source:
+        data = pd.read_csv(source, usecols=columns)
+    return reduce(lambda df, func: func(df), transformations or [], data)
+
+
+def _concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate per-file frames, unifying categorical dictionaries.
+    
+    Categorical columns with different categories per file would fall back
+    to object dtype on concat; recoding them to the union first keeps them
+    categorical.
+    
+    Args:
+        frames: Frames with the same columns
+        
+    Returns:
+        Single DataFrame with a fresh RangeIndex
+    """
+    for column in frames[0].columns:
+        dtypes = [frame[column].dtype for frame in frames]
+        if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes):
+            categories = reduce(lambda left, right: left.union(right, sort=False),
+                                (dtype.categories for dtype in dtypes))
+            frames = [frame.assign(**{column: frame[column].cat.set_categories(categories)})
+                      for frame in frames]
+    return pd.concat(frames, ignore_index=True)
+
 
 class DataLoader:
     """Handles CSV data loading with functional programming approach."""
     
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: Union[str, List[str]], max_workers: Optional[int] = None,
+                 profile_memory: bool = False):
         """
         Initialize data loader.
         
         Args:
-            filepath: Path to CSV file
+            filepath: Path to CSV file, a glob pattern such as
+                'exports/*.csv', a list of paths/patterns, or the root
+                directory of a partitioned dataset. Files may be
+                compressed (.gz, .bz2, .xz, .zst); a .zip stands for all
+                CSV files in it, and 'archive.zip::member.csv' for one
+            max_workers: Worker processes for multi-file loads
+                (defaults to the number of CPUs)
+            profile_memory: Record a per-column memory profile after load
+                and after each transformation in self.memory_profiles
         """
         self.filepath = filepath
+        self.max_workers = max_workers
+        self.profile_memory = profile_memory
+        self.memory_profiles: Dict[str, pd.DataFrame] = {}
+        self.stage_trace: List[Dict[str, Any]] = []
         self.data = None
     
-    def load_data(self) -> pd.DataFrame:
+    def _resolve_files(self) -> List[str]:
+        """
+        Expand the configured path(s) into a list of files.
+        
+        Zip archives expand to their CSV members.
+        
+        Returns:
+            File paths and 'archive.zip::member' sources in a
+            deterministic order
+        """
+        patterns = [self.filepath] if isinstance(self.filepath, str) else list(self.filepath)
+        files = []
+        for pattern in patterns:
+            if any(char in pattern for char in '*?['):
+                matches = sorted(glob.glob(pattern))
+                if not matches:
+                    raise FileNotFoundError(f"No files match '{pattern}'")
+                files.extend(matches)
+            else:
+                files.append(pattern)
+        return [member for path in files
+                for member in (_archive_members(path)
+                               if path.lower().endswith('.zip') and ARCHIVE_MEMBER not in path
+                               else [path])]
+    
+    def _map_files(self, func: Callable, *iterables) -> List[pd.DataFrame]:
+        """
+        Run a per-file reader, in worker processes when there are several files.
+        
+        Workers are forked from single-threaded processes only (see
+        parallel._can_fork). Otherwise, as when a server thread reloads the
+        data, they are spawned, which needs picklable transformations;
+        files are read in-process if the tasks do not pickle.
+        
+        Args:
+            func: Module-level reader function
+            iterables: Argument sequences, as for map()
+            
+        Returns:
+            Frames in input order
+        """
+        tasks = list(zip(*iterables))
+        if len(tasks) <= 1:
+            return [func(*args) for args in tasks]
+        if _can_fork():
+            context = multiprocessing.get_context('fork')
+        else:
+            try:
+                pickle.dumps((func, tasks))
+            except (pickle.PicklingError, AttributeError, TypeError):
+                return [func(*args) for args in tasks]
+            context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context) as pool:
+            return list(pool.map(func, *zip(*tasks)))
+    
+    def load_data(self, transformations: Optional[List[Callable]] = None,
+                  partition_filter: Optional[Expression] = None,
+                  deduplicate: Union[bool, Deduplicator] = False,
+                  columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
         """
         Load CSV data into DataFrame.
         
+        Multiple files are parsed in parallel worker processes, each one
+        also applying the given transformations, and the results are
+        concatenated in file order. Transformations must be picklable
+        (module-level functions or the DataLoader static methods).
+        
+        Args:
+            transformations: Optional transformations to apply per file
+                while loading
+            partition_filter: For partitioned datasets, a predicate such as
+                col('Year') == 2015; partitions it rules out are never read
+                and remaining rows are filtered by it after transformations
+            deduplicate: Drop records whose 'Order ID' already appeared in
+                an earlier file (True), or pass a Deduplicator to choose the
+                key and to carry seen keys over from earlier loads
+            columns: Source columns to read (defaults to all); see
+                plan_columns for the columns behind calculated fields
+            
         Returns:
             Loaded DataFrame
         """
-        self.data = pd.read_csv(self.filepath)
-        print(f"✓ Loaded {len(self.data)} records from {self.filepath}")
+        if isinstance(self.filepath, str) and os.path.isdir(self.filepath):
+            return self._load_partitioned(transformations, partition_filter, columns)
+        
+        files = self._resolve_files()
+        frames = self._map_files(_read_file, files, repeat(transformations, len(files)),
+                                 repeat(columns, len(files)))
+        deduplicator = self._deduplicator(deduplicate)
+        if deduplicator is not None:
+            frames = [deduplicator.filter(frame) for frame in frames]
+        self.data = frames[0] if len(frames) == 1 else _concat_frames(frames)
+        source = files[0] if len(files) == 1 else f"{len(files)} files"
+        print(f"✓ Loaded {len(self.data)} records from {source}")
+        self._record_profile('load', self.data)
         return self.data
     
-    def apply_transformations(self, transformations: List[Callable]) -> pd.DataFrame:
+    def _load_partitioned(self, transformations: Optional[List[Callable]],
+                          partition_filter: Optional[Expression],
+                          columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Load the partitions of a Hive-style dataset that may match a filter.
+        
+        Args:
+            transformations: Transformations to apply per partition
+            partition_filter: Predicate used for pruning and row filtering
+            columns: Columns to read from the partition files
+            
+        Returns:
+            Loaded DataFrame
+        """
+        dataset = PartitionedDataset(self.filepath)
+        partitions = dataset.prune(partition_filter)
+        frames = self._map_files(_read_partition, partitions['path'],
+                                 dataset.partition_values(partitions),
+                                 repeat(transformations, len(partitions)),
+                                 repeat(columns, len(partitions)))
+        data = _concat_frames(frames) if frames else dataset.read(partition_filter)
+        if partition_filter is not None and len(data) > 0:
+            data = data[partition_filter.evaluate(data)].reset_index(drop=True)
+        self.data = data
+        print(f"✓ Loaded {len(self.data)} records from {len(partitions)} of "
+              f"{len(dataset.partitions)} partitions in {self.filepath}")
+        self._record_profile('load', self.data)
+        return self.data
+    
+    @staticmethod
+    def _deduplicator(deduplicate: Union[bool, Deduplicator]) -> Optional[Deduplicator]:
+        """Resolve a deduplicate argument to a Deduplicator (or None)."""
+        if isinstance(deduplicate, Deduplicator):
+            return deduplicate
+        return Deduplicator() if deduplicate else None
+    
+    def iter_chunks(self, chunksize: int = 100_000,
+                    transformations: Optional[List[Callable]] = None,
+                    deduplicate: Union[bool, Deduplicator] = False,
+                    columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Stream the source file(s) in chunks without loading them whole.
+        
+        Compressed files and zip members are decompressed as they are
+        read, so memory stays bounded by the chunk size.
+        
+        With deduplicate, a record whose key appeared in any earlier chunk
+        or file is dropped; memory grows by 8 bytes per distinct key
+        rather than with the rows.
+        
+        Args:
+            chunksize: Rows per chunk
+            transformations: Transformations to apply to each chunk
+            deduplicate: Drop records with an already seen 'Order ID'
+                (True), or a Deduplicator to use (e.g. with another key or
+                a Bloom prefilter)
+            columns: Source columns to read (defaults to all)
+            
+        Returns:
+            Iterator of (transformed) chunks, in file order
+        """
+        deduplicator = self._deduplicator(deduplicate)
+        for path in self._resolve_files():
+            with _open_csv(path) as source, pd.read_csv(source, chunksize=chunksize,
+                                                         usecols=columns) as reader:
+                for chunk in reader:
+                    chunk = reduce(lambda df, func: func(df), transformations or [], chunk)
+                    yield chunk if deduplicator is None else deduplicator.filter(chunk)
+    
+    def build_sketches(self, distinct_columns: Sequence[str] = ('Region', 'Country', 'Item Type'),
+                       quantile_columns: Sequence[str] = ('Total Revenue', 'Processing Days'),
+                       chunksize: int = 100_000,
+                       transformations: Optional[List[Callable]] = None) -> Dict[str, object]:
+        """
+        Build distinct-count and quantile sketches in one chunked pass.
+        
+        Memory is bounded by the chunk size plus the sketches (HyperLogLog:
+        ~0.8% relative error; KLL: ~1.65% rank error), so this works on
+        files that do not fit in memory. Derived columns such as
+        'Processing Days' need the matching transformations.
+        
+        Args:
+            distinct_columns: Columns to count distinct values of
+            quantile_columns: Numeric columns to sketch quantiles of
+            chunksize: Rows per chunk
+            transformations: Transformations to apply to each chunk
+            
+        Returns:
+            Dict of column name -> HyperLogLog or KLLSketch
+        """
+        sketches = {column: HyperLogLog() for column in distinct_columns}
+        sketches.update({column: KLLSketch() for column in quantile_columns})
+        for chunk in self.iter_chunks(chunksize, transformations):
+            for column, sketch in sketches.items():
+                sketch.update(chunk[column])
+        return sketches
+    
+    def write_partitioned(self, root: str,
+                          partition_cols: Sequence[str] = ('Year', 'Region')) -> PartitionedDataset:
+        """
+        Write the loaded data as a Hive-style partitioned dataset.
+        
+        Args:
+            root: Dataset root directory
+            partition_cols: Columns to partition by, outermost first
+            
+        Returns:
+            PartitionedDataset over the written files
+        """
+        return PartitionedDataset.write(self.data, root, partition_cols)
+    
+    def apply_transformations(self, transformations: List[Callable],
+                              trace: Union[bool, StageCallback] = False,
+                              fused: bool = False) -> pd.DataFrame:
         """
         Apply transformations using functional composition.
         
+        With fused set, consecutive built-in steps (clean_data, parse_dates,
+        add_calculated_fields, in that order) run as one stage: a single
+        row selection, dates parsed on the surviving rows only, and derived
+        columns computed with column arithmetic. The result equals the
+        unfused pipeline's, without its intermediate full-frame copies and
+        row-by-row apply calls, and the input frame is left unmodified.
+        
+        With trace enabled, each step is instrumented and one record per
+        step is appended to self.stage_trace:
+        
+            {'stage', 'position', 'wall_seconds', 'cpu_seconds', 'rows_in',
+             'rows_out', 'memory_in_bytes', 'memory_out_bytes',
+             'memory_delta_bytes'}
+        
+        Memory is the deep size of the DataFrame before and after the step;
+        measuring it is excluded from the timings.
+        
         Args:
             transformations: List of transformation functions
+            trace: True to record stage_trace, or a callable that is also
+                called with each record as soon as its step finishes
+            fused: Plan built-in steps together (traced as one stage)
             
         Returns:
-            Transformed DataFrame
+            Transformed DataFrame (profiled per step when profile_memory is set)
         """
-        return reduce(lambda df, func: func(df), transformations, self.data)
+        if fused:
+            transformations = self._plan_fused(transformations)
+        if not trace and not self.profile_memory:
+            return reduce(lambda df, func: func(df), transformations, self.data)
+        self.stage_trace = []
+        callback = trace if callable(trace) else None
+        return reduce(lambda df, step: self._run_stage(*step, df, callback),
+                      enumerate(transformations), self.data)
     
     @staticmethod
-    def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-        """Remove null values and duplicates."""
-        return df.dropna().drop_duplicates()
+    def _plan_fused(transformations: List[Callable]) -> List[Callable]:
+        """
+        Replace runs of built-in steps with fused stages.
+        
+        A run must follow the canonical order clean -> parse -> calculate
+        (each step at most once); other steps are kept as they are.
+        
+        Args:
+            transformations: Transformation functions
+            
+        Returns:
+            Equivalent list of transformation functions
+        """
+        order = [DataLoader.clean_data, DataLoader.parse_dates, DataLoader.add_calculated_fields]
+        plan, run = [], []
+        
+        def flush():
+            if len(run) > 1:
+                steps = frozenset(func.__name__ for func in run)
+                fused_step = lambda df: DataLoader._fused_transform(df, steps)
+                fused_step.__name__ = '+'.join(func.__name__ for func in run)
+                plan.append(fused_step)
+            else:
+                plan.extend(run)
+            run.clear()
+        
+        for func in transformations:
+            if func not in order:
+                flush()
+                plan.append(func)
+                continue
+            if run and order.index(func) <= order.index(run[-1]):
+                flush()
+            run.append(func)
+        flush()
+        return plan
+    
+    @staticmethod
+    def _fused_transform(df: pd.DataFrame, steps: Collection[str]) -> pd.DataFrame:
+        """
+        Run the named built-in steps in one pass.
+        
+        Args:
+            df: Input DataFrame (not modified)
+            steps: Names of the built-in steps to apply
+            
+        Returns:
+            Same result as applying the steps one after another
+        """
+        if 'clean_data' in steps:
+            keep = df.notna().all(axis=1).to_numpy(copy=True)
+            subset = DataLoader._duplicate_subset(df, DEFAULT_KEY)
+            if subset is None:
+                # A duplicate of a complete row is itself complete, so duplicates
+                # can be found on the full frame and combined into one mask
+                keep &= ~df.duplicated().to_numpy()
+            else:
+                # An incomplete row must not shadow a later complete one
+                complete = np.flatnonzero(keep)
+                keep[complete] = ~df[subset].take(complete).duplicated().to_numpy()
+            df = df if keep.all() else df.take(np.flatnonzero(keep))
+        out = df.copy(deep=False)
+        
+        if 'parse_dates' in steps:
+            for column in ('Order Date', 'Ship Date'):
+                if column in out.columns:
+                    # Exports repeat a few thousand dates across all rows, so
+                    # each distinct string is parsed once
+                    codes, uniques = pd.factorize(out[column])
+                    parsed = pd.DatetimeIndex(pd.to_datetime(uniques, errors='coerce'))
+                    out[column] = pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT),
+                                            index=out.index)
+        
+        if 'add_calculated_fields' in steps:
+            revenue, profit, units = out['Total Revenue'], out['Total Profit'], out['Units Sold']
+            order_date = out['Order Date'].dt
+            derived = {
+                'Profit Margin': (profit / revenue * 100).where(revenue > 0, 0),
+                'Processing Days': (out['Ship Date'] - out['Order Date']).dt.days,
+                'Revenue Per Unit': (revenue / units).where(units > 0, 0),
+                'Year': order_date.year,
+                'Month': order_date.month,
+                'Year-Month': order_date.to_period('M'),
+            }
+            for column, values in derived.items():
+                out[column] = values
+        return out
+    
+    def _run_stage(self, position: int, func: Callable, df: pd.DataFrame,
+                   callback: Optional[StageCallback]) -> pd.DataFrame:
+        """Run one transformation, recording its trace and memory profile."""
+        name = self._unique_name(getattr(func, '__name__', repr(func)),
+                                 [record['stage'] for record in self.stage_trace])
+        memory_in = (self.stage_trace[-1]['memory_out_bytes'] if self.stage_trace
+                     else _frame_bytes(df))
+        rows_in = len(df)
+        wall, cpu = time.perf_counter(), time.process_time()
+        result = func(df)
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        memory_out = _frame_bytes(result)
+        record = {
+            'stage': name,
+            'position': position,
+            'wall_seconds': wall,
+            'cpu_seconds': cpu,
+            'rows_in': rows_in,
+            'rows_out': len(result),
+            'memory_in_bytes': memory_in,
+            'memory_out_bytes': memory_out,
+            'memory_delta_bytes': memory_out - memory_in,
+        }
+        self.stage_trace.append(record)
+        if callback is not None:
+            callback(record)
+        return self._record_profile(name, result)
+    
+    @staticmethod
+    def _unique_name(step: str, taken: Collection[str]) -> str:
+        """Suffix a step name with #2, #3, ... if it is already taken."""
+        name, n = step, 2
+        while name in taken:
+            name, n = f"{step} #{n}", n + 1
+        return name
+    
+    def trace_summary(self) -> pd.DataFrame:
+        """
+        Summarize the last traced apply_transformations call.
+        
+        Returns:
+            DataFrame indexed by stage with the trace fields and each
+            stage's share of total wall time (%)
+        """
+        summary = pd.DataFrame(self.stage_trace, columns=list(_TRACE_FIELDS)).set_index('stage')
+        total = summary['wall_seconds'].sum()
+        summary['wall_share (%)'] = summary['wall_seconds'] / total * 100 if total else 0.0
+        return summary
+    
+    def export_trace(self, path: Optional[str] = None) -> str:
+        """
+        Serialize the last trace as JSON.
+        
+        Args:
+            path: Optional file to write the JSON to
+            
+        Returns:
+            JSON document with 'stages' and 'total_wall_seconds'
+        """
+        document = json.dumps({
+            'source': self.filepath if isinstance(self.filepath, str) else list(self.filepath),
+            'total_wall_seconds': sum(record['wall_seconds'] for record in self.stage_trace),
+            'stages': self.stage_trace,
+        }, indent=2)
+        if path:
+            with open(path, 'w') as f:
+                f.write(document)
+        return document
+    
+    def _record_profile(self, step: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Store a memory profile of df under step (if profiling) and pass df through."""
+        if self.profile_memory:
+            self.memory_profiles[self._unique_name(step, self.memory_profiles)] = \
+                self.memory_profile(df)
+        return df
+    
+    def memory_summary(self) -> pd.Series:
+        """
+        Get total memory after each profiled step.
+        
+        Returns:
+            Series of megabytes indexed by step name, in recording order
+        """
+        return pd.Series({step: profile['Bytes'].sum() / 1024 ** 2
+                          for step, profile in self.memory_profiles.items()},
+                         name='MB', dtype=float)
+    
+    @staticmethod
+    def memory_profile(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Measure the memory held by each column.
+        
+        Object and string columns are measured deeply, so the Python
+        objects behind them are counted.
+        
+        Args:
+            df: DataFrame to profile
+            
+        Returns:
+            DataFrame indexed by column with Dtype, Bytes and Share (%),
+            largest columns first
+        """
+        usage = df.memory_usage(deep=True, index=False)
+        total = usage.sum()
+        return (pd.DataFrame({'Dtype': df.dtypes.astype(str),
+                              'Bytes': usage,
+                              'Share (%)': usage / total * 100 if total else 0.0})
+                .sort_values('Bytes', ascending=False, kind='stable'))
+    
+    @staticmethod
+    def compare_memory(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compare per-column memory of two versions of a DataFrame.
+        
+        Args:
+            before: Original DataFrame
+            after: Optimized DataFrame
+            
+        Returns:
+            DataFrame indexed by column (plus a 'Total' row) with dtypes,
+            bytes before/after and Saved (%)
+        """
+        old = DataLoader.memory_profile(before)
+        new = DataLoader.memory_profile(after)
+        report = pd.DataFrame({'Before Dtype': old['Dtype'],
+                               'After Dtype': new['Dtype'],
+                               'Before Bytes': old['Bytes'],
+                               'After Bytes': new['Bytes']}).reindex(before.columns)
+        report.loc['Total'] = ['', '', old['Bytes'].sum(), new['Bytes'].sum()]
+        report[['Before Bytes', 'After Bytes']] = report[['Before Bytes', 'After Bytes']].astype('int64')
+        saved = 1 - report['After Bytes'] / report['Before Bytes'].where(report['Before Bytes'] > 0)
+        report['Saved (%)'] = (saved * 100).fillna(0.0).round(1)
+        return report
+    
+    @staticmethod
+    def optimize_dtypes(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+        """
+        Store columns in the narrowest type that holds the same values.
+        
+        - Integers are downcast to the smallest integer type covering
+          their range (note that arithmetic on them stays in that type)
+        - Floats become float32 only when every value round-trips exactly
+        - Strings with at most category_ratio unique values per row
+          become categoricals
+        - Period objects held in an object column become a period dtype
+          (one int64 ordinal per row)
+        
+        Usable as a transformation, e.g. as the last step passed to
+        apply_transformations().
+        
+        Args:
+            df: DataFrame to optimize
+            category_ratio: Maximum unique/rows ratio for categoricals
+            
+        Returns:
+            New DataFrame with the same values and index
+        """
+        columns = {}
+        for column in df.columns:
+            series = df[column]
+            dtype = series.dtype
+            if pd.api.types.is_bool_dtype(dtype) or isinstance(dtype, pd.CategoricalDtype):
+                pass
+            elif pd.api.types.is_integer_dtype(dtype):
+                series = pd.to_numeric(series, downcast='unsigned'
+                                       if pd.api.types.is_unsigned_integer_dtype(dtype)
+                                       else 'integer')
+            elif pd.api.types.is_float_dtype(dtype) and dtype != np.float32:
+                narrow = series.astype(np.float32)
+                if np.array_equal(narrow.to_numpy(np.float64), series.to_numpy(np.float64),
+                                  equal_nan=True):
+                    series = narrow
+            elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+                kind = pd.api.types.infer_dtype(series, skipna=True)
+                if kind == 'period':
+                    series = series.astype(pd.PeriodDtype(series.dropna().iloc[0].freq))
+                elif kind == 'string' and len(series) and \
+                        series.nunique() <= category_ratio * len(series):
+                    series = series.astype('category')
+            columns[column] = series
+        return pd.DataFrame(columns, index=df.index)
+    
+    def build_indexes(self, hash_columns: Sequence[str] = ('Order ID',),
+                      sorted_columns: Sequence[str] = ('Order Date', 'Ship Date')) -> TableIndexes:
+        """
+        Build lookup indexes over the loaded (transformed) data.
+        
+        Pass the result to StreamOperations(data, indexes=...) so filters
+        such as col('Order ID') == 123 or col('Order Date') >= '2015-01-01'
+        use the indexes automatically.
+        
+        Args:
+            hash_columns: Columns for O(1) equality/membership lookups
+            sorted_columns: Columns for O(log n) range slicing
+            
+        Returns:
+            TableIndexes over self.data
+        """
+        return TableIndexes(self.data, hash_columns, sorted_columns)
+    
+    @staticmethod
+    def _duplicate_subset(df: pd.DataFrame, key: Optional[Key]) -> Optional[List[str]]:
+        """Columns duplicates are detected on: the key if present, else whole rows."""
+        if key is None:
+            return None
+        columns = key_columns(key)
+        return columns if all(column in df.columns for column in columns) else None
+    
+    @staticmethod
+    def clean_data(df: pd.DataFrame, key: Optional[Key] = DEFAULT_KEY) -> pd.DataFrame:
+        """
+        Remove null values and duplicates.
+        
+        Records are duplicates when their key ('Order ID' by default)
+        repeats; hashing one column is far cheaper than hashing whole
+        rows. Frames without the key columns, or key=None, are
+        deduplicated on whole rows. The first occurrence is kept.
+        """
+        df = df.dropna()
+        return df.drop_duplicates(subset=DataLoader._duplicate_subset(df, key))
     
     @staticmethod
     def parse_dates(df: pd.DataFrame) -> pd.DataFrame:
@@ -54,37 +738,81 @@ class DataLoader:
         return df
     
     @staticmethod
-    def add_calculated_fields(df: pd.DataFrame) -> pd.DataFrame:
-        """Add calculated fields using lambda expressions."""
+    def add_calculated_fields(df: pd.DataFrame,
+                              fields: Optional[Collection[str]] = None) -> pd.DataFrame:
+        """
+        Add calculated fields using lambda expressions.
+        
+        Args:
+            df: DataFrame with the source columns of the fields (see
+                DERIVED_FIELDS); modified in place
+            fields: Names of the fields to add (defaults to all of them)
+        """
+        fields = DERIVED_FIELDS if fields is None else fields
+        
         # Profit margin percentage
-        df['Profit Margin'] = df.apply(
-            lambda row: (row['Total Profit'] / row['Total Revenue'] * 100) 
-            if row['Total Revenue'] > 0 else 0, axis=1
-        )
+        if 'Profit Margin' in fields:
+            df['Profit Margin'] = df.apply(
+                lambda row: (row['Total Profit'] / row['Total Revenue'] * 100) 
+                if row['Total Revenue'] > 0 else 0, axis=1
+            )
         
         # Processing time in days
-        df['Processing Days'] = (df['Ship Date'] - df['Order Date']).dt.days
+        if 'Processing Days' in fields:
+            df['Processing Days'] = (df['Ship Date'] - df['Order Date']).dt.days
         
         # Revenue per unit
-        df['Revenue Per Unit'] = df.apply(
-            lambda row: row['Total Revenue'] / row['Units Sold'] 
-            if row['Units Sold'] > 0 else 0, axis=1
-        )
+        if 'Revenue Per Unit' in fields:
+            df['Revenue Per Unit'] = df.apply(
+                lambda row: row['Total Revenue'] / row['Units Sold'] 
+                if row['Units Sold'] > 0 else 0, axis=1
+            )
         
         # Year and Month for time series
-        df['Year'] = df['Order Date'].dt.year
-        df['Month'] = df['Order Date'].dt.month
-        df['Year-Month'] = df['Order Date'].dt.to_period('M')
+        if 'Year' in fields:
+            df['Year'] = df['Order Date'].dt.year
+        if 'Month' in fields:
+            df['Month'] = df['Order Date'].dt.month
+        if 'Year-Month' in fields:
+            df['Year-Month'] = df['Order Date'].dt.to_period('M')
         
         return df
     
-    def get_info(self) -> dict:
-        """Get dataset information."""
+    @staticmethod
+    def plan_columns(columns: Collection[str]) -> Tuple[List[str], List[str]]:
+        """
+        Work out what to read and derive to obtain a set of columns.
+        
+        Args:
+            columns: Source and/or calculated columns needed downstream
+            
+        Returns:
+            Tuple of (source columns to read, in file order, and
+            calculated fields to add, in DERIVED_FIELDS order)
+        """
+        fields = [field for field in DERIVED_FIELDS if field in columns]
+        needed = set(columns).difference(fields).union(
+            *(DERIVED_FIELDS[field] for field in fields))
+        unknown = needed.difference(SOURCE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown column(s): {sorted(unknown)}")
+        return [column for column in SOURCE_COLUMNS if column in needed], fields
+    
+    def get_info(self, approximate: bool = False) -> dict:
+        """
+        Get dataset information.
+        
+        Args:
+            approximate: Estimate distinct counts with HyperLogLog sketches
+                instead of exact nunique()
+        """
+        distinct = ((lambda column: HyperLogLog().update(self.data[column]).count())
+                    if approximate else (lambda column: self.data[column].nunique()))
         return {
             'total_records': len(self.data),
             'columns': list(self.data.columns),
-            'regions': self.data['Region'].nunique(),
-            'countries': self.data['Country'].nunique(),
-            'item_types': self.data['Item Type'].nunique(),
+            'regions': distinct('Region'),
+            'countries': distinct('Country'),
+            'item_types': distinct('Item Type'),
             'date_range': f"{self.data['Order Date'].min()} to {self.data['Order Date'].max()}"
         }
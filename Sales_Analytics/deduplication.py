@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence, Union
+
+try:
+    from .sketches import BloomFilter, hash_values
+except ImportError:
+    from sketches import BloomFilter, hash_values
+
+# Columns that identify a sales record
+DEFAULT_KEY = ('Order ID',)
+
+Key = Union[str, Sequence[str]]
+
+
+def key_columns(key: Key) -> List[str]:
+    """Normalize a column name or sequence of names to a list."""
+    return [key] if isinstance(key, str) else list(key)
+
+
+class Deduplicator:
+    """
+    Drops records whose key was already seen, across chunks and files.
+
+    Only a 64-bit code per distinct key is kept, never the rows: integer
+    keys are stored as they are (exact), other keys as a 64-bit hash of
+    the key columns (a collision, and so a wrongly dropped row, has
+    probability about n**2 / 2**65 for n keys). Codes live in sorted
+    NumPy runs that are merged geometrically, so memory is 8 bytes per
+    key and each chunk costs O(chunk * log(keys)).
+
+    With expected_keys set, a Bloom filter sized for that many keys is
+    consulted first, and only keys it reports as possibly seen are looked
+    up in the runs. That pays off when most keys are new and the runs are
+    large compared with a chunk; for in-memory runs the exact lookup alone
+    is usually as fast. The first occurrence of a key always wins.
+
+    A record with a missing key value cannot be matched to any other, so
+    it is always kept and its key is not remembered.
+    """
+
+    def __init__(self, key: Key = DEFAULT_KEY, expected_keys: Optional[int] = None,
+                 error_rate: float = 0.01):
+        """
+        Initialize empty deduplicator.
+
+        Args:
+            key: Column name(s) identifying a record
+            expected_keys: Enable a Bloom prefilter sized for this many
+                distinct keys
+            error_rate: False positive rate of the Bloom prefilter
+        """
+        self.key = key_columns(key)
+        self.bloom = BloomFilter(expected_keys, error_rate) if expected_keys else None
+        self._runs: List[np.ndarray] = []
+        self.rows_seen = 0
+        self.rows_dropped = 0
+
+    def __len__(self) -> int:
+        """Number of distinct keys seen."""
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Memory held by the key runs and the Bloom filter."""
+        bloom = self.bloom.words.nbytes if self.bloom is not None else 0
+        return sum(run.nbytes for run in self._runs) + bloom
+
+    def key_codes(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Compute the 64-bit code of each record's key.
+
+        Args:
+            df: Records with the key columns
+
+        Returns:
+            uint64 array aligned with df (the code of a record with a
+            missing key value is arbitrary; see missing_keys)
+        """
+        missing = [column for column in self.key if column not in df.columns]
+        if missing:
+            raise KeyError(f"Key column(s) not found: {missing}")
+        if len(self.key) > 1:
+            return pd.util.hash_pandas_object(df[self.key], index=False).to_numpy()
+        values = df[self.key[0]]
+        if values.dtype.kind == 'f':
+            # A file with missing IDs parses them as floats; code the
+            # integral ones like integers
+            numbers = values.to_numpy()
+            present = np.isfinite(numbers)
+            if (numbers[present] % 1 == 0).all():
+                codes = np.zeros(len(numbers), dtype=np.uint64)
+                codes[present] = numbers[present].astype(np.int64).astype(np.uint64)
+                return codes
+        if values.dtype.kind in 'iu':
+            return values.to_numpy().astype(np.uint64)
+        return hash_values(values)
+
+    def missing_keys(self, df: pd.DataFrame) -> np.ndarray:
+        """Mask of records with a missing value in a key column."""
+        return df[self.key].isna().any(axis=1).to_numpy()
+
+    def _seen(self, codes: np.ndarray) -> np.ndarray:
+        """Mask of codes already stored."""
+        # Sorted needles let searchsorted walk each run in order, which is
+        # several times faster than random probes into a large array
+        order = np.argsort(codes)
+        needles = codes[order]
+        found = np.zeros(len(codes), dtype=bool)
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, needles), len(run) - 1)
+            found |= run[positions] == needles
+        seen = np.empty(len(codes), dtype=bool)
+        seen[order] = found
+        return seen
+
+    def _add(self, codes: np.ndarray) -> None:
+        """Store new, distinct codes."""
+        if len(codes) == 0:
+            return
+        self._runs.append(np.sort(codes))
+        # Merge while the previous run is not much larger, keeping
+        # O(log n) runs with every code merged O(log n) times
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newest = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newest]), kind='stable')
+        if self.bloom is not None:
+            self.bloom.add_hashes(codes)
+
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keep the records whose key has not been seen, and remember their keys.
+
+        Args:
+            df: Chunk of records
+
+        Returns:
+            df without repeated keys (df itself if nothing was dropped);
+            records with a missing key value are always kept
+        """
+        codes = self.key_codes(df)
+        present = ~self.missing_keys(df)
+        keep = np.ones(len(df), dtype=bool)
+        keep[present] = ~pd.Series(codes[present]).duplicated().to_numpy()
+        candidates = np.flatnonzero(keep & present)
+        if self.bloom is not None:
+            candidates = candidates[self.bloom.contains_hashes(codes[candidates])]
+        keep[candidates] &= ~self._seen(codes[candidates])
+        self._add(codes[keep & present])
+        self.rows_seen += len(df)
+        self.rows_dropped += len(df) - int(keep.sum())
+        return df if keep.all() else df.take(np.flatnonzero(keep))
@@ -0,0 +1,266 @@
+import operator
+import pandas as pd
+from typing import Any, Callable, Set, Tuple
+
+
+def _isin(values: Any, candidates: Any) -> Any:
+    if isinstance(values, pd.Series):
+        return values.isin(candidates)
+    return values in candidates
+
+
+def _between(values: Any, low: Any, high: Any) -> Any:
+    if isinstance(values, pd.Series):
+        return values.between(low, high)
+    return low <= values <= high
+
+
+# Operator name -> (function, symbol used in repr)
+_OPERATORS = {
+    'add': (operator.add, '+'),
+    'sub': (operator.sub, '-'),
+    'mul': (operator.mul, '*'),
+    'truediv': (operator.truediv, '/'),
+    'floordiv': (operator.floordiv, '//'),
+    'mod': (operator.mod, '%'),
+    'pow': (operator.pow, '**'),
+    'eq': (operator.eq, '=='),
+    'ne': (operator.ne, '!='),
+    'lt': (operator.lt, '<'),
+    'le': (operator.le, '<='),
+    'gt': (operator.gt, '>'),
+    'ge': (operator.ge, '>='),
+    'and': (operator.and_, '&'),
+    'or': (operator.or_, '|'),
+    'xor': (operator.xor, '^'),
+    'invert': (operator.invert, '~'),
+    'neg': (operator.neg, '-'),
+    'abs': (abs, 'abs'),
+    'isin': (_isin, 'isin'),
+    'between': (_between, 'between'),
+}
+
+# Operand count of each operator that is not binary
+_ARITY = {'invert': 1, 'neg': 1, 'abs': 1, 'between': 3}
+
+def _wrap(value: Any) -> 'Expression':
+    """Turn a plain Python value into a literal expression."""
+    return value if isinstance(value, Expression) else Expression('lit', (value,))
+
+
+def _binary(op: str) -> Callable:
+    """Build an operator method combining self with another operand."""
+    return lambda self, other: Expression(op, (self, _wrap(other)))
+
+
+def _reflected(op: str) -> Callable:
+    """Build a reflected operator method (other <op> self)."""
+    return lambda self, other: Expression(op, (_wrap(other), self))
+
+
+def _unary(op: str) -> Callable:
+    """Build a unary operator method."""
+    return lambda self: Expression(op, (self,))
+
+
+class Expression:
+    """
+    Column expression evaluated against a whole DataFrame at once.
+
+    Expressions are built with col() and lit() and combined with the usual
+    Python operators. Comparisons produce boolean masks, & / | / ~ combine
+    masks, and arithmetic works element-wise, so a predicate such as
+    ``(col('Total Revenue') > 100000) & (col('Region') == 'Europe')``
+    compiles to a handful of vectorized column operations instead of a
+    Python call per row.
+    """
+
+    __hash__ = None
+
+    def __init__(self, op: str, operands: Tuple[Any, ...]):
+        """
+        Initialize expression node.
+
+        Args:
+            op: Operation name ('col', 'lit' or a key of _OPERATORS)
+            operands: Child expressions, or the raw value for 'col'/'lit'
+        """
+        self.op = op
+        self.operands = operands
+
+    __add__ = _binary('add')
+    __radd__ = _reflected('add')
+    __sub__ = _binary('sub')
+    __rsub__ = _reflected('sub')
+    __mul__ = _binary('mul')
+    __rmul__ = _reflected('mul')
+    __truediv__ = _binary('truediv')
+    __rtruediv__ = _reflected('truediv')
+    __floordiv__ = _binary('floordiv')
+    __rfloordiv__ = _reflected('floordiv')
+    __mod__ = _binary('mod')
+    __rmod__ = _reflected('mod')
+    __pow__ = _binary('pow')
+    __rpow__ = _reflected('pow')
+    __neg__ = _unary('neg')
+    __abs__ = _unary('abs')
+
+    __eq__ = _binary('eq')
+    __ne__ = _binary('ne')
+    __lt__ = _binary('lt')
+    __le__ = _binary('le')
+    __gt__ = _binary('gt')
+    __ge__ = _binary('ge')
+
+    __and__ = _binary('and')
+    __rand__ = _reflected('and')
+    __or__ = _binary('or')
+    __ror__ = _reflected('or')
+    __xor__ = _binary('xor')
+    __rxor__ = _reflected('xor')
+    __invert__ = _unary('invert')
+
+    def __bool__(self):
+        raise TypeError("Expressions cannot be used as Python booleans; "
+                        "combine them with &, | and ~ instead of and/or/not")
+
+    def isin(self, values) -> 'Expression':
+        """Membership test against a collection of values."""
+        return Expression('isin', (self, _wrap(list(values))))
+
+    def between(self, low: Any, high: Any) -> 'Expression':
+        """Inclusive range test (low <= value <= high)."""
+        return Expression('between', (self, _wrap(low), _wrap(high)))
+
+    def abs(self) -> 'Expression':
+        """Absolute value."""
+        return Expression('abs', (self,))
+
+    def columns(self) -> Set[str]:
+        """
+        Get the column names referenced by this expression.
+
+        Returns:
+            Set of column names
+        """
+        if self.op == 'col':
+            return {self.operands[0]}
+        if self.op == 'lit':
+            return set()
+        return set().union(*(operand.columns() for operand in self.operands))
+
+    def to_dict(self) -> Any:
+        """
+        Convert to a JSON-compatible structure (inverse of from_dict).
+
+        Returns:
+            {'col': name}, {'lit': value} or {'op': name, 'args': [...]}
+        """
+        if self.op in ('col', 'lit'):
+            return {self.op: self.operands[0]}
+        return {'op': self.op, 'args': [operand.to_dict() for operand in self.operands]}
+
+    @classmethod
+    def from_dict(cls, spec: Any) -> 'Expression':
+        """
+        Build an expression from a JSON-compatible structure.
+
+        Dicts are {'col': name}, {'lit': value} or {'op': name, 'args':
+        [...]} with op one of the operator names (e.g. 'gt', 'and',
+        'isin'); any other value is taken as a literal, so
+        {'op': 'gt', 'args': [{'col': 'Units Sold'}, 100]} works.
+
+        Args:
+            spec: Expression structure
+
+        Returns:
+            Expression
+
+        Raises:
+            ValueError: If the structure is malformed
+        """
+        if not isinstance(spec, dict):
+            return lit(spec)
+        if set(spec) == {'col'}:
+            return col(spec['col'])
+        if set(spec) == {'lit'}:
+            return lit(spec['lit'])
+        if set(spec) != {'op', 'args'} or spec['op'] not in _OPERATORS:
+            raise ValueError(f"Invalid expression: {spec!r}")
+        args = spec['args']
+        arity = _ARITY.get(spec['op'], 2)
+        if not isinstance(args, list) or len(args) != arity:
+            raise ValueError(f"'{spec['op']}' takes {arity} argument(s): {spec!r}")
+        if spec['op'] == 'isin':
+            values = cls.from_dict(args[-1])
+            if values.op != 'lit':
+                raise ValueError(f"isin takes an expression and a list of values: {spec!r}")
+            return cls.from_dict(args[0]).isin(values.operands[0])
+        return cls(spec['op'], tuple(cls.from_dict(arg) for arg in args))
+
+    def _evaluate(self, df: pd.DataFrame) -> Any:
+        if self.op == 'col':
+            return df[self.operands[0]]
+        if self.op == 'lit':
+            return self.operands[0]
+        func, _ = _OPERATORS[self.op]
+        return func(*(operand._evaluate(df) for operand in self.operands))
+
+    def evaluate(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Evaluate expression against a DataFrame.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            Series aligned with df (scalars are broadcast)
+        """
+        result = self._evaluate(df)
+        if not isinstance(result, pd.Series):
+            result = pd.Series(result, index=df.index)
+        return result
+
+    def __call__(self, row: pd.Series) -> Any:
+        """Evaluate against a single row, so expressions work wherever lambdas do."""
+        return self._evaluate(row)
+
+    def __repr__(self) -> str:
+        if self.op == 'col':
+            return f"col({self.operands[0]!r})"
+        if self.op == 'lit':
+            return repr(self.operands[0])
+        _, symbol = _OPERATORS[self.op]
+        if self.op in ('isin', 'between', 'abs'):
+            args = ', '.join(repr(operand) for operand in self.operands[1:])
+            return f"{self.operands[0]!r}.{symbol}({args})"
+        if len(self.operands) == 1:
+            return f"{symbol}{self.operands[0]!r}"
+        left, right = self.operands
+        return f"({left!r} {symbol} {right!r})"
+
+
+def col(name: str) -> Expression:
+    """
+    Reference a column by name.
+
+    Args:
+        name: Column name
+
+    Returns:
+        Column expression
+    """
+    return Expression('col', (name,))
+
+
+def lit(value: Any) -> Expression:
+    """
+    Wrap a constant value.
+
+    Args:
+        value: Literal value
+
+    Returns:
+        Literal expression
+    """
+    return Expression('lit', (value,))
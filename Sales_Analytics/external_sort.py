@@ -0,0 +1,254 @@
+import copy
+import itertools
+import os
+import pickle
+import tempfile
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from .expressions import Expression
+except ImportError:
+    from expressions import Expression
+
+# A spilled run: file path and number of pickled batches in it
+Run = Tuple[str, int]
+
+
+class ExternalSort:
+    """
+    Out-of-core sort of a stream of record chunks by one column.
+
+    Incoming chunks are cut into runs of run_rows records; each run is
+    sorted in memory and spilled to a temporary file as pickled batches.
+    Reading merges the runs lazily, one batch per run at a time, so memory
+    stays around run_rows records however large the input is. When there
+    are more than max_runs runs, they are first merged max_runs at a time
+    into longer runs.
+
+    The order is that of a stable sort_values(key, ascending) with missing
+    keys last: records with equal keys keep their input order. slice()
+    restricts reads to a row range; merging stops at the end of the range
+    and skipped rows are never collected. Temporary files are removed by
+    close(), or once the sort and all its slices are garbage collected.
+    """
+
+    def __init__(self, chunks: Iterable[pd.DataFrame], key: str, ascending: bool = True,
+                 run_rows: int = 1_000_000, max_runs: int = 64,
+                 spill_dir: Optional[str] = None):
+        """
+        Sort chunks into spilled runs.
+
+        Args:
+            chunks: Record chunks with the same columns, e.g. from
+                DataLoader.iter_chunks()
+            key: Column to sort by
+            ascending: Sort order
+            run_rows: Records sorted in memory at once
+            max_runs: Runs merged at once (the merge holds one batch of
+                run_rows / max_runs records per run)
+            spill_dir: Directory for the temporary files (defaults to the
+                system temporary directory)
+        """
+        if run_rows < 1 or max_runs < 2:
+            raise ValueError("run_rows must be positive and max_runs at least 2")
+        self.key = key
+        self.ascending = ascending
+        self.max_runs = max_runs
+        self.batch_rows = max(run_rows // max_runs, 1)
+        self.start, self.stop = 0, None
+        self.total_rows = 0
+        self._tmp = tempfile.TemporaryDirectory(prefix='external-sort-', dir=spill_dir)
+        self._run_ids = itertools.count()
+        self._runs: List[Run] = []
+        self._template: Optional[pd.DataFrame] = None
+
+        pending, pending_rows = [], 0
+        for chunk in chunks:
+            if self._template is None:
+                self._template = chunk.iloc[:0]
+            self.total_rows += len(chunk)
+            pending.append(chunk)
+            pending_rows += len(chunk)
+            while pending_rows >= run_rows:
+                frame = pd.concat(pending) if len(pending) > 1 else pending[0]
+                self._runs.append(self._spill([self._sort(frame.iloc[:run_rows])]))
+                pending = [frame.iloc[run_rows:]]
+                pending_rows -= run_rows
+        if pending_rows:
+            self._runs.append(self._spill([self._sort(pd.concat(pending))]))
+
+        while len(self._runs) > max_runs:
+            runs, self._runs = self._runs, []
+            for i in range(0, len(runs), max_runs):
+                group = runs[i:i + max_runs]
+                self._runs.append(self._spill(self._merge(group)) if len(group) > 1 else group[0])
+                if len(group) > 1:
+                    for path, _ in group:
+                        os.remove(path)
+
+    def __len__(self) -> int:
+        """Number of records in the (sliced) result."""
+        stop = self.total_rows if self.stop is None else min(self.stop, self.total_rows)
+        return max(stop - self.start, 0)
+
+    def close(self) -> None:
+        """Remove the spilled runs; the sort cannot be read afterwards."""
+        self._tmp.cleanup()
+
+    def __enter__(self) -> 'ExternalSort':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> 'ExternalSort':
+        """
+        Restrict to a row range of the sorted result, without reading.
+
+        Args:
+            start: First row, relative to this sort's range
+            stop: End row (exclusive), relative to this sort's range
+
+        Returns:
+            ExternalSort over the same runs
+        """
+        view = copy.copy(self)
+        view.start = self.start + start
+        bounds = [bound for bound in (self.stop, None if stop is None else self.start + stop)
+                  if bound is not None]
+        view.stop = min(bounds) if bounds else None
+        return view
+
+    def _sort(self, frame: pd.DataFrame) -> pd.DataFrame:
+        return frame.sort_values(self.key, ascending=self.ascending, kind='stable',
+                                 na_position='last')
+
+    def _spill(self, frames: Iterable[pd.DataFrame]) -> Run:
+        """Write sorted frames to a new run file in batches of batch_rows."""
+        path = os.path.join(self._tmp.name, f"run-{next(self._run_ids)}.pkl")
+        batches = 0
+        with open(path, 'wb') as file:
+            for frame in frames:
+                for start in range(0, len(frame), self.batch_rows):
+                    pickle.dump(frame.iloc[start:start + self.batch_rows], file,
+                                protocol=pickle.HIGHEST_PROTOCOL)
+                    batches += 1
+        return path, batches
+
+    @staticmethod
+    def _read_run(run: Run, group: int = 1) -> Iterator[pd.DataFrame]:
+        """Read a run, concatenating every group consecutive batches."""
+        path, batches = run
+        with open(path, 'rb') as file:
+            for start in range(0, batches, group):
+                frames = [pickle.load(file) for _ in range(min(group, batches - start))]
+                yield pd.concat(frames) if len(frames) > 1 else frames[0]
+
+    def _precedes(self, keys, bound):
+        """Whether keys (a value or a Series) order strictly before bound."""
+        return keys < bound if self.ascending else keys > bound
+
+    def _merge(self, runs: List[Run]) -> Iterator[pd.DataFrame]:
+        """
+        Merge sorted runs lazily, in batches.
+
+        Each step emits every buffered record that orders at or before the
+        frontier: the last buffered record, in output order, of the runs
+        that may still supply smaller keys. Ties order by run, then by
+        position in the run, which keeps the merge stable. Records with a
+        missing key sort last in every run; they are set aside and emitted
+        run by run at the end.
+        """
+        # Fewer runs than max_runs can read more batches at a time in
+        # the same memory
+        group = max(self.max_runs // len(runs), 1)
+        readers = [self._read_run(run, group) for run in runs]
+        remaining = [-(-batches // group) for _, batches in runs]
+        buffers = [self._template] * len(runs)
+        missing: List[List[pd.DataFrame]] = [[] for _ in runs]
+
+        while True:
+            for i, reader in enumerate(readers):
+                # A run that reached its missing keys has no more to merge
+                while len(buffers[i]) == 0 and remaining[i] > 0 and not missing[i]:
+                    batch = next(reader)
+                    remaining[i] -= 1
+                    absent = batch[self.key].isna().to_numpy()
+                    if absent.any():
+                        missing[i].append(batch[absent])
+                        batch = batch[~absent]
+                    buffers[i] = batch
+            open_runs = [i for i in range(len(runs))
+                         if remaining[i] > 0 and not missing[i] and len(buffers[i]) > 0]
+            if not any(len(buffer) for buffer in buffers):
+                break
+            parts = []
+            if open_runs:
+                lasts = {i: buffers[i][self.key].iloc[-1] for i in open_runs}
+                frontier = open_runs[0]
+                for i in open_runs[1:]:
+                    if self._precedes(lasts[i], lasts[frontier]):
+                        frontier = i
+                bound = lasts[frontier]
+            for i, buffer in enumerate(buffers):
+                if len(buffer) == 0:
+                    continue
+                if open_runs:
+                    keys = buffer[self.key]
+                    emit = self._precedes(keys, bound) | ((keys == bound) & (i <= frontier))
+                    # Buffers are sorted, so the emitted records are a prefix
+                    count = int(emit.sum())
+                else:
+                    count = len(buffer)
+                parts.append(buffer.iloc[:count])
+                buffers[i] = buffer.iloc[count:]
+            merged = pd.concat(parts) if len(parts) > 1 else parts[0]
+            if len(merged):
+                yield self._sort(merged)
+
+        for i, reader in enumerate(readers):
+            yield from missing[i]
+            for _ in range(remaining[i]):
+                yield next(reader)
+
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield the sorted records in order, in batches.
+
+        Returns:
+            Iterator of DataFrames covering the (sliced) result
+        """
+        if len(self) == 0:
+            return
+        position, stop = 0, self.start + len(self)
+        if len(self._runs) > 1:
+            batches = self._merge(self._runs)
+        else:
+            batches = self._read_run(self._runs[0], self.max_runs)
+        for batch in batches:
+            end = position + len(batch)
+            if end > self.start:
+                yield batch.iloc[max(self.start - position, 0):stop - position]
+            position = end
+            if position >= stop:
+                batches.close()
+                return
+
+    def read(self, predicate: Optional[Expression] = None) -> pd.DataFrame:
+        """
+        Collect the sorted records into one DataFrame.
+
+        Args:
+            predicate: Optional boolean expression applied batch by batch,
+                so only matching records are held
+
+        Returns:
+            DataFrame in sorted order
+        """
+        frames = [batch if predicate is None else batch[predicate.evaluate(batch).to_numpy()]
+                  for batch in self.iter_batches()]
+        if frames:
+            return pd.concat(frames)
+        return self._template.copy() if self._template is not None else pd.DataFrame()
@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+try:
+    from .expressions import Expression
+except ImportError:
+    from expressions import Expression
+
+# Comparison with the operands swapped (lit <op> col == col <flipped op> lit)
+_FLIPPED = {'eq': 'eq', 'lt': 'gt', 'le': 'ge', 'gt': 'lt', 'ge': 'le'}
+
+
+class HashIndex:
+    """Hash index from column values to row positions (O(1) point lookups)."""
+
+    def __init__(self, values: pd.Series):
+        """
+        Build index over a column.
+
+        Args:
+            values: Column to index
+        """
+        self._index = pd.Index(values.to_numpy())
+
+    def lookup(self, keys: Iterable[Any]) -> np.ndarray:
+        """
+        Find rows holding any of the given values.
+
+        Args:
+            keys: Values to look up
+
+        Returns:
+            Sorted row positions
+        """
+        keys = list(keys)
+        if self._index.is_unique:
+            positions = self._index.get_indexer(keys)
+        else:
+            positions, _ = self._index.get_indexer_non_unique(keys)
+        return np.unique(positions[positions >= 0])
+
+
+class SortedIndex:
+    """Sorted-array index over a column (O(log n) range lookups)."""
+
+    def __init__(self, values: pd.Series):
+        """
+        Build index over a column.
+
+        Args:
+            values: Column to index
+        """
+        array = values.to_numpy()
+        self._order = np.argsort(array, kind='stable')
+        self._sorted = array[self._order]
+        # Missing values sort to the end and never satisfy a comparison
+        self._valid = int(values.notna().sum())
+        self._is_datetime = pd.api.types.is_datetime64_any_dtype(values)
+
+    def _coerce(self, value: Any) -> Any:
+        if self._is_datetime:
+            return np.datetime64(pd.Timestamp(value))
+        return value
+
+    def range(self, low: Any = None, high: Any = None,
+              low_inclusive: bool = True, high_inclusive: bool = True) -> np.ndarray:
+        """
+        Find rows whose value lies within a range.
+
+        Args:
+            low: Lower bound (None for unbounded)
+            high: Upper bound (None for unbounded)
+            low_inclusive: Whether the lower bound matches
+            high_inclusive: Whether the upper bound matches
+
+        Returns:
+            Sorted row positions
+        """
+        valid = self._sorted[:self._valid]
+        start = 0 if low is None else np.searchsorted(
+            valid, self._coerce(low), side='left' if low_inclusive else 'right')
+        stop = self._valid if high is None else np.searchsorted(
+            valid, self._coerce(high), side='right' if high_inclusive else 'left')
+        return np.sort(self._order[start:max(start, stop)])
+
+
+class TableIndexes:
+    """
+    Optional index layer over a loaded dataset.
+
+    Holds hash indexes for point lookups (Order ID by default) and sorted
+    indexes for range slicing (Order Date and Ship Date). candidates()
+    maps a filter expression to the row positions that can match it, or
+    None when the expression is not answerable from the indexes.
+    """
+
+    def __init__(self, data: pd.DataFrame,
+                 hash_columns: Sequence[str] = ('Order ID',),
+                 sorted_columns: Sequence[str] = ('Order Date', 'Ship Date')):
+        """
+        Build indexes over a DataFrame.
+
+        Args:
+            data: Indexed DataFrame (positions refer to its rows)
+            hash_columns: Columns to index for equality/membership lookups
+            sorted_columns: Columns to index for range lookups
+        """
+        self.size = len(data)
+        self.hash_indexes = {c: HashIndex(data[c]) for c in hash_columns if c in data.columns}
+        self.sorted_indexes = {c: SortedIndex(data[c]) for c in sorted_columns if c in data.columns}
+
+    @staticmethod
+    def _column_comparison(predicate: Expression) -> Optional[Tuple[str, str, Any]]:
+        """Normalize col <op> lit / lit <op> col into (column, op, value)."""
+        if predicate.op not in _FLIPPED:
+            return None
+        left, right = predicate.operands
+        if left.op == 'col' and right.op == 'lit':
+            return left.operands[0], predicate.op, right.operands[0]
+        if left.op == 'lit' and right.op == 'col':
+            return right.operands[0], _FLIPPED[predicate.op], left.operands[0]
+        return None
+
+    def _lookup(self, predicate: Expression) -> Optional[np.ndarray]:
+        """Answer a single comparison from an index, if one applies."""
+        if predicate.op in ('isin', 'between'):
+            column_expr, *bounds = predicate.operands
+            if column_expr.op != 'col' or any(b.op != 'lit' for b in bounds):
+                return None
+            column = column_expr.operands[0]
+            values = [b.operands[0] for b in bounds]
+            if predicate.op == 'isin':
+                if column in self.hash_indexes:
+                    return self.hash_indexes[column].lookup(values[0])
+                if column in self.sorted_indexes:
+                    index = self.sorted_indexes[column]
+                    return np.unique(np.concatenate(
+                        [index.range(v, v) for v in values[0]] or [np.array([], dtype=int)]))
+                return None
+            if column in self.sorted_indexes:
+                return self.sorted_indexes[column].range(values[0], values[1])
+            return None
+
+        comparison = self._column_comparison(predicate)
+        if comparison is None:
+            return None
+        column, op, value = comparison
+        if op == 'eq' and column in self.hash_indexes:
+            return self.hash_indexes[column].lookup([value])
+        if column not in self.sorted_indexes:
+            return None
+        index = self.sorted_indexes[column]
+        if op == 'eq':
+            return index.range(value, value)
+        if op in ('lt', 'le'):
+            return index.range(high=value, high_inclusive=op == 'le')
+        return index.range(low=value, low_inclusive=op == 'ge')
+
+    def candidates(self, predicate: Expression) -> Optional[np.ndarray]:
+        """
+        Get the row positions that may satisfy a predicate.
+
+        Conjunctions only need one indexed side; disjunctions need both.
+        The predicate must still be evaluated on the candidate rows.
+
+        Args:
+            predicate: Boolean expression
+
+        Returns:
+            Sorted row positions, or None if the indexes cannot help
+        """
+        if predicate.op == 'and':
+            left, right = (self.candidates(operand) for operand in predicate.operands)
+            if left is None or right is None:
+                return right if left is None else left
+            return np.intersect1d(left, right, assume_unique=True)
+        if predicate.op == 'or':
+            left, right = (self.candidates(operand) for operand in predicate.operands)
+            if left is None or right is None:
+                return None
+            return np.union1d(left, right)
+        try:
+            return self._lookup(predicate)
+        except (TypeError, ValueError):
+            # Literal not comparable with the indexed column; fall back to a scan
+            return None
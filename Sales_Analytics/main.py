@@ -1,8 +1,27 @@
+import argparse
+import os
 import pandas as pd
 import operator
-from data_loader import DataLoader
+from functools import partial, reduce
+from typing import Dict, List, Optional
+from data_loader import DataLoader, SOURCE_COLUMNS
+from deduplication import DEFAULT_KEY
 from stream_operations import StreamOperations
-from sales_analytics import SalesAnalytics
+from sales_analytics import REPORT_COLUMNS, SalesAnalytics, required_columns
+from report_runner import ReportRequest, ReportRunner
+from expressions import Expression, col
+
+DEFAULT_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sales_data.csv')
+
+# Command-line filter option -> column it restricts
+FILTERS = {
+    'region': 'Region',
+    'country': 'Country',
+    'item_type': 'Item Type',
+    'channel': 'Sales Channel',
+    'priority': 'Order Priority',
+    'year': 'Year',
+}
 
 
 def print_header(title: str):
@@ -34,13 +53,13 @@ def demo_stream_operations(data: pd.DataFrame):
     
     # 1. Filter + Count
     print("\n1. Filter: High-value orders (Revenue > $100,000)")
-    high_value_count = stream.filter(lambda x: x['Total Revenue'] > 100000).count()
+    high_value_count = stream.filter(col('Total Revenue') > 100000).count()
     print(f"   Result: {high_value_count} orders found")
     
     # 2. Filter + Sorted + Limit
     print("\n2. Top 5 orders by profit (chained operations)")
     top_5 = (stream
-             .filter(lambda x: x['Total Profit'] > 0)
+             .filter(col('Total Profit') > 0)
              .sorted_by('Total Profit', ascending=False)
              .limit(5)
              .collect())
@@ -49,7 +68,7 @@ def demo_stream_operations(data: pd.DataFrame):
     
     # 3. Map operation
     print("\n3. Map: Extract profit margins")
-    margins = stream.map(lambda x: x['Profit Margin'])
+    margins = stream.map(col('Profit Margin'))
     print(f"   Average Margin: {margins.mean():.2f}%")
     print(f"   Max Margin: {margins.max():.2f}%")
     print(f"   Min Margin: {margins.min():.2f}%")
@@ -68,16 +87,16 @@ def demo_stream_operations(data: pd.DataFrame):
     
     # 6. AnyMatch / AllMatch
     print("\n6. Match operations")
-    has_loss = stream.any_match(lambda x: x['Total Profit'] < 0)
-    all_positive = stream.all_match(lambda x: x['Total Revenue'] > 0)
+    has_loss = stream.any_match(col('Total Profit') < 0)
+    all_positive = stream.all_match(col('Total Revenue') > 0)
     print(f"   Any loss-making orders? {has_loss}")
     print(f"   All orders have positive revenue? {all_positive}")
     
     # 7. Complex chain
     print("\n7. Complex chain: Online + High revenue + Top 3")
     complex_result = (stream
-                      .filter(lambda x: x['Sales Channel'] == 'Online')
-                      .filter(lambda x: x['Total Revenue'] > 50000)
+                      .filter((col('Sales Channel') == 'Online') &
+                              (col('Total Revenue') > 50000))
                       .sorted_by('Total Profit', ascending=False)
                       .limit(3)
                       .collect())
@@ -101,45 +120,32 @@ def demo_aggregations(data: pd.DataFrame):
     
     analytics = SalesAnalytics(data)
     
-    # 1. Revenue by region
-    print("\n1. Total Revenue by Region")
-    result = analytics.total_revenue_by_region()
-    print_result(result, "   Regional Performance:")
-    
-    # 2. Top countries
-    print("\n2. Top 10 Countries by Revenue")
-    result = analytics.top_countries_by_revenue(10)
-    print_result(result, "   Top Countries:")
-    
-    # 3. Item type analysis
-    print("\n3. Revenue by Item Type")
-    result = analytics.revenue_by_item_type()
-    print_result(result, "   Item Analysis:")
-    
-    # 4. Sales channel
-    print("\n4. Sales Channel Comparison")
-    result = analytics.sales_channel_comparison()
-    print_result(result, "   Channel Performance:")
-    
-    # 5. Order priority
-    print("\n5. Order Priority Analysis")
-    result = analytics.order_priority_analysis()
-    print_result(result, "   Priority Analysis:")
-    
-    # 6. Monthly trends
-    print("\n6. Monthly Revenue Trend")
-    result = analytics.monthly_revenue_trend()
-    print_result(result, "   Monthly Trends:", 12)
+    # (section heading, result title, report request, rows shown, keep only shown rows)
+    reports = [
+        ("1. Total Revenue by Region", "   Regional Performance:",
+         ReportRequest('total_revenue_by_region'), 10, False),
+        ("2. Top 10 Countries by Revenue", "   Top Countries:",
+         ReportRequest('top_countries_by_revenue', 10), 10, False),
+        ("3. Revenue by Item Type", "   Item Analysis:",
+         ReportRequest('revenue_by_item_type'), 10, False),
+        ("4. Sales Channel Comparison", "   Channel Performance:",
+         ReportRequest('sales_channel_comparison'), 10, False),
+        ("5. Order Priority Analysis", "   Priority Analysis:",
+         ReportRequest('order_priority_analysis'), 10, False),
+        ("6. Monthly Revenue Trend", "   Monthly Trends:",
+         ReportRequest('monthly_revenue_trend'), 12, False),
+        ("7. Top 3 Profitable Items per Region", "   Regional Best Performers:",
+         ReportRequest('top_profitable_items_by_region', 3), 15, False),
+        ("8. Top 10 Combinations by Profit Margin", "   High Margin Combinations:",
+         ReportRequest('profit_margin_by_category'), 10, True),
+    ]
     
-    # 7. Top items by region
-    print("\n7. Top 3 Profitable Items per Region")
-    result = analytics.top_profitable_items_by_region(3)
-    print_result(result, "   Regional Best Performers:", 15)
-    
-    # 8. Profit margins
-    print("\n8. Top 10 Combinations by Profit Margin")
-    result = analytics.profit_margin_by_category().head(10)
-    print_result(result, "   High Margin Combinations:")
+    # Run all reports concurrently, then print them in order
+    results = ReportRunner(analytics).run_all([request for _, _, request, _, _ in reports])
+    for heading, title, request, rows, head_only in reports:
+        result = results[request.name]
+        print(f"\n{heading}")
+        print_result(result.head(rows) if head_only else result, title, rows)
 
 
 def demo_lambda_expressions(data: pd.DataFrame):
@@ -186,15 +192,107 @@ def demo_lambda_expressions(data: pd.DataFrame):
     print_result(result.reset_index(), "   Statistics:")
 
 
-def main():
+def filter_expression(filters: Dict[str, list]) -> Optional[Expression]:
+    """Combine column -> allowed values into one predicate (None if empty)."""
+    predicates = [col(column).isin(values) for column, values in filters.items()]
+    return reduce(lambda left, right: left & right, predicates) if predicates else None
+
+
+def load_report_data(csv_file: str, reports: List[str], filters: Dict[str, list]):
+    """
+    Load the records in scope for some reports, keeping only the columns
+    and deriving only the fields they need.
+    
+    clean_data drops a record with a null in any column, so every column
+    is read to keep the same records as a full load; each file is cut
+    down to the needed columns as soon as it is cleaned.
+    
+    Args:
+        csv_file: Sales export (CSV, compressed file or zip)
+        reports: SalesAnalytics report names
+        filters: Column -> allowed values, applied before the reports
+        
+    Returns:
+        Tuple of (records in scope, source columns kept, fields derived)
+    """
+    # The deduplication key keeps duplicates across files detectable
+    needed = required_columns(reports) + list(filters) + list(DEFAULT_KEY)
+    sources, fields = DataLoader.plan_columns(needed)
+    
+    loader = DataLoader(csv_file)
+    loader.load_data([DataLoader.clean_data, operator.itemgetter(sources)], deduplicate=True)
+    transformations = [DataLoader.parse_dates]
+    if fields:
+        transformations.append(partial(DataLoader.add_calculated_fields, fields=fields))
+    data = loader.apply_transformations(transformations)
+    predicate = filter_expression(filters)
+    if predicate is not None:
+        data = data[predicate.evaluate(data)].reset_index(drop=True)
+    return data, sources, fields
+
+
+def run_reports(csv_file: str, reports: List[str], filters: Dict[str, list], rows: int):
+    """
+    Run selected reports, keeping and deriving only the columns they need.
+    
+    Args:
+        csv_file: Sales export (CSV, compressed file or zip)
+        reports: SalesAnalytics report names
+        filters: Column -> allowed values, applied before the reports
+        rows: Rows to print per report
+    """
+    data, sources, fields = load_report_data(csv_file, reports, filters)
+    print(f"✓ Kept {len(sources)} of {len(SOURCE_COLUMNS)} columns, "
+          f"derived {', '.join(fields) if fields else 'no fields'}; {len(data)} records in scope")
+    
+    requests = [ReportRequest(report) for report in reports]
+    results = ReportRunner(SalesAnalytics(data)).run_all(requests)
+    for request in requests:
+        print_header(request.method.replace('_', ' ').upper())
+        print_result(results[request.name], "   Result:", rows)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Sales data analysis. Without --report, runs every demonstration.")
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV,
+                        help="Sales export: CSV, .gz/.zst file or .zip (default: sales_data.csv "
+                             "next to this script)")
+    parser.add_argument('-r', '--report', action='append', dest='reports',
+                        choices=list(REPORT_COLUMNS), metavar='REPORT',
+                        help="Run only this report (repeatable); only the columns it needs "
+                             "are loaded. See --list-reports")
+    parser.add_argument('--list-reports', action='store_true', help="List report names and exit")
+    parser.add_argument('--rows', type=int, default=10, help="Rows printed per report (default: 10)")
+    filters = parser.add_argument_group('filters (applied before any analysis)')
+    for option, column in FILTERS.items():
+        filters.add_argument(f"--{option.replace('_', '-')}", nargs='+', metavar='VALUE',
+                             type=int if column == 'Year' else str,
+                             help=f"Keep only these {column} values")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
     """Main entry point."""
+    args = parse_args(argv)
+    if args.list_reports:
+        for report, columns in REPORT_COLUMNS.items():
+            print(f"{report:<32} {', '.join(columns)}")
+        return
+    filters = {column: getattr(args, option) for option, column in FILTERS.items()
+               if getattr(args, option)}
+    
     print("=" * 80)
     print(" SALES DATA ANALYSIS - FUNCTIONAL PROGRAMMING")
     print("=" * 80)
-    csv_file = "/Users/padmajasharma/Desktop/Build Challenge/Sales_Analytics/sales_data.csv"
-
+    csv_file = args.csv
     
     try:
+        if args.reports:
+            run_reports(csv_file, args.reports, filters, args.rows)
+            return
+        
         # Load and transform data
         print("\nInitializing...")
         loader = DataLoader(csv_file)
@@ -207,6 +305,10 @@ def main():
             DataLoader.add_calculated_fields
         ]
         data = loader.apply_transformations(transformations)
+        predicate = filter_expression(filters)
+        if predicate is not None:
+            data = data[predicate.evaluate(data)].reset_index(drop=True)
+            loader.data = data
         
         # Display info
         info = loader.get_info()
@@ -229,7 +331,8 @@ def main():
         print(f"\n✗ Error: File '{csv_file}' not found")
         print("\nPlease download sales data:")
         print("https://excelbianalytics.com/wp/wp-content/uploads/2017/07/10000-Sales-Records.zip")
-        print("Extract and save as 'sales_data.csv' in the project directory")
+        print("Save it as 'sales_data.csv' in the project directory; the .zip (or a .gz/.zst)")
+        print("can also be used as it is, without extracting it")
     except Exception as e:
         print(f"\n✗ Error: {str(e)}")
 
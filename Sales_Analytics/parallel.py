@@ -0,0 +1,270 @@
+import math
+import multiprocessing
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .sketches import _mix64
+except ImportError:
+    from sketches import _mix64
+
+# Task of the running parallel call, inherited by forked workers so it
+# does not have to be pickled. Only set from single-threaded processes
+# (see _can_fork), so no lock is needed.
+_worker_task: Optional[tuple] = None
+
+# Row slices per worker: a few per worker evens out uneven rows
+CHUNKS_PER_WORKER = 4
+
+# Column carrying original row positions, to restore first-appearance order
+_ROW = '__row'
+
+
+def _can_fork() -> bool:
+    """
+    Whether worker processes can be forked safely from the calling thread.
+
+    A forked child only has a copy of the forking thread, so a lock that
+    another thread held at that moment (in pandas, NumPy, logging, ...)
+    stays locked in the child forever. Multithreaded callers, such as
+    reports run on ReportRunner's thread pool or the threaded query
+    server, are therefore never forked from.
+    """
+    return 'fork' in multiprocessing.get_all_start_methods() and threading.active_count() == 1
+
+
+def _row_dtype(frame: pd.DataFrame) -> np.dtype:
+    """dtype of the rows apply(axis=1) passes to the function."""
+    return frame.iloc[:0].to_numpy().dtype
+
+
+def _apply_rows(func: Callable, frame: pd.DataFrame, dtype: Optional[np.dtype]) -> Any:
+    """Apply func to each row, upcasting first so rows match the full frame's."""
+    if dtype is not None:
+        frame = frame.astype(dtype)
+    return frame.apply(func, axis=1)
+
+
+def _apply_inherited(start: int, stop: int) -> Any:
+    """Apply the inherited task to one row slice (runs in a forked worker)."""
+    func, frame, dtype = _worker_task
+    return _apply_rows(func, frame.iloc[start:stop], dtype)
+
+
+def _run(func: Callable, frame: pd.DataFrame, dtype: Optional[np.dtype], workers: int) -> Any:
+    """Apply func to the rows of frame on a process pool, keeping row order."""
+    global _worker_task
+    bounds = np.linspace(0, len(frame), workers * CHUNKS_PER_WORKER + 1).astype(int)
+    slices = [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+    if _can_fork():
+        _worker_task = (func, frame, dtype)
+        try:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context('fork')) as pool:
+                futures = [pool.submit(_apply_inherited, start, stop) for start, stop in slices]
+                return pd.concat([future.result() for future in futures])
+        finally:
+            _worker_task = None
+
+    # Spawned workers receive the function by pickle, which lambdas and
+    # closures do not survive
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return _apply_rows(func, frame, dtype)
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = [pool.submit(_apply_rows, func, frame.iloc[start:stop], dtype)
+                   for start, stop in slices]
+        return pd.concat([future.result() for future in futures])
+
+
+def parallel_apply(func: Callable, data: pd.DataFrame, workers: Optional[int] = None,
+                   columns: Optional[Sequence[str]] = None) -> Any:
+    """
+    Apply a row function like data.apply(func, axis=1), on a process pool.
+
+    The rows are split into contiguous slices that workers evaluate
+    independently; results are concatenated in row order, so the output
+    equals the serial apply. Workers see whole rows unless columns is
+    given: the function then only receives those columns, cast to the
+    dtype the full frame's rows would have, and must not look at any
+    other part of the row (len(row), row.notna(), row.iloc, ...).
+
+    From a single-threaded process the workers are forked and inherit the
+    function and frame, so any callable works, lambdas and closures
+    included. Otherwise (no fork, or other threads running; see
+    _can_fork) workers are spawned and each slice is sent to them, which
+    needs a picklable function; other functions run serially.
+
+    Args:
+        func: Function of a row (a Series)
+        data: Records to evaluate
+        workers: Number of processes (defaults to the number of CPUs)
+        columns: Columns the function reads, to send only those
+
+    Returns:
+        Results indexed like data
+    """
+    workers = workers or os.cpu_count() or 1
+    if columns is None:
+        return _run(func, data, None, workers)
+    projected = data[list(columns)]
+    dtype = _row_dtype(data)
+    return _run(func, projected, None if dtype == _row_dtype(projected) else dtype, workers)
+
+
+def factorize_keys(data: pd.DataFrame, keys: List[str]) -> Tuple[List[np.ndarray], List[pd.Index]]:
+    """
+    Encode each key column as integer codes into its distinct values.
+
+    Missing values get a code of their own, so every row has a group.
+
+    Args:
+        data: Records
+        keys: Key columns
+
+    Returns:
+        (int64 codes per key, distinct values per key)
+    """
+    codes, uniques = [], []
+    for key in keys:
+        key_codes, key_uniques = pd.factorize(data[key], use_na_sentinel=False)
+        codes.append(key_codes.astype(np.int64))
+        uniques.append(pd.Index(key_uniques))
+    return codes, uniques
+
+
+def pack_codes(codes: List[np.ndarray], uniques: List[pd.Index]) -> Optional[np.ndarray]:
+    """
+    Combine per-key codes into one int64 per row, in mixed radix.
+
+    Returns:
+        Packed codes, or None if the combinations do not fit in 62 bits
+    """
+    sizes = [max(len(key_uniques), 1) for key_uniques in uniques]
+    if math.prod(sizes) >= 2 ** 62:
+        return None
+    combined = np.zeros(len(codes[0]) if codes else 0, dtype=np.int64)
+    for key_codes, size in zip(codes, sizes):
+        combined = combined * size + key_codes
+    return combined
+
+
+def unpack_codes(combined: np.ndarray, uniques: List[pd.Index]) -> List[np.ndarray]:
+    """Split packed codes (see pack_codes) back into per-key codes."""
+    codes = []
+    for key_uniques in reversed(uniques):
+        combined, key_codes = np.divmod(combined, max(len(key_uniques), 1))
+        codes.insert(0, key_codes)
+    return codes
+
+
+def key_index(codes: List[np.ndarray], uniques: List[pd.Index], keys: List[str]) -> pd.Index:
+    """
+    Build the group index for per-key codes (see factorize_keys).
+
+    Returns:
+        Index (one key) or MultiIndex named after keys, with the key dtypes
+        groupby would produce
+    """
+    if len(keys) == 1:
+        return uniques[0].take(codes[0]).rename(keys[0])
+    if not any(key_uniques.hasnans for key_uniques in uniques):
+        # The factorization already is a valid level/code encoding
+        return pd.MultiIndex(levels=uniques, codes=codes, names=keys, verify_integrity=False)
+    return pd.MultiIndex.from_arrays(
+        [key_uniques.take(key_codes) for key_uniques, key_codes in zip(uniques, codes)],
+        names=keys)
+
+
+def _aggregate_inherited(partition: int) -> Optional[pd.DataFrame]:
+    """Aggregate the rows of one hash partition (runs in a forked worker)."""
+    frame, partitions, group_keys, agg = _worker_task
+    rows = np.flatnonzero(partitions == partition)
+    if len(rows) == 0:
+        return None
+    part = frame.take(rows)
+    part[_ROW] = rows
+    return part.groupby(group_keys, sort=False).agg({**agg, _ROW: 'min'})
+
+
+def parallel_group_aggregate(data: pd.DataFrame, keys: List[str], agg: dict,
+                             workers: Optional[int] = None, dropna: bool = True,
+                             sort: bool = True) -> pd.DataFrame:
+    """
+    Grouped aggregation like data.groupby(keys).agg(agg), on a process pool.
+
+    Rows are hash-partitioned on the key columns, one partition per
+    worker, so every group lives entirely in one partition and workers
+    aggregate their partitions independently; any aggregation (sum, mean,
+    nunique, a callable, ...) is therefore exact, and partition results
+    only need concatenating. Workers group on the integer factorization
+    codes of the keys, which are cheaper to group and to send back than
+    the key values; the key index is rebuilt once at the end. Groups come
+    back in sorted key order, or in order of first appearance with
+    sort=False, as with groupby(observed=True).
+
+    Args:
+        data: Records to aggregate (inherited by forked workers; from
+            a multithreaded process the aggregation runs serially)
+        keys: Columns to group by
+        agg: Column -> aggregation(s), as for DataFrame.agg
+        workers: Number of processes (defaults to the number of CPUs)
+        dropna: Drop groups with a missing key
+        sort: Sort the result by key
+
+    Returns:
+        Aggregated DataFrame indexed by keys
+    """
+    global _worker_task
+    workers = workers or os.cpu_count() or 1
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    if not _can_fork():
+        return data.groupby(keys, dropna=dropna, observed=True, sort=sort).agg(agg)
+
+    codes, uniques = factorize_keys(data, keys)
+    combined = pack_codes(codes, uniques)
+    if combined is not None:
+        key_columns = {'__key': combined}
+        hashes = _mix64(combined)
+    else:
+        key_columns = {f'__key{i}': key_codes for i, key_codes in enumerate(codes)}
+        hashes = np.zeros(len(data), dtype=np.uint64)
+        for key_codes in codes:
+            hashes = _mix64(hashes ^ key_codes.astype(np.uint64))
+    # Hashing spreads groups evenly, so one partition per worker suffices
+    partitions = (hashes % np.uint64(workers)).astype(np.intp)
+    if dropna:
+        for key_codes, key_uniques in zip(codes, uniques):
+            if key_uniques.hasnans:
+                partitions[np.asarray(key_uniques.isna())[key_codes]] = -1
+    frame = data[list(dict.fromkeys(agg))].assign(**key_columns)
+
+    _worker_task = (frame, partitions, list(key_columns), agg)
+    try:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context('fork')) as pool:
+            parts = [part for part in pool.map(_aggregate_inherited, range(workers))
+                     if part is not None]
+    finally:
+        _worker_task = None
+    if not parts:
+        return data.iloc[:0].groupby(keys, dropna=dropna, observed=True, sort=sort).agg(agg)
+
+    result = pd.concat(parts)
+    first = result.pop(result.columns[-1]).to_numpy()
+    result = result.iloc[np.argsort(first, kind='stable')]
+    if combined is not None:
+        group_codes = unpack_codes(result.index.to_numpy(), uniques)
+    else:
+        group_codes = [result.index.get_level_values(i).to_numpy() for i in range(len(keys))]
+    result.index = key_index(group_codes, uniques, keys)
+    return result.sort_index() if sort else result
@@ -0,0 +1,247 @@
+import math
+import os
+import pandas as pd
+from functools import reduce
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import quote, unquote
+
+try:
+    from .expressions import Expression
+except ImportError:
+    from expressions import Expression
+
+# Directory value used for missing partition keys, as in Hive
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+# Name of the data file written into each partition directory
+PART_FILE = 'part-0.csv'
+
+
+def _encode_value(value: Any) -> str:
+    """Encode a partition value as a directory-safe string."""
+    if pd.isna(value):
+        return NULL_PARTITION
+    return quote(str(value), safe=' ')
+
+
+def _parse_value(text: str) -> Optional[str]:
+    """Decode a partition directory value (None for a missing value)."""
+    text = unquote(text)
+    return None if text == NULL_PARTITION else text
+
+
+def _canonical_number(text: str, cast: Callable) -> bool:
+    """Whether text is a finite number exactly as str() writes it."""
+    try:
+        value = cast(text)
+    except ValueError:
+        return False
+    return math.isfinite(value) and str(value) == text
+
+
+def _restore_column(texts: List[Optional[str]]) -> List[Any]:
+    """
+    Restore the type of one partition column from its directory values.
+
+    The values become numbers only if every one of them is written the way
+    str() writes an int (or every one the way it writes a finite float),
+    so string keys such as '007', 'nan' or a column mixing '1' and 'A'
+    stay strings.
+    """
+    present = [text for text in texts if text is not None]
+    for cast in (int, float):
+        if present and all(_canonical_number(text, cast) for text in present):
+            return [None if text is None else cast(text) for text in texts]
+    return texts
+
+
+def _read_partition(path: str, values: Dict[str, Any],
+                    transformations: Optional[List[Callable]] = None,
+                    columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read one partition file and restore its partition columns.
+
+    Module-level so it can run in worker processes.
+
+    Args:
+        path: Path to the partition's CSV file
+        values: Partition column values encoded in the path
+        transformations: Transformation functions to apply in order
+        columns: Columns to read from the file (defaults to all)
+
+    Returns:
+        Partition DataFrame
+    """
+    usecols = None if columns is None else (lambda column: column in columns)
+    frame = pd.read_csv(path, usecols=usecols).assign(**values)
+    return reduce(lambda df, func: func(df), transformations or [], frame)
+
+
+class PartitionedDataset:
+    """
+    Hive-style dataset stored as root/<col>=<value>/.../part-0.csv.
+
+    Partition columns are encoded in the directory names and omitted from
+    the files. Predicates built from column expressions are used to prune
+    partitions, so a query restricted to one Year and Region only reads
+    that directory.
+    """
+
+    def __init__(self, root: str):
+        """
+        Open a partitioned dataset.
+
+        Args:
+            root: Dataset root directory
+        """
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f"Dataset directory '{root}' not found")
+        self.root = root
+        self.partition_cols = []
+        self.partitions = self._discover()
+
+    @staticmethod
+    def write(df: pd.DataFrame, root: str,
+              partition_cols: Sequence[str] = ('Year', 'Region')) -> 'PartitionedDataset':
+        """
+        Write a DataFrame as a partitioned dataset.
+
+        Existing partitions with the same values are overwritten.
+
+        Args:
+            df: Data to write
+            root: Dataset root directory
+            partition_cols: Columns to partition by, outermost first
+
+        Returns:
+            PartitionedDataset over the written files
+        """
+        partition_cols = list(partition_cols)
+        for keys, part in df.groupby(partition_cols, dropna=False, observed=True):
+            directory = os.path.join(root, *(
+                f"{column}={_encode_value(value)}"
+                for column, value in zip(partition_cols, keys)))
+            os.makedirs(directory, exist_ok=True)
+            part.drop(columns=partition_cols).to_csv(
+                os.path.join(directory, PART_FILE), index=False)
+        return PartitionedDataset(root)
+
+    def _discover(self) -> pd.DataFrame:
+        """
+        Find partition files and decode their directory values.
+
+        Returns:
+            DataFrame with one row per partition: partition columns plus 'path'
+        """
+        rows = []
+        for directory, _, files in os.walk(self.root):
+            relative = os.path.relpath(directory, self.root)
+            if relative == '.':
+                continue
+            keys = [part.split('=', 1) for part in relative.split(os.sep)]
+            if not all(len(key) == 2 for key in keys):
+                continue
+            for name in sorted(files):
+                if name.endswith('.csv'):
+                    if not self.partition_cols:
+                        self.partition_cols = [column for column, _ in keys]
+                    row = {column: _parse_value(value) for column, value in keys}
+                    row['path'] = os.path.join(directory, name)
+                    rows.append(row)
+        for column in self.partition_cols:
+            restored = _restore_column([row[column] for row in rows])
+            for row, value in zip(rows, restored):
+                row[column] = value
+        return (pd.DataFrame(rows, columns=self.partition_cols + ['path'])
+                .sort_values('path')
+                .reset_index(drop=True))
+
+    def _may_match(self, predicate: Expression, partitions: pd.DataFrame) -> pd.Series:
+        """
+        Decide which partitions can contain rows matching a predicate.
+
+        Sub-expressions that only reference partition columns are constant
+        within a partition and are evaluated against the partition values;
+        anything else is treated as possibly true.
+
+        Args:
+            predicate: Boolean expression
+            partitions: Partition table
+
+        Returns:
+            Boolean Series, False for partitions ruled out
+        """
+        if predicate.op == 'and':
+            left, right = predicate.operands
+            return self._may_match(left, partitions) & self._may_match(right, partitions)
+        if predicate.op == 'or':
+            left, right = predicate.operands
+            return self._may_match(left, partitions) | self._may_match(right, partitions)
+        columns = predicate.columns()
+        if columns and columns <= set(self.partition_cols):
+            return predicate.evaluate(partitions).fillna(False).astype(bool)
+        return pd.Series(True, index=partitions.index)
+
+    def prune(self, predicate: Optional[Expression] = None) -> pd.DataFrame:
+        """
+        Select the partitions a predicate may match.
+
+        Args:
+            predicate: Boolean expression, or None for all partitions
+
+        Returns:
+            Partition table restricted to surviving partitions
+        """
+        if predicate is None or not isinstance(predicate, Expression):
+            return self.partitions
+        return self.partitions[self._may_match(predicate, self.partitions)]
+
+    def partition_values(self, partitions: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Get the partition column values for each row of a partition table.
+
+        Args:
+            partitions: Partition table (as returned by prune)
+
+        Returns:
+            One dict of column -> value per partition
+        """
+        return partitions[self.partition_cols].to_dict('records')
+
+    def iter_read(self, predicate: Optional[Expression] = None,
+                  transformations: Optional[List[Callable]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Read the partitions a predicate may match, one at a time.
+
+        Args:
+            predicate: Boolean expression used for pruning
+            transformations: Transformation functions applied per partition
+
+        Returns:
+            Iterator of partition DataFrames
+        """
+        partitions = self.prune(predicate)
+        for path, values in zip(partitions['path'], self.partition_values(partitions)):
+            yield _read_partition(path, values, transformations)
+
+    def read(self, predicate: Optional[Expression] = None,
+             transformations: Optional[List[Callable]] = None) -> pd.DataFrame:
+        """
+        Read the partitions a predicate may match.
+
+        Rows inside surviving partitions are not filtered; callers apply the
+        predicate themselves.
+
+        Args:
+            predicate: Boolean expression used for pruning
+            transformations: Transformation functions applied per partition
+
+        Returns:
+            DataFrame of the surviving partitions
+        """
+        frames = list(self.iter_read(predicate, transformations))
+        if not frames:
+            columns = (list(pd.read_csv(self.partitions['path'].iloc[0], nrows=0).columns)
+                       if len(self.partitions) else [])
+            return pd.DataFrame(columns=columns + self.partition_cols)
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,205 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+try:
+    from .expressions import Expression
+except ImportError:
+    from expressions import Expression
+
+# Returned by ReportCache.get when a key is not cached
+MISSING = object()
+
+
+def _size_of(value: Any) -> int:
+    """Estimate the memory held by a cached result in bytes."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(value, pd.DataFrame) else usage)
+    return sys.getsizeof(value)
+
+
+def _is_cacheable(value: Any) -> bool:
+    """
+    Check that an argument has a stable repr usable in a cache key.
+
+    Arbitrary callables (lambdas in particular) are rejected: their repr
+    contains a memory address that may be reused by a different function.
+    """
+    if isinstance(value, Expression):
+        return True
+    if isinstance(value, dict):
+        return all(_is_cacheable(k) and _is_cacheable(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(_is_cacheable(v) for v in value)
+    return not callable(value)
+
+
+class ReportCache:
+    """
+    Thread-safe LRU cache of report results.
+
+    Entries are evicted least-recently-used first once either max_entries
+    or max_bytes is exceeded. With cache_dir set, results are also pickled
+    to disk and survive process restarts; keys then include a content
+    fingerprint of the data rather than a per-process version.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = 256 * 1024 ** 2,
+                 cache_dir: Optional[str] = None):
+        """
+        Initialize report cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            max_bytes: Maximum estimated memory of results kept in memory
+            cache_dir: Optional directory for on-disk persistence
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def persistent(self) -> bool:
+        """Whether results are persisted to disk."""
+        return bool(self.cache_dir)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.pkl")
+
+    def get(self, key: str) -> Any:
+        """
+        Look up a cached result.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or MISSING
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+        if self.persistent and os.path.exists(self._path(key)):
+            with open(self._path(key), 'rb') as f:
+                value = pickle.load(f)
+            self._store(key, value)
+            with self._lock:
+                self.hits += 1
+            return value
+        with self._lock:
+            self.misses += 1
+        return MISSING
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a result.
+
+        Args:
+            key: Cache key
+            value: Result to cache
+        """
+        self._store(key, value)
+        if self.persistent:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+
+    def _store(self, key: str, value: Any) -> None:
+        size = _size_of(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def clear(self) -> None:
+        """Drop all in-memory entries (persisted files are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def call_arguments(signature: inspect.Signature, instance: Any, args: tuple,
+                   kwargs: dict) -> Optional[list]:
+    """
+    Normalize a method call into a stable list of (name, value) pairs.
+
+    Defaults are applied, so f() and f(n=10) produce the same list.
+
+    Args:
+        signature: Signature of the method (including self)
+        instance: Object the method is called on
+        args: Positional arguments
+        kwargs: Keyword arguments
+        
+    Returns:
+        Bound arguments, or None if any of them is not cacheable
+    """
+    bound = signature.bind(instance, *args, **kwargs)
+    bound.apply_defaults()
+    arguments = list(bound.arguments.items())[1:]
+    return arguments if _is_cacheable(arguments) else None
+
+
+def cached_report(method: Callable) -> Callable:
+    """
+    Cache a SalesAnalytics report method.
+
+    The key combines the method name, its bound arguments (defaults
+    applied, so f() and f(n=10) share an entry) and the data version of
+    the instance. Calls with uncacheable arguments run uncached. Callers
+    receive a copy, so mutating a report never corrupts the cache.
+
+    Args:
+        method: Report method
+
+    Returns:
+        Wrapped method
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = self.cache
+        if cache is None:
+            return method(self, *args, **kwargs)
+        arguments = call_arguments(signature, self, args, kwargs)
+        if arguments is None:
+            return method(self, *args, **kwargs)
+        key = repr((method.__name__, arguments,
+                    self.data_version(persistent=cache.persistent)))
+        result = cache.get(key)
+        if result is MISSING:
+            result = method(self, *args, **kwargs)
+            cache.put(key, result)
+        return result.copy()
+
+    return wrapper
@@ -0,0 +1,205 @@
+import inspect
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    from .report_cache import call_arguments
+    from .sales_analytics import REPORT_METHODS, SalesAnalytics
+except ImportError:
+    from report_cache import call_arguments
+    from sales_analytics import REPORT_METHODS, SalesAnalytics
+
+# SalesAnalytics instance of a worker process, set by _init_worker
+_worker_analytics: Optional[SalesAnalytics] = None
+
+
+def _init_worker(analytics: SalesAnalytics) -> None:
+    """Install the shared analytics object in a worker process."""
+    global _worker_analytics
+    _worker_analytics = analytics
+
+
+def _run_in_worker(method: str, args: tuple, kwargs: dict) -> Any:
+    """Run a report on the worker's analytics object (module-level so it pickles)."""
+    return getattr(_worker_analytics, method)(*args, **kwargs)
+
+
+class ReportRequest:
+    """A report to run: a SalesAnalytics method name plus its arguments."""
+
+    def __init__(self, method: str, *args, name: Optional[str] = None, **kwargs):
+        """
+        Initialize report request.
+
+        Args:
+            method: Name of a SalesAnalytics report method (see
+                sales_analytics.REPORT_METHODS)
+            args: Positional arguments for the report
+            name: Label for the result (defaults to the call, e.g.
+                "top_countries_by_revenue(10)")
+            kwargs: Keyword arguments for the report
+        """
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.name = name or self._describe()
+
+    def _describe(self) -> str:
+        arguments = [repr(a) for a in self.args]
+        arguments += [f"{key}={value!r}" for key, value in self.kwargs.items()]
+        return f"{self.method}({', '.join(arguments)})"
+
+    def __repr__(self) -> str:
+        return f"ReportRequest({self.name!r})"
+
+
+class ReportResult:
+    """Outcome of one report request."""
+
+    def __init__(self, request: ReportRequest, result: Any = None,
+                 error: Optional[BaseException] = None, seconds: float = 0.0):
+        """
+        Initialize report result.
+
+        Args:
+            request: Request that produced this result
+            result: Report output (None if it failed)
+            error: Exception raised by the report, if any
+            seconds: Wall time from submission to completion
+        """
+        self.request = request
+        self.result = result
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        """Whether the report completed without raising."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = 'ok' if self.ok else f"error={self.error!r}"
+        return f"ReportResult({self.request.name!r}, {status}, {self.seconds:.3f}s)"
+
+
+class ReportRunner:
+    """
+    Runs many SalesAnalytics reports concurrently over shared data.
+
+    Identical requests (same method and arguments once defaults are
+    applied) are computed once. Shared work — the aggregation cubes that
+    several of the requested reports roll up from — is built before any
+    report is submitted, so workers only do their own roll-ups. Results are yielded as they
+    complete, so total wall time approaches that of the slowest report.
+
+    Threads share the data without copying and go through the analytics
+    cache. Processes avoid the GIL for Python-heavy reports; each worker
+    receives one pickled copy of the data and cube at start-up, and their
+    results bypass the cache.
+    """
+
+    def __init__(self, analytics: SalesAnalytics, max_workers: Optional[int] = None,
+                 executor: str = 'thread'):
+        """
+        Initialize report runner.
+
+        Args:
+            analytics: Analytics object whose reports are run
+            max_workers: Pool size (defaults to the number of CPUs)
+            executor: 'thread' or 'process'
+        """
+        if executor not in ('thread', 'process'):
+            raise ValueError("executor must be 'thread' or 'process'")
+        self.analytics = analytics
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor = executor
+
+    def _key(self, request: ReportRequest) -> Any:
+        """Deduplication key, or a key unique to the request if its arguments are not comparable."""
+        # Only read-only reports: append(), invalidate() and the like would
+        # change the data under the other reports
+        if request.method not in REPORT_METHODS:
+            raise AttributeError(f"SalesAnalytics has no report '{request.method}'")
+        method = getattr(type(self.analytics), request.method)
+        arguments = call_arguments(inspect.signature(method), self.analytics,
+                                   request.args, request.kwargs)
+        return id(request) if arguments is None else repr((request.method, arguments))
+
+    def _pool(self, tasks: int) -> Executor:
+        workers = min(self.max_workers, tasks)
+        if self.executor == 'process':
+            return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                       initargs=(self.analytics,))
+        return ThreadPoolExecutor(max_workers=workers)
+
+    def run(self, requests: Sequence[ReportRequest]) -> Iterator[ReportResult]:
+        """
+        Run reports, yielding each result as soon as it is ready.
+
+        A report that raises, or whose arguments do not fit its signature,
+        does not stop the others; its result carries the exception in
+        .error.
+
+        Args:
+            requests: Reports to run
+
+        Returns:
+            Iterator of ReportResult, in completion order (duplicates of a
+            request are yielded together when it completes)
+        """
+        groups: Dict[Any, List[ReportRequest]] = {}
+        for request in requests:
+            try:
+                key = self._key(request)
+            except TypeError as error:  # arguments the report does not take
+                yield ReportResult(request, error=error)
+                continue
+            groups.setdefault(key, []).append(request)
+        if not groups:
+            return
+        # Shared work first, so concurrent reports never race to build it
+        self.analytics.build_cubes([group[0].method for group in groups.values()])
+
+        started = time.perf_counter()
+        with self._pool(len(groups)) as pool:
+            if self.executor == 'process':
+                submit = lambda r: pool.submit(_run_in_worker, r.method, r.args, r.kwargs)
+            else:
+                submit = lambda r: pool.submit(getattr(self.analytics, r.method),
+                                               *r.args, **r.kwargs)
+            futures = {submit(group[0]): group for group in groups.values()}
+            for future in as_completed(futures):
+                error = future.exception()
+                result = None if error else future.result()
+                seconds = time.perf_counter() - started
+                for request in futures[future]:
+                    copy = result.copy() if isinstance(result, (pd.DataFrame, pd.Series)) else result
+                    yield ReportResult(request, copy, error, seconds)
+
+    def run_all(self, requests: Sequence[ReportRequest]) -> Dict[str, Any]:
+        """
+        Run reports and collect their results.
+
+        Args:
+            requests: Reports to run
+
+        Returns:
+            Report name -> result, in request order
+
+        Raises:
+            ValueError: If two requests have the same name
+            The first error raised by any report, after all have finished
+        """
+        names = [request.name for request in requests]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate report names: {duplicates}")
+        results = {r.request.name: r for r in self.run(requests)}
+        for request in requests:
+            if not results[request.name].ok:
+                raise results[request.name].error
+        return {request.name: results[request.name].result for request in requests}
@@ -1,23 +1,546 @@
+import hashlib
+import os
+import threading
+import uuid
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Callable
+from typing import Any, List, Dict, Callable, Optional, Union
+
+try:
+    from .backends import PandasBackend, copy_on_write_enabled, get_backend, to_dataframe
+    from .expressions import Expression
+    from .parallel import parallel_group_aggregate
+    from .partitioned_dataset import PartitionedDataset
+    from .report_cache import ReportCache, cached_report
+    from .sketches import HyperLogLog, KLLSketch
+except ImportError:
+    from backends import PandasBackend, copy_on_write_enabled, get_backend, to_dataframe
+    from expressions import Expression
+    from parallel import parallel_group_aggregate
+    from partitioned_dataset import PartitionedDataset
+    from report_cache import ReportCache, cached_report
+    from sketches import HyperLogLog, KLLSketch
+
+# Dimensions of each aggregation cube. Grains are kept coarse (a few
+# thousand cells on any data size) so that rolling a cube up costs far less
+# than grouping the rows. Groupings no cube holds group the rows instead:
+# Country and Year-Month each serve too few reports, or reports too cheap,
+# for a cube over them to pay for itself.
+CUBE_DIMENSIONS = [
+    ['Region', 'Item Type', 'Sales Channel', 'Order Priority', 'Year'],
+]
+
+# Numeric columns the cube pre-aggregates
+MEASURES = ['Total Revenue', 'Total Profit', 'Units Sold',
+            'Profit Margin', 'Processing Days']
+
+# Partial statistics stored per measure, and how each one rolls up
+CUBE_STATS = ['sum', 'count', 'min', 'max']
+ROLLUP = {'sum': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+
+def _in_cube(measure: str, stat: str) -> bool:
+    """Whether cubes keep a statistic of a column."""
+    return (measure in MEASURES and stat in CUBE_STATS) or (measure, stat) == ('Order ID', 'count')
+
+
+# Element-wise merge of two partial statistics for the same cube cell
+MERGE = {'sum': np.add, 'count': np.add, 'min': np.fmin, 'max': np.fmax}
+
+# Report -> columns it reads with its default arguments. The cube is built
+# over whichever dimensions and measures are present, so loading only these
+# columns gives the same report from a fraction of the data.
+_MONTHLY = ['Year-Month', 'Total Revenue']
+REPORT_COLUMNS: Dict[str, List[str]] = {
+    'total_revenue_by_region': ['Region', 'Total Revenue', 'Total Profit', 'Order ID'],
+    'top_countries_by_revenue': ['Country', 'Total Revenue', 'Total Profit', 'Units Sold'],
+    'revenue_by_item_type': ['Item Type', 'Total Revenue', 'Total Profit', 'Units Sold',
+                             'Order ID'],
+    'sales_channel_comparison': ['Sales Channel', 'Total Revenue', 'Total Profit', 'Order ID',
+                                 'Profit Margin'],
+    'order_priority_analysis': ['Order Priority', 'Total Revenue', 'Total Profit',
+                                'Processing Days', 'Order ID'],
+    'monthly_revenue_trend': ['Year-Month', 'Total Revenue', 'Total Profit', 'Order ID'],
+    'top_profitable_items_by_region': ['Region', 'Item Type', 'Total Profit', 'Total Revenue',
+                                       'Order ID'],
+    'profit_margin_by_category': ['Region', 'Item Type', 'Profit Margin', 'Total Revenue',
+                                  'Total Profit'],
+    'yearly_comparison': ['Year', 'Total Revenue', 'Total Profit', 'Order ID', 'Profit Margin'],
+    'rolling_window': _MONTHLY,
+    'cumulative_totals': _MONTHLY,
+    'period_over_period': _MONTHLY,
+    'year_over_year': _MONTHLY,
+    'high_value_orders': ['Order ID', 'Country', 'Item Type', 'Total Revenue', 'Total Profit'],
+    'low_margin_items': ['Profit Margin', 'Item Type', 'Total Revenue', 'Order ID'],
+}
+
+# Report -> columns it groups by with its default arguments
+_MONTH = ['Year-Month']
+REPORT_GROUPINGS: Dict[str, List[str]] = {
+    'total_revenue_by_region': ['Region'],
+    'top_countries_by_revenue': ['Country'],
+    'revenue_by_item_type': ['Item Type'],
+    'sales_channel_comparison': ['Sales Channel'],
+    'order_priority_analysis': ['Order Priority'],
+    'monthly_revenue_trend': _MONTH,
+    'top_profitable_items_by_region': ['Region', 'Item Type'],
+    'profit_margin_by_category': ['Region', 'Item Type'],
+    'yearly_comparison': ['Year'],
+    'rolling_window': _MONTH,
+    'cumulative_totals': _MONTH,
+    'period_over_period': _MONTH,
+    'year_over_year': _MONTH,
+}
+
+# Methods that only read the data: the reports above plus those whose
+# columns depend on their arguments
+REPORT_METHODS = (*REPORT_COLUMNS, 'custom_aggregation', 'approx_distinct', 'approx_quantiles')
+
+
+def required_columns(reports: List[str]) -> List[str]:
+    """
+    Columns needed to run a set of reports with their default arguments.
+    
+    Args:
+        reports: Report method names (keys of REPORT_COLUMNS)
+        
+    Returns:
+        Column names (source and calculated), without duplicates
+    """
+    unknown = [report for report in reports if report not in REPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown report(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(column for report in reports for column in REPORT_COLUMNS[report]))
 
 
 class SalesAnalytics:
-    """Performs various analytics on sales data."""
+    """
+    Performs various analytics on sales data.
+    
+    Grouped reports are computed from shared aggregation cubes: groupbys
+    over a few coarse sets of dimensions (cube_dimensions) that keep
+    sum/count/min/max of every measure. Each report rolls up the cube
+    holding its grouping, so the reports by region, item type, channel,
+    priority and year scan the rows once between them. A cube is only
+    built once cube_min_reports reports have needed it (a single report
+    groups the rows faster than it builds a cube); until then, and for
+    groupings no cube holds, reports group the rows directly.
+    
+    Cubes are mergeable, which makes them incrementally maintained views:
+    append() aggregates only the new rows and folds them into the existing
+    cells, so reports stay identical to a full recompute.
+    
+    Report results are cached by method, arguments and data version.
+    Assigning .data or calling append() starts a new version, so stale
+    results are never served. The frame is held as a snapshot: with pandas
+    copy-on-write, the frame passed in and the frames .data returns share
+    memory with it, but changing them in place never reaches the snapshot;
+    assign the changed frame to .data to analyze it. Without copy-on-write
+    the snapshot is a copy, and frames returned by .data are the snapshot
+    itself, so call invalidate() after changing one in place.
+    
+    Reports may run concurrently from several threads: lazily built state
+    (the cube, sketches, concatenated batches) is guarded by a lock.
+    Instances pickle without their cache, so they can be shipped to
+    worker processes.
+    
+    The cube is built by a per-instance execution backend: 'pandas' (the
+    default) or 'arrow', which runs the grouped aggregation with
+    multithreaded Arrow kernels. Reports are identical on either backend.
+    
+    With workers > 1, the cube build and custom_aggregation hash-partition
+    rows by group key across that many processes once the data has at
+    least parallel_min_rows rows, so high-cardinality groupings over large
+    data scale with cores.
+    """
+    
+    parallel_min_rows = 200_000
+    cube_dimensions = CUBE_DIMENSIONS
+    cube_min_reports = 2
     
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, cache: Union[ReportCache, bool] = True,
+                 backend: Union[str, PandasBackend] = 'pandas',
+                 workers: Optional[int] = 1):
         """
         Initialize with sales data.
         
         Args:
-            data: Sales DataFrame
+            data: Sales DataFrame or Arrow table
+            cache: ReportCache to use (may be shared), True for a private
+                in-memory cache, or False to disable caching
+            backend: Execution backend for the cube, 'pandas' or 'arrow'
+                (requires pyarrow), or a backend instance
+            workers: Processes for grouped aggregations (None for one per
+                CPU)
         """
+        if cache is True:
+            cache = ReportCache()
+        self.cache = cache if isinstance(cache, ReportCache) else None
+        self._backend = get_backend(backend)
+        self.workers = workers or os.cpu_count() or 1
+        self._lock = threading.RLock()
         self.data = data
     
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['cache'] = None
+        state['_backend'] = self._backend.name
+        del state['_lock']
+        return state
+    
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._backend = get_backend(state['_backend'])
+        self._lock = threading.RLock()
+    
+    @property
+    def backend(self) -> str:
+        """Name of the execution backend."""
+        return self._backend.name
+    
+    @classmethod
+    def from_dataset(cls, dataset: PartitionedDataset, scope: Expression = None,
+                     transformations: List[Callable] = None, **kwargs) -> 'SalesAnalytics':
+        """
+        Build analytics over the slice of a partitioned dataset in scope.
+        
+        Partitions the scope rules out are never read from disk.
+        
+        Args:
+            dataset: Partitioned dataset
+            scope: Predicate limiting the report scope, e.g.
+                (col('Region') == 'Europe') & (col('Year') == 2015)
+            transformations: Transformations applied per partition
+                (typically parse_dates and add_calculated_fields)
+            kwargs: Passed to the constructor
+            
+        Returns:
+            SalesAnalytics over the rows in scope
+        """
+        data = dataset.read(scope, transformations)
+        if scope is not None and len(data) > 0:
+            data = data[scope.evaluate(data)].reset_index(drop=True)
+        return cls(data, **kwargs)
+    
+    @property
+    def data(self) -> pd.DataFrame:
+        """Sales rows, including any appended batches."""
+        with self._lock:
+            if len(self._chunks) > 1:
+                self._chunks = [pd.concat(self._chunks)]
+            if copy_on_write_enabled():
+                # A new frame object, so in-place changes stay out of the snapshot
+                return self._chunks[0].copy(deep=False)
+            return self._chunks[0]
+    
+    @data.setter
+    def data(self, data: pd.DataFrame):
+        frame = to_dataframe(data)
+        if not copy_on_write_enabled():
+            frame = frame.copy()
+        with self._lock:
+            self._chunks = [frame]
+            self.invalidate()
+    
+    def invalidate(self) -> None:
+        """
+        Drop everything derived from the data (cube, sketches, content
+        fingerprint) and start a new data version, so reports and cached
+        results are recomputed from the current rows.
+        """
+        with self._lock:
+            self._cubes = {}
+            self._cube_demand = {}
+            self._fingerprint = None
+            self._sketches = {}
+            self._version = uuid.uuid4().hex
+    
+    def data_version(self, persistent: bool = False) -> str:
+        """
+        Identify the current state of the data for cache keys.
+        
+        Args:
+            persistent: Return a content fingerprint that is stable across
+                processes instead of a per-instance version token
+            
+        Returns:
+            Version string
+        """
+        if not persistent:
+            return self._version
+        with self._lock:
+            if self._fingerprint is None:
+                self._fingerprint = self._hash_rows(self.data)
+            return self._fingerprint
+    
+    @staticmethod
+    def _hash_rows(data: pd.DataFrame, previous: str = '') -> str:
+        """Hash column names and row contents, chained onto a previous hash."""
+        digest = hashlib.sha256(previous.encode('utf-8'))
+        digest.update(repr(list(data.columns)).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+    
+    def append(self, new_rows: pd.DataFrame) -> None:
+        """
+        Add newly arrived rows and update aggregate state incrementally.
+        
+        Work does not grow with the data already held: the new rows are
+        aggregated on their own into a small delta cube for every cube built
+        so far. Deltas are stacked in tiers, each merged into the one below
+        once that is at most twice its size in rows (as Deduplicator merges
+        its key runs), and reading a cube folds any remaining tiers into one.
+        Rows are expected to have gone through the same DataLoader
+        transformations as the original data. Row-level reports concatenate
+        the batches lazily.
+        
+        Args:
+            new_rows: Transformed sales rows to add
+        """
+        if len(new_rows) == 0:
+            return
+        with self._lock:
+            self._cubes = {grain: self._add_tier(tiers, len(new_rows),
+                                                 self._build_cube(new_rows, grain))
+                           for grain, tiers in self._cubes.items()}
+            if self._fingerprint is not None:
+                self._fingerprint = self._hash_rows(new_rows, self._fingerprint)
+            for (_, column), sketch in self._sketches.items():
+                sketch.update(new_rows[column])
+            self._chunks.append(new_rows.copy(deep=not copy_on_write_enabled()))
+            self._version = uuid.uuid4().hex
+    
+    @property
+    def cube(self) -> pd.DataFrame:
+        """
+        Pre-aggregated measures of the main cube (the first of
+        cube_dimensions), built on first use.
+        
+        Returns:
+            DataFrame indexed by the cube's dimension columns present in the
+            data, with (measure, statistic) columns
+        """
+        return self._cube_for(tuple(self.cube_dimensions[0]))
+    
+    def build_cubes(self, reports: Optional[List[str]] = None) -> None:
+        """
+        Build ahead of time the cubes that a set of reports will share.
+        
+        Only cubes at least cube_min_reports of the reports roll up from
+        are built, as running the reports would.
+        
+        Args:
+            reports: Report method names, run with their default arguments
+                (defaults to every report)
+        """
+        demand: Dict[tuple, int] = {}
+        for report in (REPORT_GROUPINGS if reports is None else reports):
+            grain = self._grain_for(REPORT_GROUPINGS[report]) if report in REPORT_GROUPINGS else None
+            if grain is not None:
+                demand[grain] = demand.get(grain, 0) + 1
+        for grain, count in demand.items():
+            if count >= self.cube_min_reports:
+                self._cube_for(grain)
+    
+    def _cube_for(self, grain: tuple) -> pd.DataFrame:
+        """Get (building on first use) the cube over a set of dimensions."""
+        with self._lock:
+            tiers = self._cubes.get(grain)
+            if tiers is None:
+                tiers = [(len(self.data), self._build_cube(self.data, grain))]
+            elif len(tiers) > 1:
+                # Fold the appended deltas in, newest first so the small
+                # tiers are combined before the base cube is touched
+                rows, cube = tiers[-1]
+                for tier_rows, tier in reversed(tiers[:-1]):
+                    rows, cube = rows + tier_rows, self._merge_cube(tier, cube)
+                tiers = [(rows, cube)]
+            self._cubes = {**self._cubes, grain: tiers}
+            return tiers[0][1]
+    
+    @classmethod
+    def _add_tier(cls, tiers: List[tuple], rows: int,
+                  delta: pd.DataFrame) -> List[tuple]:
+        """
+        Stack a delta cube onto a cube's tiers, merging geometrically.
+        
+        Args:
+            tiers: (rows aggregated, cube) pairs, oldest first
+            rows: Number of rows the delta aggregates
+            delta: Cube of the new rows
+            
+        Returns:
+            New list of tiers (the given list and cubes are left untouched)
+        """
+        tiers = [*tiers, (rows, delta)]
+        # Merge while the tier below is not much larger, so a row is merged
+        # O(log n) times and an append never touches the large base cube
+        while len(tiers) > 1 and tiers[-2][0] <= 2 * tiers[-1][0]:
+            (below_rows, below), (top_rows, top) = tiers[-2], tiers[-1]
+            tiers[-2:] = [(below_rows + top_rows, cls._merge_cube(below, top))]
+        return tiers
+    
+    def _grain_for(self, group_by: List[str]) -> Optional[tuple]:
+        """Dimensions of the first cube holding every group_by column, if any."""
+        for dimensions in self.cube_dimensions:
+            if set(group_by) <= set(dimensions):
+                return tuple(dimensions)
+        return None
+    
+    def _build_cube(self, data: pd.DataFrame, grain: tuple) -> pd.DataFrame:
+        """
+        Aggregate raw rows over a cube's dimensions in a single grouped pass.
+        
+        Args:
+            data: Sales DataFrame
+            grain: Cube dimensions (those missing from data are left out)
+            
+        Returns:
+            Cube DataFrame
+        """
+        dimensions = [d for d in grain if d in data.columns]
+        stats = {m: CUBE_STATS for m in MEASURES if m in data.columns}
+        if 'Order ID' in data.columns:
+            stats['Order ID'] = ['count']
+        return self._backend.group_aggregate(data, dimensions, stats, self._workers_for(data))
+    
+    def _aggregate_rows(self, group_by: Union[str, List[str]],
+                        agg_dict: Dict[str, Any]) -> pd.DataFrame:
+        """Group the rows directly, on worker processes for large data."""
+        workers = self._workers_for(self.data)
+        if workers > 1:
+            return parallel_group_aggregate(self.data, group_by, agg_dict, workers)
+        return self.data.groupby(group_by, observed=True).agg(agg_dict)
+    
+    def _workers_for(self, data: pd.DataFrame) -> int:
+        """Number of processes to aggregate data with."""
+        return self.workers if len(data) >= self.parallel_min_rows else 1
+    
+    def _sketch(self, kind: type, column: str) -> Any:
+        """Get (building on first use) the sketch of a column."""
+        key = (kind.__name__, column)
+        with self._lock:
+            if key not in self._sketches:
+                self._sketches[key] = kind().update(self.data[column])
+            return self._sketches[key]
+    
+    def approx_distinct(self, column: str) -> int:
+        """
+        Estimate the number of distinct values in a column.
+        
+        Backed by a HyperLogLog sketch (about 0.8% relative standard error)
+        that append() keeps up to date in time proportional to new rows.
+        
+        Args:
+            column: Column name, e.g. 'Country'
+            
+        Returns:
+            Approximate distinct count
+        """
+        return self._sketch(HyperLogLog, column).count()
+    
+    def approx_quantiles(self, column: str,
+                         quantiles: List[float] = (0.25, 0.5, 0.75, 0.9, 0.99)) -> pd.Series:
+        """
+        Estimate quantiles of a numeric column.
+        
+        Backed by a KLL sketch (rank error about 1.65% at 99% confidence)
+        that append() keeps up to date in time proportional to new rows.
+        
+        Args:
+            column: Column name, e.g. 'Total Revenue'
+            quantiles: Quantiles between 0 and 1
+            
+        Returns:
+            Series of estimates indexed by quantile
+        """
+        estimates = self._sketch(KLLSketch, column).quantiles(quantiles)
+        return pd.Series(estimates, index=list(quantiles), name=column)
+    
+    @staticmethod
+    def _merge_cube(cube: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+        """
+        Fold a cube built from new rows into an existing cube.
+        
+        The existing cube is left untouched, since reports may be rolling
+        it up concurrently: cells present in both are combined into a new
+        frame, and new cells are appended to it.
+        
+        Args:
+            cube: Existing cube
+            delta: Cube of the new rows (same dimensions and statistics)
+            
+        Returns:
+            Merged cube
+        """
+        delta = delta.reindex(columns=cube.columns)
+        positions = cube.index.get_indexer(delta.index)
+        found = positions >= 0
+        if found.any():
+            rows = positions[found]
+            incoming = delta[found]
+            columns = []
+            for j, (_, stat) in enumerate(cube.columns):
+                current = cube.iloc[:, j].to_numpy()
+                merged = MERGE[stat](current[rows], incoming.iloc[:, j].to_numpy())
+                values = current.astype(np.result_type(current.dtype, merged.dtype))
+                values[rows] = merged
+                columns.append(values)
+            cube = pd.DataFrame(dict(enumerate(columns)), index=cube.index)
+            cube.columns = delta.columns
+        if not found.all():
+            cube = pd.concat([cube, delta[~found]])
+        return cube
+    
+    def _rollup(self, group_by: Union[str, List[str]],
+                agg_dict: Dict[str, Union[str, List[str]]]) -> pd.DataFrame:
+        """
+        Roll the cube holding a grouping up to it.
+        
+        Produces the same frame as data.groupby(group_by).agg(agg_dict) for
+        the sum, count, mean, min and max aggregations, and falls back to
+        exactly that when no cube holds the grouping and statistics, or the
+        cube is not worth building yet (see cube_min_reports).
+        
+        Args:
+            group_by: Dimension column(s) to group by
+            agg_dict: Aggregation dictionary
+            
+        Returns:
+            Aggregated DataFrame indexed by group_by
+        """
+        needed = {}
+        for measure, funcs in agg_dict.items():
+            for func in (funcs if isinstance(funcs, list) else [funcs]):
+                for stat in (('sum', 'count') if func == 'mean' else (func,)):
+                    needed[(measure, stat)] = ROLLUP.get(stat)
+        grain = self._grain_for([group_by] if isinstance(group_by, str) else group_by)
+        if not all(_in_cube(measure, stat) for measure, stat in needed):
+            grain = None
+        with self._lock:
+            if grain is not None and grain not in self._cubes:
+                self._cube_demand[grain] = self._cube_demand.get(grain, 0) + 1
+                if self._cube_demand[grain] < self.cube_min_reports:
+                    grain = None
+        if grain is None:
+            return self._aggregate_rows(group_by, agg_dict)
+        rolled = self._cube_for(grain).groupby(level=group_by, observed=True).agg(needed)
+        
+        multi_level = any(isinstance(funcs, list) for funcs in agg_dict.values())
+        columns = {}
+        for measure, funcs in agg_dict.items():
+            for func in (funcs if isinstance(funcs, list) else [funcs]):
+                if func == 'mean':
+                    values = rolled[(measure, 'sum')] / rolled[(measure, 'count')]
+                else:
+                    values = rolled[(measure, func)]
+                columns[(measure, func) if multi_level else measure] = values
+        return pd.DataFrame(columns, index=rolled.index)
+    
+    @cached_report
     def total_revenue_by_region(self) -> pd.DataFrame:
         """Calculate total revenue by region."""
-        return (self.data.groupby('Region')
-                .agg({
+        return (self._rollup('Region', {
                     'Total Revenue': 'sum',
                     'Total Profit': 'sum',
                     'Order ID': 'count'
@@ -26,10 +549,10 @@ class SalesAnalytics:
                 .sort_values('Total Revenue', ascending=False)
                 .reset_index())
     
+    @cached_report
     def top_countries_by_revenue(self, n: int = 10) -> pd.DataFrame:
         """Get top N countries by revenue."""
-        return (self.data.groupby('Country')
-                .agg({
+        return (self._rollup('Country', {
                     'Total Revenue': 'sum',
                     'Total Profit': 'sum',
                     'Units Sold': 'sum'
@@ -38,10 +561,10 @@ class SalesAnalytics:
                 .head(n)
                 .reset_index())
     
+    @cached_report
     def revenue_by_item_type(self) -> pd.DataFrame:
         """Analyze revenue by item type."""
-        return (self.data.groupby('Item Type')
-                .agg({
+        return (self._rollup('Item Type', {
                     'Total Revenue': ['sum', 'mean', 'max'],
                     'Total Profit': ['sum', 'mean'],
                     'Units Sold': 'sum',
@@ -51,10 +574,10 @@ class SalesAnalytics:
                 .sort_values(('Total Revenue', 'sum'), ascending=False)
                 .reset_index())
     
+    @cached_report
     def sales_channel_comparison(self) -> pd.DataFrame:
         """Compare online vs offline sales."""
-        return (self.data.groupby('Sales Channel')
-                .agg({
+        return (self._rollup('Sales Channel', {
                     'Total Revenue': ['sum', 'mean'],
                     'Total Profit': ['sum', 'mean'],
                     'Order ID': 'count',
@@ -63,10 +586,10 @@ class SalesAnalytics:
                 .round(2)
                 .reset_index())
     
+    @cached_report
     def order_priority_analysis(self) -> pd.DataFrame:
         """Analyze by order priority."""
-        return (self.data.groupby('Order Priority')
-                .agg({
+        return (self._rollup('Order Priority', {
                     'Total Revenue': 'sum',
                     'Total Profit': 'sum',
                     'Processing Days': 'mean',
@@ -76,10 +599,10 @@ class SalesAnalytics:
                 .sort_values('Total Revenue', ascending=False)
                 .reset_index())
     
+    @cached_report
     def monthly_revenue_trend(self) -> pd.DataFrame:
         """Calculate monthly revenue trends."""
-        return (self.data.groupby('Year-Month')
-                .agg({
+        return (self._rollup('Year-Month', {
                     'Total Revenue': 'sum',
                     'Total Profit': 'sum',
                     'Order ID': 'count'
@@ -87,10 +610,10 @@ class SalesAnalytics:
                 .round(2)
                 .reset_index())
     
+    @cached_report
     def top_profitable_items_by_region(self, n: int = 5) -> pd.DataFrame:
         """Get top N profitable items per region."""
-        return (self.data.groupby(['Region', 'Item Type'])
-                .agg({
+        return (self._rollup(['Region', 'Item Type'], {
                     'Total Profit': 'sum',
                     'Total Revenue': 'sum',
                     'Order ID': 'count'
@@ -101,10 +624,10 @@ class SalesAnalytics:
                 .head(n)
                 .reset_index(drop=True))
     
+    @cached_report
     def profit_margin_by_category(self) -> pd.DataFrame:
         """Analyze profit margins by different categories."""
-        return (self.data.groupby(['Region', 'Item Type'])
-                .agg({
+        return (self._rollup(['Region', 'Item Type'], {
                     'Profit Margin': 'mean',
                     'Total Revenue': 'sum',
                     'Total Profit': 'sum'
@@ -113,10 +636,10 @@ class SalesAnalytics:
                 .sort_values('Profit Margin', ascending=False)
                 .reset_index())
     
+    @cached_report
     def yearly_comparison(self) -> pd.DataFrame:
         """Compare performance by year."""
-        return (self.data.groupby('Year')
-                .agg({
+        return (self._rollup('Year', {
                     'Total Revenue': 'sum',
                     'Total Profit': 'sum',
                     'Order ID': 'count',
@@ -125,6 +648,129 @@ class SalesAnalytics:
                 .round(2)
                 .reset_index())
     
+    def _monthly_matrix(self, measure: str, partition_by: List[str]) -> pd.DataFrame:
+        """
+        Bucket a measure into a dense month x partition matrix.
+        
+        Monthly sums come from _rollup; months with no orders are filled
+        with 0 so that shifts and rolling windows count calendar months.
+        
+        Args:
+            measure: Measure to sum
+            partition_by: Dimension columns, one matrix column per combination
+            
+        Returns:
+            DataFrame indexed by Year-Month (PeriodIndex)
+        """
+        monthly = self._rollup(partition_by + ['Year-Month'], {measure: 'sum'})[measure]
+        matrix = monthly.unstack(partition_by) if partition_by else monthly.to_frame()
+        months = pd.period_range(matrix.index.min(), matrix.index.max(), freq='M')
+        return matrix.reindex(months).fillna(0).rename_axis('Year-Month')
+    
+    @staticmethod
+    def _to_long(frames: Dict[str, pd.DataFrame], partition_by: List[str]) -> pd.DataFrame:
+        """
+        Reshape month x partition matrices into one row per partition and month.
+        
+        Args:
+            frames: Output column name -> matrix (all the same shape)
+            partition_by: Dimension columns of the matrix columns
+            
+        Returns:
+            Long-format DataFrame
+        """
+        long = pd.DataFrame({name: frame.unstack() for name, frame in frames.items()})
+        if not partition_by:
+            long = long.droplevel(0)
+        long.index.names = partition_by + ['Year-Month']
+        return long.reset_index()
+    
+    @cached_report
+    def rolling_window(self, measure: str = 'Total Revenue', window: int = 3,
+                       partition_by: List[str] = None) -> pd.DataFrame:
+        """
+        Rolling monthly sums and means, e.g. rolling 3-month revenue per region.
+        
+        Args:
+            measure: Measure to aggregate
+            window: Window length in months (incomplete windows are NaN)
+            partition_by: Dimension columns to compute windows within
+            
+        Returns:
+            DataFrame with the monthly measure and rolling sum/mean columns
+        """
+        partition_by = list(partition_by or [])
+        matrix = self._monthly_matrix(measure, partition_by)
+        rolling = matrix.rolling(window)
+        return self._to_long({
+            measure: matrix,
+            f'Rolling {window}M Sum': rolling.sum(),
+            f'Rolling {window}M Mean': rolling.mean(),
+        }, partition_by)
+    
+    @cached_report
+    def cumulative_totals(self, measure: str = 'Total Revenue',
+                          partition_by: List[str] = None) -> pd.DataFrame:
+        """
+        Running totals of a monthly measure.
+        
+        Args:
+            measure: Measure to aggregate
+            partition_by: Dimension columns to accumulate within
+            
+        Returns:
+            DataFrame with the monthly measure and its cumulative total
+        """
+        partition_by = list(partition_by or [])
+        matrix = self._monthly_matrix(measure, partition_by)
+        return self._to_long({
+            measure: matrix,
+            f'Cumulative {measure}': matrix.cumsum(),
+        }, partition_by)
+    
+    @cached_report
+    def period_over_period(self, measure: str = 'Total Revenue', periods: int = 1,
+                           partition_by: List[str] = None) -> pd.DataFrame:
+        """
+        Change of a monthly measure against the same partition n months earlier.
+        
+        periods=1 gives month-over-month, periods=12 year-over-year.
+        
+        Args:
+            measure: Measure to aggregate
+            periods: Number of months to compare against
+            partition_by: Dimension columns to compare within
+            
+        Returns:
+            DataFrame with the monthly measure, the earlier value, the
+            absolute change and the percentage change
+        """
+        partition_by = list(partition_by or [])
+        matrix = self._monthly_matrix(measure, partition_by)
+        previous = matrix.shift(periods)
+        change = matrix - previous
+        return self._to_long({
+            measure: matrix,
+            'Previous': previous,
+            'Change': change,
+            'Change %': (change / previous.where(previous != 0) * 100).round(2),
+        }, partition_by)
+    
+    def year_over_year(self, measure: str = 'Total Revenue',
+                       partition_by: List[str] = None) -> pd.DataFrame:
+        """
+        Year-over-year growth of a monthly measure.
+        
+        Args:
+            measure: Measure to aggregate
+            partition_by: Dimension columns to compare within
+            
+        Returns:
+            Same columns as period_over_period with periods=12
+        """
+        return self.period_over_period(measure, 12, partition_by)
+    
+    @cached_report
     def high_value_orders(self, threshold: float = 100000) -> pd.DataFrame:
         """Get high-value orders above threshold."""
         return (self.data[self.data['Total Revenue'] > threshold]
@@ -132,10 +778,11 @@ class SalesAnalytics:
                 [['Order ID', 'Country', 'Item Type', 'Total Revenue', 'Total Profit']]
                 .reset_index(drop=True))
     
+    @cached_report
     def low_margin_items(self, threshold: float = 10) -> pd.DataFrame:
         """Identify items with low profit margins."""
         return (self.data[self.data['Profit Margin'] < threshold]
-                .groupby('Item Type')
+                .groupby('Item Type', observed=True)
                 .agg({
                     'Profit Margin': 'mean',
                     'Total Revenue': 'sum',
@@ -145,6 +792,7 @@ class SalesAnalytics:
                 .sort_values('Profit Margin')
                 .reset_index())
     
+    @cached_report
     def custom_aggregation(self, group_by: List[str], 
                           agg_dict: Dict[str, Callable]) -> pd.DataFrame:
         """
@@ -157,6 +805,4 @@ class SalesAnalytics:
         Returns:
             Aggregated DataFrame
         """
-        return (self.data.groupby(group_by)
-                .agg(agg_dict)
-                .reset_index())
+        return self._aggregate_rows(group_by, agg_dict).reset_index()
@@ -0,0 +1,407 @@
+import argparse
+import inspect
+import json
+import os
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+try:
+    from .data_loader import DataLoader
+    from .stream_operations import StreamOperations
+    from .sales_analytics import REPORT_METHODS, SalesAnalytics
+    from .expressions import Expression
+except ImportError:
+    from data_loader import DataLoader
+    from stream_operations import StreamOperations
+    from sales_analytics import REPORT_METHODS, SalesAnalytics
+    from expressions import Expression
+
+# Chainable StreamOperations steps allowed in a /query pipeline
+QUERY_STEPS = {'filter', 'sorted_by', 'skip', 'limit'}
+
+# Terminal StreamOperations operations allowed in a /query, and whether
+# their argument is an expression (True) or a column name (False)
+QUERY_RESULTS = {
+    'collect': None, 'count': None, 'find_any': None,
+    'distinct': False, 'reduce_sum': False,
+    'map': True, 'any_match': True, 'all_match': True, 'none_match': True, 'find_first': True,
+}
+
+FORMATS = ('records', 'columns')
+
+DEFAULT_TRANSFORMATIONS = [DataLoader.clean_data, DataLoader.parse_dates,
+                           DataLoader.add_calculated_fields]
+
+
+class RequestError(Exception):
+    """Invalid request; reported to the client with an HTTP status."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def _flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Join MultiIndex column labels ('Total Revenue', 'sum') -> 'Total Revenue sum'."""
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy(deep=False)
+        df.columns = [' '.join(str(part) for part in column if part != '')
+                      for column in df.columns]
+    return df
+
+
+def to_payload(result: Any, fmt: str = 'records') -> Any:
+    """
+    Convert a report or query result to a JSON-compatible payload.
+
+    Args:
+        result: DataFrame, Series, list or scalar
+        fmt: 'records' (list of row objects) or 'columns' (column arrays)
+
+    Returns:
+        {'rows': n, 'data': [...]} for records, {'rows': n, 'columns':
+        [...], 'data': {column: [...]}} for columns, or {'result': value}
+        for scalars and lists
+    """
+    if isinstance(result, pd.Series):
+        result = result.to_frame(result.name if result.name is not None else 'value')
+    if not isinstance(result, pd.DataFrame):
+        return {'result': json.loads(pd.Series([result]).to_json(
+            orient='values', date_format='iso', default_handler=str))[0]}
+    frame = _flatten_columns(result)
+    frame = frame.assign(**{column: frame[column].astype(str) for column in frame.columns
+                            if isinstance(frame[column].dtype, pd.PeriodDtype)})
+    orient = 'records' if fmt == 'records' else 'split'
+    data = json.loads(frame.to_json(orient=orient, date_format='iso', index=False,
+                                    default_handler=str))
+    if fmt == 'records':
+        return {'rows': len(frame), 'data': data}
+    columns = [str(column) for column in frame.columns]
+    return {'rows': len(frame), 'columns': columns,
+            'data': {column: [row[i] for row in data['data']]
+                     for i, column in enumerate(columns)}}
+
+
+class SalesService:
+    """
+    Loaded dataset plus the analytics objects queried by the server.
+
+    The data is loaded once and shared by all request threads. reload()
+    builds a fresh snapshot off to the side and swaps it in with a single
+    assignment, so readers always see either the old or the new data and
+    never block on a reload.
+    """
+
+    def __init__(self, filepath: Union[str, List[str]], fused: bool = True):
+        """
+        Load the dataset.
+
+        Args:
+            filepath: Anything DataLoader accepts (file, glob, list, dataset root)
+            fused: Apply the built-in transformations in fused mode
+        """
+        self.filepath = filepath
+        self.fused = fused
+        self._reload_lock = threading.Lock()
+        self._snapshot = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        started = time.perf_counter()
+        loader = DataLoader(self.filepath)
+        loader.load_data()
+        data = loader.apply_transformations(DEFAULT_TRANSFORMATIONS, fused=self.fused)
+        analytics = SalesAnalytics(data)
+        analytics.build_cubes()
+        return {'analytics': analytics, 'stream': StreamOperations(data),
+                'loaded_at': time.time(), 'load_seconds': time.perf_counter() - started}
+
+    def reload(self) -> Dict[str, Any]:
+        """
+        Re-read the dataset from its source.
+
+        Returns:
+            Status of the new snapshot
+        """
+        with self._reload_lock:
+            self._snapshot = self._load()
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """Describe the current snapshot."""
+        snapshot = self._snapshot
+        analytics = snapshot['analytics']
+        return {'status': 'ok', 'rows': len(analytics.data),
+                'version': analytics.data_version(),
+                'loaded_at': snapshot['loaded_at'],
+                'load_seconds': round(snapshot['load_seconds'], 3)}
+
+    @staticmethod
+    def reports() -> Dict[str, List[str]]:
+        """Report name -> parameter names."""
+        return {name: list(inspect.signature(getattr(SalesAnalytics, name)).parameters)[1:]
+                for name in REPORT_METHODS}
+
+    def report(self, name: str, args: Optional[list] = None,
+               kwargs: Optional[dict] = None) -> Any:
+        """
+        Run a SalesAnalytics report.
+
+        Args:
+            name: Report method name
+            args: Positional arguments
+            kwargs: Keyword arguments
+
+        Returns:
+            Report result
+        """
+        if name not in REPORT_METHODS:
+            raise RequestError(f"Unknown report '{name}'", 404)
+        analytics = self._snapshot['analytics']
+        try:
+            return getattr(analytics, name)(*(args or []), **(kwargs or {}))
+        except (KeyError, TypeError, ValueError) as e:
+            raise RequestError(f"{name}: {e}")
+
+    def query(self, spec: Dict[str, Any]) -> Any:
+        """
+        Run a StreamOperations query described in JSON.
+
+        Example:
+            {"steps": [{"filter": {"op": "gt", "args": [{"col": "Total Revenue"}, 100000]}},
+                       {"sorted_by": "Total Profit", "ascending": false},
+                       {"limit": 5}],
+             "result": "collect",
+             "columns": ["Order ID", "Total Profit"]}
+
+        Steps run in order; "result" names the terminal operation
+        (collect by default), with its argument in "column" or "predicate".
+
+        Args:
+            spec: Query document
+
+        Returns:
+            Query result
+        """
+        if not isinstance(spec, dict):
+            raise RequestError("Query must be a JSON object")
+        stream = self._snapshot['stream']
+        try:
+            for step in spec.get('steps', []):
+                operation = next((key for key in step if key in QUERY_STEPS), None)
+                if operation is None:
+                    raise RequestError(f"Unknown query step: {step!r}")
+                if operation == 'filter':
+                    stream = stream.filter(Expression.from_dict(step['filter']))
+                elif operation == 'sorted_by':
+                    stream = stream.sorted_by(step['sorted_by'], step.get('ascending', True))
+                else:
+                    stream = getattr(stream, operation)(int(step[operation]))
+
+            operation = spec.get('result', 'collect')
+            if operation not in QUERY_RESULTS:
+                raise RequestError(f"Unknown query result '{operation}'")
+            if operation == 'collect':
+                result = stream.collect()
+                return result[spec['columns']] if 'columns' in spec else result
+            if QUERY_RESULTS[operation] is None:
+                result = getattr(stream, operation)()
+            elif QUERY_RESULTS[operation]:
+                result = getattr(stream, operation)(Expression.from_dict(spec['predicate']))
+            else:
+                result = getattr(stream, operation)(spec['column'])
+            # A single row comes back as a one-row table, no match as null
+            if operation in ('find_first', 'find_any') and result is not None:
+                return result.to_frame().T
+            return result
+        except (KeyError, TypeError, ValueError) as e:
+            raise RequestError(f"Invalid query: {e}")
+
+
+class SalesRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API over a SalesService.
+
+    GET  /health                 dataset status
+    GET  /reports                available reports and their parameters
+    GET  /reports/<name>?n=5     run a report (query values parsed as JSON)
+    POST /reports/<name>         run a report with {"args": [...], "kwargs": {...}}
+    POST /query                  run a StreamOperations query (see SalesService.query)
+    POST /reload                 reload the dataset
+
+    Results are JSON; add ?format=columns for column arrays instead of
+    row objects.
+    """
+
+    server_version = 'SalesAnalytics/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def service(self) -> SalesService:
+        return self.server.service
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args) -> None:
+        if getattr(self.server, 'verbose', False):
+            super().log_message(format, *args)
+
+    def _send(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        """
+        Read the whole request body before anything can fail, so that an
+        error reply never leaves body bytes to be parsed as the next
+        request on a kept-alive connection. Bodies that cannot be delimited
+        close the connection instead.
+        """
+        self._raw_body = b''
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or 'Transfer-Encoding' in self.headers:
+            self.close_connection = True
+            raise RequestError("Request body needs a valid Content-Length", 411)
+        self._raw_body = self.rfile.read(length)
+        return self._raw_body
+
+    def _body(self) -> Any:
+        if not self._raw_body:
+            return {}
+        try:
+            return json.loads(self._raw_body)
+        except ValueError as e:
+            raise RequestError(f"Invalid JSON body: {e}")
+
+    @staticmethod
+    def _query_params(query: str) -> Tuple[str, Dict[str, Any]]:
+        params = {}
+        for key, values in parse_qs(query).items():
+            try:
+                params[key] = json.loads(values[-1])
+            except ValueError:
+                params[key] = values[-1]
+        fmt = params.pop('format', 'records')
+        if fmt not in FORMATS:
+            raise RequestError(f"format must be one of {', '.join(FORMATS)}")
+        return fmt, params
+
+    def _route(self, method: str) -> Tuple[int, Any]:
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split('/') if part]
+        fmt, params = self._query_params(url.query)
+        if method == 'GET' and parts == ['health']:
+            return 200, self.service.status()
+        if method == 'GET' and parts == ['reports']:
+            return 200, self.service.reports()
+        if len(parts) == 2 and parts[0] == 'reports':
+            if method == 'GET':
+                result = self.service.report(parts[1], kwargs=params)
+            else:
+                body = self._body()
+                result = self.service.report(parts[1], body.get('args'), body.get('kwargs'))
+            return 200, to_payload(result, fmt)
+        if method == 'POST' and parts == ['query']:
+            return 200, to_payload(self.service.query(self._body()), fmt)
+        if method == 'POST' and parts == ['reload']:
+            return 200, self.service.reload()
+        raise RequestError(f"No route for {method} {url.path}", 404)
+
+    def _handle(self, method: str) -> None:
+        try:
+            self._read_body()
+            status, payload = self._route(method)
+        except RequestError as e:
+            status, payload = e.status, {'error': str(e)}
+        except Exception as e:
+            status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+        self._send(status, payload)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def make_server(service: SalesService, host: str = '127.0.0.1', port: int = 8765,
+                socket_path: Optional[str] = None,
+                verbose: bool = False) -> Union[HTTPServer, UnixHTTPServer]:
+    """
+    Create a threaded server for a service (call serve_forever() to run it).
+
+    Args:
+        service: Loaded service
+        host: TCP host (ignored with socket_path)
+        port: TCP port, 0 for any free port (ignored with socket_path)
+        socket_path: Listen on this Unix socket instead of TCP
+        verbose: Log each request to stderr
+
+    Returns:
+        Server instance
+    """
+    if socket_path:
+        server = UnixHTTPServer(socket_path, SalesRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), SalesRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Serve sales reports and stream queries from a dataset loaded once.")
+    parser.add_argument('--data', default='sales_data.csv',
+                        help="CSV file, glob or partitioned dataset root (default: sales_data.csv)")
+    parser.add_argument('--host', default='127.0.0.1', help="TCP host (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port (default: 8765)")
+    parser.add_argument('--socket', help="Listen on this Unix socket instead of TCP")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    service = SalesService(args.data)
+    server = make_server(service, args.host, args.port, args.socket, args.verbose)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"✓ Serving {service.status()['rows']} records on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
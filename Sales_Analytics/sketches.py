@@ -0,0 +1,334 @@
+import math
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional, Union
+
+ArrayLike = Union[pd.Series, np.ndarray, list]
+
+
+def hash_values(values: ArrayLike) -> np.ndarray:
+    """Hash values to uint64 (equal values always get equal hashes)."""
+    return pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy()
+
+
+def _mix64(hashes: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer: a bijection spreading every input bit over the output."""
+    with np.errstate(over='ignore'):
+        z = hashes.astype(np.uint64)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct-count sketch.
+
+    Uses 2**precision one-byte registers (16 KB at the default precision
+    of 14). The relative standard error of count() is 1.04 / sqrt(2**p):
+    about 0.81% at p=14 and 1.6% at p=12, independent of how many values
+    were added. Sketches with the same precision merge losslessly.
+    """
+
+    # Hash bits used for the rank after the register index; kept below 2**53
+    # so they convert to float64 exactly
+    _RANK_BITS = 53
+
+    def __init__(self, precision: int = 14):
+        """
+        Initialize empty sketch.
+
+        Args:
+            precision: Number of index bits p (4 to 18)
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, values: ArrayLike) -> 'HyperLogLog':
+        """
+        Add values (missing values are ignored).
+
+        Args:
+            values: Values to add
+
+        Returns:
+            self
+        """
+        series = pd.Series(values).dropna()
+        if len(series) == 0:
+            return self
+        hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+        p = np.uint64(self.precision)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        rest = (hashes << p) >> np.uint64(64 - self._RANK_BITS)
+        # Position of the leftmost 1-bit within the rank bits
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (self._RANK_BITS - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch with the same precision
+
+        Returns:
+            self
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values added.
+
+        Returns:
+            Estimated distinct count
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros > 0:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of count()."""
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    Keeps a hierarchy of compactors whose capacities shrink geometrically
+    from k, so memory stays at roughly 3k values regardless of input size.
+    With the default k=200 the normalized rank error is about 1.65% with
+    99% confidence: a returned q-quantile has a true rank within
+    q +/- 0.0165. Error scales roughly as 1/k.
+    """
+
+    _DECAY = 2 / 3
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        """
+        Initialize empty sketch.
+
+        Args:
+            k: Accuracy parameter (capacity of the top compactor)
+            seed: Seed for the random compaction offsets
+        """
+        self.k = k
+        self.n = 0
+        self.min = math.nan
+        self.max = math.nan
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * self._DECAY ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) >= self._capacity(level):
+                items = np.sort(items)
+                # An odd item out stays at this level
+                keep = items[len(items) - len(items) % 2:]
+                pairs = items[:len(items) - len(items) % 2]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.levels[level] = keep
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values: ArrayLike) -> 'KLLSketch':
+        """
+        Add numeric values (missing values are ignored).
+
+        Args:
+            values: Values to add
+
+        Returns:
+            self
+        """
+        array = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy(dtype=float)
+        if len(array) == 0:
+            return self
+        self.n += len(array)
+        self.min = np.nanmin([self.min, array.min()])
+        self.max = np.nanmax([self.max, array.max()])
+        self.levels[0] = np.concatenate([self.levels[0], array])
+        self._compress()
+        return self
+
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch to merge
+
+        Returns:
+            self
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.n += other.n
+        self.min = np.nanmin([self.min, other.min])
+        self.max = np.nanmax([self.max, other.max])
+        self._compress()
+        return self
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """
+        Estimate quantiles.
+
+        Args:
+            qs: Quantiles between 0 and 1
+
+        Returns:
+            Estimated value for each quantile (NaN if the sketch is empty)
+        """
+        qs = list(qs)
+        if self.n == 0:
+            return [math.nan] * len(qs)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_), 2.0 ** level)
+                                  for level, items_ in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        results = []
+        for q in qs:
+            if q <= 0:
+                results.append(float(self.min))
+            elif q >= 1:
+                results.append(float(self.max))
+            else:
+                position = np.searchsorted(cumulative, q * cumulative[-1], side='left')
+                results.append(float(items[min(position, len(items) - 1)]))
+        return results
+
+    def quantile(self, q: float) -> float:
+        """Estimate a single quantile."""
+        return self.quantiles([q])[0]
+
+
+class BloomFilter:
+    """
+    Set membership filter with no false negatives.
+
+    A blocked Bloom filter: each value sets k bits inside a single 64-bit
+    word, so a lookup touches one cache line and vectorizes to a gather,
+    an AND and a compare. Sized so that once `capacity` values are added a
+    value that was never added is reported as present with probability
+    about `error_rate` (1% costs 12 bits per value); blocking makes rates
+    much below 1% a few times higher than requested. Filters with the
+    same size merge losslessly.
+    """
+
+    # Blocking raises the false positive rate a little; extra bits make up for it
+    _BLOCK_OVERHEAD = 1.25
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        """
+        Initialize empty filter.
+
+        Args:
+            capacity: Number of values the filter is sized for
+            error_rate: False positive rate at capacity (0 to 1)
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        bits = -capacity * math.log(error_rate) / math.log(2) ** 2 * self._BLOCK_OVERHEAD
+        self.words = np.zeros(max(1, int(math.ceil(bits / 64))), dtype=np.uint64)
+        self.num_hashes = min(10, max(1, int(round(-math.log2(error_rate)))))
+
+    @property
+    def num_bits(self) -> int:
+        return len(self.words) * 64
+
+    def _blocks(self, hashes: np.ndarray) -> tuple:
+        """Word index and bit mask of each hash."""
+        mixed = _mix64(hashes)
+        index = (mixed % np.uint64(len(self.words))).astype(np.int64)
+        # Bit positions come from a second, independent mix, 6 bits each
+        bits = _mix64(mixed ^ np.uint64(0x9E3779B97F4A7C15))
+        mask = np.zeros(len(hashes), dtype=np.uint64)
+        for i in range(self.num_hashes):
+            mask |= np.uint64(1) << ((bits >> np.uint64(6 * i)) & np.uint64(63))
+        return index, mask
+
+    def add_hashes(self, hashes: np.ndarray) -> 'BloomFilter':
+        """Add values given as uint64 hashes (see hash_values)."""
+        if len(hashes) == 0:
+            return self
+        index, mask = self._blocks(hashes)
+        # OR together the masks aimed at the same word, then set each word once
+        order = np.argsort(index, kind='stable')
+        index, mask = index[order], mask[order]
+        starts = np.flatnonzero(np.r_[True, index[1:] != index[:-1]])
+        self.words[index[starts]] |= np.bitwise_or.reduceat(mask, starts)
+        return self
+
+    def contains_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """Membership mask for values given as uint64 hashes."""
+        index, mask = self._blocks(hashes)
+        return (self.words[index] & mask) == mask
+
+    def update(self, values: ArrayLike) -> 'BloomFilter':
+        """
+        Add values.
+
+        Args:
+            values: Values to add
+
+        Returns:
+            self
+        """
+        return self.add_hashes(hash_values(values))
+
+    def contains(self, values: ArrayLike) -> np.ndarray:
+        """
+        Test values for membership.
+
+        Args:
+            values: Values to test
+
+        Returns:
+            Boolean array: False means never added, True means probably added
+        """
+        return self.contains_hashes(hash_values(values))
+
+    def merge(self, other: 'BloomFilter') -> 'BloomFilter':
+        """
+        Merge another filter into this one.
+
+        Args:
+            other: Filter with the same number of bits and probes
+
+        Returns:
+            self
+        """
+        if (other.num_bits, other.num_hashes) != (self.num_bits, self.num_hashes):
+            raise ValueError("Cannot merge filters of different sizes")
+        np.bitwise_or(self.words, other.words, out=self.words)
+        return self
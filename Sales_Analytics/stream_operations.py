@@ -1,59 +1,285 @@
+import copy
+import math
+import os
+import numpy as np
 import pandas as pd
-from typing import Callable, Any, List
+from typing import Callable, Any, Iterator, List, Optional, Union
 from functools import reduce
 import operator
 
+try:
+    from .backends import PandasBackend, copy_on_write_enabled, get_backend
+    from .expressions import Expression
+    from .external_sort import ExternalSort
+    from .indexes import TableIndexes
+    from .partitioned_dataset import PartitionedDataset
+except ImportError:
+    from backends import PandasBackend, copy_on_write_enabled, get_backend
+    from expressions import Expression
+    from external_sort import ExternalSort
+    from indexes import TableIndexes
+    from partitioned_dataset import PartitionedDataset
+
+# Predicates and mappers may be column expressions or row-wise callables
+RowFunction = Union[Expression, Callable]
+
+
+# Python reductions with an equivalent NumPy kernel, used where the kernel
+# gives the fold's result (see StreamOperations.reduce_custom); binary
+# NumPy ufuncs are their own kernel
+_VECTORIZED_REDUCTIONS = {
+    operator.add: np.add,
+    operator.mul: np.multiply,
+    min: np.minimum,
+    max: np.maximum,
+}
+
+
+def _to_python(value: Any) -> Any:
+    """Convert NumPy scalars to the matching Python type."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _fits_int64(kernel: np.ufunc, values: np.ndarray, initial: int) -> bool:
+    """Whether every partial result of reducing integers stays in int64."""
+    if abs(initial) >= 2 ** 63 or values.dtype == np.uint64:
+        return False
+    if len(values) == 0 or kernel not in (np.add, np.multiply):
+        return True
+    largest = max(abs(int(values.min())), abs(int(values.max())))
+    if kernel is np.add:
+        # Every partial sum is bounded by the largest magnitude, len(values) times
+        return abs(initial) + largest * len(values) < 2 ** 63
+    # Every partial product is bounded by the product of the magnitudes
+    # (counting zeros as one); the margin covers log2 rounding
+    magnitudes = np.maximum(np.abs(values.astype(np.float64)), 1)
+    return np.log2(magnitudes).sum() + math.log2(max(abs(initial), 1)) < 62
+
 
 class StreamOperations:
-    """Implements stream-like operations on DataFrame."""
+    """
+    Implements stream-like operations on DataFrame.
     
-    def __init__(self, data: pd.DataFrame):
+    Intermediate streams share the underlying column buffers instead of
+    copying them: skip(), limit() and filters that keep every record add
+    no copy of the data, and a selective filter copies only the records
+    it keeps. The input frame is shared as well when pandas copy-on-write
+    is active, and copied once otherwise, so later changes to it never
+    reach the stream. collect() hands the caller a frame of its own:
+    copied lazily on first write under copy-on-write, eagerly otherwise.
+    
+    Terminal matching operations (any_match, all_match, none_match and
+    find_first with a predicate) evaluate in chunks that start at
+    initial_chunk_size rows and double up to max_chunk_size, stopping as
+    soon as the answer is known.
+    
+    Operations run on a per-instance execution backend: 'pandas' (the
+    default) or 'arrow', which keeps the records in an Apache Arrow table
+    and evaluates column expressions, filters, sorts and slices with Arrow
+    compute kernels. Derived streams keep their parent's backend, and both
+    backends return the same results through the same methods.
+    
+    Predicates and mappers that are plain Python callables cannot be
+    vectorized. With workers > 1 they are evaluated on a process pool
+    instead: the records are split into contiguous slices of whole rows,
+    and the results are reassembled in order. Streams smaller than
+    parallel_min_rows stay in-process, where starting workers would cost
+    more than it saves, and so do streams used from several threads (see
+    parallel.parallel_apply).
+    
+    sorted_by(key, run_rows=...) sorts out of core (see ExternalSort):
+    sorted runs are spilled to disk and merged lazily. The resulting
+    stream stays lazy through skip(), limit() and count(), and
+    iter_batches() / to_csv() stream it in order, so ranking or exporting
+    a dataset larger than memory holds about run_rows records at a time.
+    """
+    
+    initial_chunk_size = 1024
+    max_chunk_size = 1 << 20
+    parallel_min_rows = 50_000
+    
+    def __init__(self, data: Union[pd.DataFrame, PartitionedDataset, ExternalSort],
+                 indexes: Optional[TableIndexes] = None,
+                 backend: Union[str, PandasBackend] = 'pandas',
+                 workers: Optional[int] = 1):
         """
         Initialize with data.
         
+        A PartitionedDataset source is read lazily: a leading filter() with
+        a column expression only reads the partitions it can match. An
+        ExternalSort source is read lazily too, batch by batch.
+        
+        Args:
+            data: Input DataFrame (shared under pandas copy-on-write,
+                copied otherwise), Arrow table, partitioned dataset or
+                external sort
+            indexes: Indexes built over data (see DataLoader.build_indexes);
+                filters on indexed columns then look rows up instead of
+                scanning
+            backend: Execution backend, 'pandas' or 'arrow' (requires
+                pyarrow), or a backend instance
+            workers: Processes evaluating Python callables (None for one
+                per CPU); derived streams keep the setting
+        """
+        self._backend = get_backend(backend)
+        self.workers = workers or os.cpu_count() or 1
+        if isinstance(data, (PartitionedDataset, ExternalSort)):
+            self._source, self._data = data, None
+        else:
+            self._source = None
+            self._data = self._backend.wrap(data, copy=not copy_on_write_enabled())
+        if indexes is not None and indexes.size != self._backend.num_rows(self.data):
+            raise ValueError("Indexes were built over a different DataFrame")
+        self._indexes = indexes
+    
+    @property
+    def data(self) -> Any:
+        """
+        Records in the stream, in the backend's table type (a DataFrame, or
+        an Arrow table for the arrow backend). A lazy dataset source is
+        read on first use.
+        """
+        if self._data is None:
+            self._data = self._backend.wrap(self._source.read())
+        return self._data
+    
+    @property
+    def backend(self) -> str:
+        """Name of the execution backend."""
+        return self._backend.name
+    
+    def _derive(self, data: Any) -> 'StreamOperations':
+        """Wrap records produced by an intermediate operation in a new stream."""
+        # The records are already the stream's own, so they are never copied
+        derived = copy.copy(self)
+        derived._indexes = None
+        if isinstance(data, (PartitionedDataset, ExternalSort)):
+            derived._source, derived._data = data, None
+        else:
+            derived._source, derived._data = None, data
+        return derived
+    
+    def _evaluate(self, func: RowFunction, data: Any = None) -> Any:
+        """
+        Evaluate a predicate or mapper over every record.
+        
+        Column expressions are computed on whole columns at once; plain
+        callables fall back to a row-by-row apply, on the worker pool when
+        there are enough records.
+        
+        Args:
+            func: Expression or row-wise callable
+            data: Records to evaluate (defaults to the stream's data)
+            
+        Returns:
+            Backend column of results aligned with the data
+        """
+        data = self.data if data is None else data
+        parallel = self._backend.num_rows(data) >= self.parallel_min_rows
+        return self._backend.evaluate(func, data, self.workers if parallel else 1)
+    
+    def _lazy_sort(self) -> Optional[ExternalSort]:
+        """The external sort this stream reads, if it has not been read yet."""
+        if self._data is None and isinstance(self._source, ExternalSort):
+            return self._source
+        return None
+    
+    def _iter_frames(self, rows: int) -> Iterator[pd.DataFrame]:
+        """
+        Yield the records as DataFrames without materializing a lazy source.
+        
         Args:
-            data: Input DataFrame
+            rows: Rows per frame for in-memory data
+            
+        Returns:
+            Iterator of DataFrames covering the data in order
+        """
+        if self._data is None:
+            if isinstance(self._source, ExternalSort):
+                yield from self._source.iter_batches()
+            else:
+                yield from self._source.iter_read()
+            return
+        # Empty data still yields one frame, which carries the columns
+        for start in range(0, max(self._backend.num_rows(self.data), 1), rows):
+            yield self._backend.to_pandas(self._backend.slice(self.data, start, start + rows),
+                                          copy=False)
+    
+    def _iter_chunks(self) -> Iterator[Any]:
         """
-        self.data = data.copy()
+        Yield consecutive row slices of geometrically growing size.
+        
+        A lazy external sort is instead merged batch by batch, so a search
+        stops reading at the first decisive batch.
+        
+        Returns:
+            Iterator of zero-copy slices covering the data in order
+        """
+        if self._lazy_sort() is not None:
+            for batch in self._source.iter_batches():
+                yield self._backend.wrap(batch)
+            return
+        start, size = 0, self.initial_chunk_size
+        while start < self._backend.num_rows(self.data):
+            yield self._backend.slice(self.data, start, start + size)
+            start += size
+            size = min(size * 2, self.max_chunk_size)
     
-    def filter(self, predicate: Callable) -> 'StreamOperations':
+    def filter(self, predicate: RowFunction) -> 'StreamOperations':
         """
         Filter records using predicate (similar to Stream.filter).
         
         Args:
-            predicate: Boolean function
+            predicate: Boolean expression, e.g. col('Total Revenue') > 100000,
+                or a boolean function of a row
             
         Returns:
             StreamOperations with filtered data
         """
-        filtered = self.data[self.data.apply(predicate, axis=1)]
-        return StreamOperations(filtered)
+        if self._data is None and isinstance(predicate, Expression):
+            return self._derive(self._source.read(predicate)).filter(predicate)
+        if self._indexes is not None and isinstance(predicate, Expression):
+            positions = self._indexes.candidates(predicate)
+            if positions is not None:
+                candidates = self._backend.take(self.data, positions)
+                return self._derive(self._backend.filter(
+                    candidates, self._evaluate(predicate, candidates)))
+        return self._derive(self._backend.filter(self.data, self._evaluate(predicate)))
     
-    def map(self, mapper: Callable) -> pd.Series:
+    def map(self, mapper: RowFunction) -> pd.Series:
         """
         Transform each record (similar to Stream.map).
         
         Args:
-            mapper: Transformation function
+            mapper: Column expression or transformation function
             
         Returns:
             Series of transformed values
         """
-        return self.data.apply(mapper, axis=1)
+        return self._backend.to_series(self._evaluate(mapper))
     
-    def sorted_by(self, key: str, ascending: bool = True) -> 'StreamOperations':
+    def sorted_by(self, key: str, ascending: bool = True, run_rows: Optional[int] = None,
+                  spill_dir: Optional[str] = None) -> 'StreamOperations':
         """
         Sort data by key (similar to Stream.sorted).
         
+        The sort is stable: records with equal keys keep their order.
+        
         Args:
             key: Column name
             ascending: Sort order
+            run_rows: Sort out of core, holding about this many records in
+                memory (see ExternalSort); a lazy source is then read one
+                partition or batch at a time
+            spill_dir: Directory for the sorted runs of an out-of-core sort
             
         Returns:
             StreamOperations with sorted data
         """
-        sorted_data = self.data.sort_values(by=key, ascending=ascending)
-        return StreamOperations(sorted_data)
+        if run_rows is None:
+            return self._derive(self._backend.sort(self.data, key, ascending))
+        return self._derive(ExternalSort(self._iter_frames(run_rows), key, ascending,
+                                         run_rows=run_rows, spill_dir=spill_dir))
     
     def limit(self, n: int) -> 'StreamOperations':
         """
@@ -65,7 +291,9 @@ class StreamOperations:
         Returns:
             StreamOperations with limited data
         """
-        return StreamOperations(self.data.head(n))
+        if self._lazy_sort() is not None:
+            return self._derive(self._source.slice(0, n))
+        return self._derive(self._backend.slice(self.data, 0, n))
     
     def skip(self, n: int) -> 'StreamOperations':
         """
@@ -77,30 +305,81 @@ class StreamOperations:
         Returns:
             StreamOperations with remaining data
         """
-        return StreamOperations(self.data.iloc[n:])
+        if self._lazy_sort() is not None:
+            return self._derive(self._source.slice(n))
+        return self._derive(self._backend.slice(self.data, n))
     
     def distinct(self, column: str = None) -> List[Any]:
         """
         Get distinct values (similar to Stream.distinct).
         
+        A lazy external sort is deduplicated batch by batch, holding only
+        the distinct values of each batch.
+        
         Args:
             column: Column name (if None, returns unique rows)
             
         Returns:
             List of distinct values
         """
-        if column:
-            return self.data[column].unique().tolist()
-        return self.data.drop_duplicates().values.tolist()
+        if self._lazy_sort() is not None:
+            parts = [(batch[column] if column else batch).drop_duplicates()
+                     for batch in self._source.iter_batches()]
+            if not parts:
+                return []
+            distinct = pd.concat(parts).drop_duplicates()
+            return distinct.tolist() if column else distinct.values.tolist()
+        return self._backend.unique(self.data, column)
     
     def collect(self) -> pd.DataFrame:
         """
         Collect results (terminal operation).
         
+        The returned frame can be modified freely without affecting this
+        stream or the data it was built from. Frames collected from the
+        arrow backend carry a fresh RangeIndex.
+        
         Returns:
             DataFrame
         """
-        return self.data
+        return self._backend.to_pandas(self.data, copy=not copy_on_write_enabled())
+    
+    def iter_batches(self, batch_rows: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Stream the records in order (terminal operation).
+        
+        Lazy sources are read a batch or partition at a time, so a sorted,
+        skipped and limited out-of-core stream never has to fit in memory.
+        
+        Args:
+            batch_rows: Rows per batch for in-memory data
+            
+        Returns:
+            Iterator of DataFrames, which may be modified freely
+        """
+        for frame in self._iter_frames(batch_rows):
+            yield frame if copy_on_write_enabled() else frame.copy()
+    
+    def to_csv(self, path: str, batch_rows: int = 100_000, **kwargs) -> int:
+        """
+        Write the records to a CSV file in order, batch by batch.
+        
+        Args:
+            path: Output file
+            batch_rows: Rows per batch for in-memory data
+            kwargs: Passed to DataFrame.to_csv (index defaults to False)
+            
+        Returns:
+            Number of records written
+        """
+        kwargs.setdefault('index', False)
+        written = 0
+        for batch in self._iter_frames(batch_rows):
+            batch.to_csv(path, mode='w' if written == 0 else 'a', header=written == 0, **kwargs)
+            written += len(batch)
+        if written == 0:
+            self._backend.to_pandas(self._backend.slice(self.data, 0, 0)).to_csv(path, **kwargs)
+        return written
     
     def count(self) -> int:
         """
@@ -109,24 +388,53 @@ class StreamOperations:
         Returns:
             Number of records
         """
-        return len(self.data)
+        if self._lazy_sort() is not None:
+            return len(self._source)
+        return self._backend.num_rows(self.data)
     
-    def reduce_sum(self, column: str) -> float:
+    def reduce_sum(self, column: str, exact: bool = False) -> float:
         """
         Sum values in column (similar to Stream.reduce).
         
+        Uses NumPy's pairwise summation, whose rounding error grows with
+        log(n) rather than n, so large money columns stay accurate.
+        Integer columns are summed in int64 unless the total could
+        overflow it, in which case Python ints are added instead.
+        
         Args:
             column: Column name
+            exact: Use math.fsum for a correctly rounded float total
             
         Returns:
             Sum of values
         """
-        return reduce(operator.add, self.data[column], 0)
+        values = self._backend.column(self.data, column)
+        if exact and values.dtype.kind == 'f':
+            return math.fsum(values)
+        if len(values) == 0:
+            return 0
+        if values.dtype.kind in 'iu':
+            if not _fits_int64(np.add, values, 0):
+                # The total could wrap around in int64; add Python ints instead
+                return sum(self._backend.column_list(self.data, column))
+            return _to_python(values.sum(dtype=np.int64))
+        return _to_python(values.sum())
     
     def reduce_custom(self, column: str, operation: Callable, initial: Any = 0) -> Any:
         """
         Custom reduce operation.
         
+        Addition, multiplication, min and max (operator.add, operator.mul,
+        min, max) and any binary NumPy ufunc run as a single vectorized
+        kernel where that gives the fold's result: on integer columns whose
+        partial sums or products cannot overflow int64, and on float
+        columns (for min and max, only without NaN, which the builtins
+        skip). Float addition is the one inexact case: like reduce_sum it
+        uses NumPy's pairwise summation, which may differ from the
+        left-to-right fold in the last bits (its error grows with log(n)
+        rather than n). Everything else is folded element by element on
+        Python scalars.
+        
         Args:
             column: Column name
             operation: Reduction function
@@ -135,58 +443,99 @@ class StreamOperations:
         Returns:
             Reduced value
         """
-        return reduce(operation, self.data[column], initial)
+        values = self._backend.column(self.data, column)
+        kernel = _VECTORIZED_REDUCTIONS.get(operation)
+        if kernel is None and isinstance(operation, np.ufunc) and operation.nin == 2:
+            kernel = operation
+        if kernel is not None and self._vectorizable(operation, kernel, values, initial):
+            if values.dtype.kind in 'iu':
+                values = values.astype(np.int64, copy=False)
+            if operation in (min, max):
+                # The builtins return the initial value itself when it wins
+                if len(values) == 0:
+                    return initial
+                return operation(initial, _to_python(kernel.reduce(values)))
+            return _to_python(kernel.reduce(values, initial=initial))
+        return reduce(operation, self._backend.column_list(self.data, column), initial)
+    
+    @staticmethod
+    def _vectorizable(operation: Callable, kernel: np.ufunc, values: np.ndarray,
+                      initial: Any) -> bool:
+        """Whether kernel.reduce over values gives the Python fold's result."""
+        if values.dtype.kind == 'f':
+            if not isinstance(initial, (int, float)):
+                return False
+            return operation not in (min, max) or not np.isnan(values).any()
+        if values.dtype.kind not in 'iu' or not isinstance(initial, int):
+            return False
+        return _fits_int64(kernel, values, initial)
     
-    def any_match(self, predicate: Callable) -> bool:
+    def any_match(self, predicate: RowFunction) -> bool:
         """
         Check if any record matches (similar to Stream.anyMatch).
         
         Args:
-            predicate: Predicate function
+            predicate: Boolean expression or predicate function
             
         Returns:
             True if any match
         """
-        return self.data.apply(predicate, axis=1).any()
+        return any(self._backend.any(self._evaluate(predicate, chunk))
+                   for chunk in self._iter_chunks())
     
-    def all_match(self, predicate: Callable) -> bool:
+    def all_match(self, predicate: RowFunction) -> bool:
         """
         Check if all records match (similar to Stream.allMatch).
         
         Args:
-            predicate: Predicate function
+            predicate: Boolean expression or predicate function
             
         Returns:
             True if all match
         """
-        return self.data.apply(predicate, axis=1).all()
+        return all(self._backend.all(self._evaluate(predicate, chunk))
+                   for chunk in self._iter_chunks())
     
-    def none_match(self, predicate: Callable) -> bool:
+    def none_match(self, predicate: RowFunction) -> bool:
         """
         Check if no records match (similar to Stream.noneMatch).
         
         Args:
-            predicate: Predicate function
+            predicate: Boolean expression or predicate function
             
         Returns:
             True if none match
         """
         return not self.any_match(predicate)
     
-    def find_first(self) -> pd.Series:
+    def find_first(self, predicate: Optional[RowFunction] = None) -> pd.Series:
         """
         Get first record (similar to Stream.findFirst).
         
+        Args:
+            predicate: Optional condition; stops at the first matching record
+            
         Returns:
-            First record
-        """
-        return self.data.iloc[0] if len(self.data) > 0 else None
+            First (matching) record, or None
+        """
+        if predicate is None:
+            # A lazy sort merges only as far as the first record
+            head = self.limit(1)
+            return self._backend.row(head.data, 0) if head.count() > 0 else None
+        for chunk in self._iter_chunks():
+            position = self._backend.first_true(self._evaluate(predicate, chunk))
+            if position is not None:
+                return self._backend.row(chunk, position)
+        return None
     
     def find_any(self) -> pd.Series:
         """
         Get any record (similar to Stream.findAny).
         
         Returns:
-            Random record
+            Random record (the first one of a lazy external sort, which
+            would otherwise have to be read in full), or None
         """
-        return self.data.sample(1).iloc[0] if len(self.data) > 0 else None
\ No newline at end of file
+        if self._lazy_sort() is not None:
+            return self.find_first()
+        return self._backend.sample_row(self.data) if self.count() > 0 else None
\ No newline at end of file
@@ -0,0 +1,168 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# Unit price and cost per item type, as in the public sales exports
+ITEM_PRICES: Dict[str, Tuple[float, float]] = {
+    'Baby Food': (255.28, 159.42),
+    'Beverages': (47.45, 31.79),
+    'Cereal': (205.70, 117.11),
+    'Clothes': (109.28, 35.84),
+    'Cosmetics': (437.20, 263.33),
+    'Fruits': (9.33, 6.92),
+    'Household': (668.27, 502.54),
+    'Meat': (421.89, 364.69),
+    'Office Supplies': (651.21, 524.96),
+    'Personal Care': (81.73, 56.67),
+    'Snacks': (152.58, 97.44),
+    'Vegetables': (154.06, 90.93),
+}
+
+# Number of countries per region (185 in total)
+REGION_SIZES: Dict[str, int] = {
+    'Asia': 27,
+    'Australia and Oceania': 15,
+    'Central America and the Caribbean': 20,
+    'Europe': 48,
+    'Middle East and North Africa': 23,
+    'North America': 4,
+    'Sub-Saharan Africa': 48,
+}
+
+SALES_CHANNELS = ['Online', 'Offline']
+ORDER_PRIORITIES = ['C', 'H', 'L', 'M']
+FIRST_ORDER_DATE = '2010-01-01'
+LAST_ORDER_DATE = '2017-07-28'
+MAX_SHIP_DAYS = 50
+MAX_UNITS = 10_000
+
+# Order IDs are 9-digit numbers produced by a bijection of the row number,
+# so they are unique across chunks without tracking what was issued
+_ID_BASE = 100_000_000
+_ID_SPACE = 900_000_000
+_ID_MULTIPLIER = 282_475_249  # 7**10, coprime with _ID_SPACE
+_ID_OFFSET = 123_456_789
+
+COLUMNS = ['Region', 'Country', 'Item Type', 'Sales Channel', 'Order Priority',
+           'Order Date', 'Order ID', 'Ship Date', 'Units Sold', 'Unit Price',
+           'Unit Cost', 'Total Revenue', 'Total Cost', 'Total Profit']
+
+
+def _default_countries() -> pd.DataFrame:
+    """Region/Country pairs from the bundled CSV, or placeholders with the same cardinality."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sales_data.csv')
+    if os.path.exists(path):
+        return (pd.read_csv(path, usecols=['Region', 'Country'])
+                .drop_duplicates()
+                .sort_values(['Region', 'Country'])
+                .reset_index(drop=True))
+    return pd.DataFrame([(region, f"{region} {i + 1}")
+                         for region, size in REGION_SIZES.items()
+                         for i in range(size)], columns=['Region', 'Country'])
+
+
+def _format_dates(dates: pd.DatetimeIndex) -> np.ndarray:
+    """Format dates as M/D/YYYY like the source CSV."""
+    return (dates.month.astype(str) + '/' + dates.day.astype(str) + '/'
+            + dates.year.astype(str)).to_numpy()
+
+
+def generate_sales(rows: int, seed: int = 0, start: int = 0,
+                   countries: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Generate synthetic sales records with the schema of sales_data.csv.
+
+    Rows are drawn uniformly over 185 countries in 7 regions, 12 item
+    types with fixed prices, 2 channels, 4 priorities, order dates from
+    2010-01-01 to 2017-07-28 and shipping delays of 0-50 days. Output is
+    fully determined by (rows, seed, start).
+
+    Args:
+        rows: Number of records
+        seed: Random seed
+        start: Row number of the first record; chunks generated with
+            consecutive starts have disjoint Order IDs
+        countries: Region/Country pairs to draw from (defaults to the
+            pairs in the bundled CSV)
+
+    Returns:
+        DataFrame with the raw CSV columns (dates as M/D/YYYY strings)
+    """
+    if start + rows > _ID_SPACE:
+        raise ValueError(f"At most {_ID_SPACE} rows can be generated")
+    countries = _default_countries() if countries is None else countries
+    rng = np.random.default_rng([seed, start])
+    items = np.array(list(ITEM_PRICES))
+    prices = np.array([price for price, _ in ITEM_PRICES.values()])
+    costs = np.array([cost for _, cost in ITEM_PRICES.values()])
+
+    place = rng.integers(len(countries), size=rows)
+    item = rng.integers(len(items), size=rows)
+    first = pd.Timestamp(FIRST_ORDER_DATE)
+    span = (pd.Timestamp(LAST_ORDER_DATE) - first).days - MAX_SHIP_DAYS
+    order_dates = first + pd.to_timedelta(rng.integers(span + 1, size=rows), unit='D')
+    ship_dates = order_dates + pd.to_timedelta(
+        rng.integers(MAX_SHIP_DAYS + 1, size=rows), unit='D')
+    units = rng.integers(1, MAX_UNITS + 1, size=rows)
+    revenue = np.round(units * prices[item], 2)
+    cost = np.round(units * costs[item], 2)
+    row_numbers = np.arange(start, start + rows, dtype=np.int64)
+
+    return pd.DataFrame({
+        'Region': countries['Region'].to_numpy()[place],
+        'Country': countries['Country'].to_numpy()[place],
+        'Item Type': items[item],
+        'Sales Channel': np.array(SALES_CHANNELS)[rng.integers(len(SALES_CHANNELS), size=rows)],
+        'Order Priority': np.array(ORDER_PRIORITIES)[rng.integers(len(ORDER_PRIORITIES), size=rows)],
+        'Order Date': _format_dates(order_dates),
+        'Order ID': _ID_BASE + (row_numbers * _ID_MULTIPLIER + _ID_OFFSET) % _ID_SPACE,
+        'Ship Date': _format_dates(ship_dates),
+        'Units Sold': units,
+        'Unit Price': prices[item],
+        'Unit Cost': costs[item],
+        'Total Revenue': revenue,
+        'Total Cost': cost,
+        'Total Profit': np.round(revenue - cost, 2),
+    }, columns=COLUMNS)
+
+
+def write_sales_csv(path: str, rows: int, seed: int = 0,
+                    chunk_rows: int = 1_000_000) -> str:
+    """
+    Write a synthetic sales CSV in chunks, so 10M+ rows fit in memory.
+
+    Args:
+        path: Output file path
+        rows: Number of records
+        seed: Random seed
+        chunk_rows: Records generated and written per chunk
+
+    Returns:
+        path
+    """
+    countries = _default_countries()
+    with open(path, 'w', newline='') as f:
+        for start in range(0, max(rows, 1), chunk_rows):
+            chunk = generate_sales(min(chunk_rows, rows - start), seed, start, countries)
+            chunk.to_csv(f, index=False, header=start == 0, float_format='%.2f')
+    return path
+
+
+def dataset_sizes(spec: str) -> List[int]:
+    """
+    Parse a comma-separated list of sizes such as '10k,1M,10M'.
+
+    Args:
+        spec: Sizes with optional k/M suffixes
+
+    Returns:
+        Row counts
+    """
+    multipliers = {'k': 1_000, 'm': 1_000_000}
+    sizes = []
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        suffix = part[-1].lower()
+        sizes.append(int(float(part[:-1]) * multipliers[suffix])
+                     if suffix in multipliers else int(part))
+    return sizes
@@ -0,0 +1,173 @@
+# tests/test_backends.py
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backends import get_backend
+from data_loader import DataLoader
+from expressions import col
+from sales_analytics import SalesAnalytics
+from stream_operations import StreamOperations
+from synthetic_data import generate_sales
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture(scope="module")
+def sales():
+    data = generate_sales(3000, seed=7)
+    for step in (DataLoader.clean_data, DataLoader.parse_dates, DataLoader.add_calculated_fields):
+        data = step(data)
+    return data
+
+
+def streams(data):
+    return StreamOperations(data), StreamOperations(data, backend="arrow")
+
+
+def assert_same_frame(pandas_result, arrow_result):
+    pd.testing.assert_frame_equal(pandas_result.reset_index(drop=True),
+                                  arrow_result.reset_index(drop=True), check_dtype=False)
+
+
+def test_unknown_backend_is_rejected(sales):
+    with pytest.raises(ValueError, match="Unknown backend"):
+        StreamOperations(sales, backend="spark")
+    assert get_backend("arrow").name == "arrow"
+
+
+@pytest.mark.parametrize("predicate", [
+    (col("Total Revenue") > 100000) & (col("Sales Channel") == "Online"),
+    col("Region").isin(["Asia", "Europe"]) | (col("Units Sold") < 500),
+    col("Profit Margin").between(20, 40),
+    col("Order Date") >= "2015-01-01",  # evaluated through pandas
+    lambda row: row["Units Sold"] % 7 == 0,
+])
+def test_filter_parity(sales, predicate):
+    pandas_stream, arrow_stream = streams(sales)
+
+    assert_same_frame(pandas_stream.filter(predicate).collect(),
+                      arrow_stream.filter(predicate).collect())
+
+
+def test_chained_operations_parity(sales):
+    results = [stream.filter(col("Units Sold") > 1000)
+               .sorted_by("Order ID", ascending=False)
+               .skip(10)
+               .limit(50)
+               .collect()
+               for stream in streams(sales)]
+
+    assert len(results[0]) == 50
+    assert_same_frame(*results)
+
+
+@pytest.mark.parametrize("predicate", [
+    col("x") != 5,
+    ~(col("x") == 5),
+    ~(col("x") > 4) & (col("x") != 3),
+    ~col("x").between(1, 4),
+    col("s") != "a",
+    ~(col("s") == "a"),
+    ~col("s").isin(["a"]),
+    (col("x") != 5) | (col("s") == "a"),
+])
+def test_missing_values_filter_like_pandas(predicate):
+    data = pd.DataFrame({"x": [5.0, np.nan, 3.0, 7.0],
+                         "s": ["a", None, "b", "a"]})
+    pandas_stream, arrow_stream = streams(data)
+
+    expected = pandas_stream.filter(predicate).collect()
+    assert_same_frame(expected, arrow_stream.filter(predicate).collect())
+    assert np.isnan(expected["x"]).any() or expected["s"].isna().any()
+    np.testing.assert_array_equal(pandas_stream.map(predicate).to_numpy(),
+                                  arrow_stream.map(predicate).to_numpy())
+
+
+def test_map_and_reductions_parity(sales):
+    pandas_stream, arrow_stream = streams(sales)
+    mapper = col("Total Profit") / col("Units Sold")
+
+    np.testing.assert_allclose(pandas_stream.map(mapper).to_numpy(),
+                               arrow_stream.map(mapper).to_numpy())
+    assert pandas_stream.count() == arrow_stream.count()
+    assert pandas_stream.reduce_sum("Total Revenue") == pytest.approx(
+        arrow_stream.reduce_sum("Total Revenue"))
+    assert pandas_stream.reduce_sum("Units Sold") == arrow_stream.reduce_sum("Units Sold")
+    assert pandas_stream.reduce_custom("Total Profit", max, float("-inf")) == \
+        arrow_stream.reduce_custom("Total Profit", max, float("-inf"))
+    assert sorted(pandas_stream.distinct("Country")) == sorted(arrow_stream.distinct("Country"))
+
+
+def test_matching_parity(sales):
+    pandas_stream, arrow_stream = streams(sales)
+
+    for predicate in (col("Total Revenue") < 0, col("Total Revenue") > 0,
+                      col("Units Sold") == sales["Units Sold"].iloc[-1]):
+        assert pandas_stream.any_match(predicate) == arrow_stream.any_match(predicate)
+        assert pandas_stream.all_match(predicate) == arrow_stream.all_match(predicate)
+        assert pandas_stream.none_match(predicate) == arrow_stream.none_match(predicate)
+
+    predicate = col("Units Sold") == sales["Units Sold"].iloc[-1]
+    assert pandas_stream.find_first(predicate)["Order ID"] == \
+        arrow_stream.find_first(predicate)["Order ID"]
+    assert arrow_stream.find_first(col("Total Revenue") < 0) is None
+    assert arrow_stream.find_any()["Order ID"] in set(sales["Order ID"])
+
+
+def test_arrow_stream_accepts_tables_and_keeps_backend(sales):
+    stream = StreamOperations(pa.Table.from_pandas(sales), backend="arrow")
+
+    filtered = stream.filter(col("Region") == "Asia")
+
+    assert filtered.backend == "arrow"
+    assert isinstance(filtered.data, pa.Table)
+    assert filtered.count() == (sales["Region"] == "Asia").sum()
+
+
+REPORTS = [
+    ("total_revenue_by_region", ()),
+    ("top_countries_by_revenue", (15,)),
+    ("revenue_by_item_type", ()),
+    ("sales_channel_comparison", ()),
+    ("order_priority_analysis", ()),
+    ("monthly_revenue_trend", ()),
+    ("top_profitable_items_by_region", ()),
+    ("profit_margin_by_category", ()),
+    ("yearly_comparison", ()),
+    ("high_value_orders", ()),
+    ("low_margin_items", ()),
+]
+
+
+@pytest.mark.parametrize("report, args", REPORTS)
+def test_report_parity(sales, report, args):
+    expected = getattr(SalesAnalytics(sales, cache=False), report)(*args)
+    result = getattr(SalesAnalytics(sales, cache=False, backend="arrow"), report)(*args)
+
+    if isinstance(expected, pd.Series):
+        pd.testing.assert_series_equal(expected, result, check_dtype=False)
+    else:
+        pd.testing.assert_frame_equal(expected, result, check_dtype=False)
+
+
+def test_arrow_cube_matches_pandas_after_append(sales):
+    pandas_analytics = SalesAnalytics(sales.iloc[:2000], cache=False)
+    arrow_analytics = SalesAnalytics(sales.iloc[:2000], cache=False, backend="arrow")
+    for analytics in (pandas_analytics, arrow_analytics):
+        analytics.cube
+        analytics.append(sales.iloc[2000:])
+
+    pd.testing.assert_frame_equal(pandas_analytics.cube, arrow_analytics.cube, check_dtype=False)
+
+
+def test_arrow_analytics_pickles(sales):
+    analytics = SalesAnalytics(pa.Table.from_pandas(sales), backend="arrow")
+
+    restored = pickle.loads(pickle.dumps(analytics))
+
+    assert restored.backend == "arrow"
+    pd.testing.assert_frame_equal(restored.total_revenue_by_region(),
+                                  analytics.total_revenue_by_region())
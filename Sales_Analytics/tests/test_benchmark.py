@@ -0,0 +1,29 @@
+# tests/test_benchmark.py
+from benchmark import benchmark_dataset, compare_to_baseline
+from synthetic_data import write_sales_csv
+
+
+def test_benchmark_dataset_times_every_stage(tmp_path):
+    path = write_sales_csv(str(tmp_path / "synthetic.csv"), 300)
+
+    results = benchmark_dataset(path, repeat=1, trace_memory=True)
+
+    assert "DataLoader.add_calculated_fields" in results
+    assert "StreamOperations.reduce_custom" in results
+    assert "SalesAnalytics.year_over_year" in results
+    assert {"SalesAnalytics grouped reports (cubes)",
+            "SalesAnalytics grouped reports (row groupbys)",
+            "SalesAnalytics.append (1,000 rows)"} <= set(results)
+    assert all(stats["seconds"] >= 0 and stats["peak_mb"] >= 0 for stats in results.values())
+
+
+def test_compare_to_baseline_flags_slowdowns_beyond_tolerance():
+    baseline = {"10000": {"fast": {"seconds": 0.001}, "slow": {"seconds": 1.0},
+                          "steady": {"seconds": 1.0}}}
+    results = {"10000": {"fast": {"seconds": 0.003}, "slow": {"seconds": 1.5},
+                         "steady": {"seconds": 1.1}, "new": {"seconds": 1.0}}}
+
+    comparison = compare_to_baseline(results, baseline, tolerance=0.25)
+
+    assert set(comparison["Step"]) == {"fast", "slow", "steady"}
+    assert list(comparison.loc[comparison["Regression"], "Step"]) == ["slow"]
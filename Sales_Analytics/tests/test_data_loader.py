@@ -1,7 +1,14 @@
 # tests/test_data_loader.py
+import gzip
+import json
+import multiprocessing
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
+import pytest
 
-from data_loader import DataLoader
+from data_loader import DataLoader, _concat_frames
 
 
 def test_load_data(tmp_path):
@@ -38,6 +45,30 @@ def test_clean_data_drops_nulls_and_duplicates():
     assert cleaned.iloc[0]["B"] == 2
 
 
+def test_clean_data_deduplicates_on_order_id(raw_sales_df):
+    df = pd.concat([raw_sales_df, raw_sales_df.head(2).assign(**{"Units Sold": 99})],
+                   ignore_index=True)
+
+    cleaned = DataLoader.clean_data(df)
+
+    assert cleaned["Order ID"].tolist() == [1, 2, 3, 4]
+    assert 99 not in cleaned["Units Sold"].tolist()
+    assert len(DataLoader.clean_data(df, key=None)) == len(df)
+
+
+def test_plan_columns_and_selected_calculated_fields(raw_sales_df):
+    sources, fields = DataLoader.plan_columns(["Region", "Year", "Profit Margin"])
+
+    assert sources == ["Region", "Order Date", "Total Revenue", "Total Profit"]
+    assert fields == ["Profit Margin", "Year"]
+    with pytest.raises(ValueError, match="Unknown column"):
+        DataLoader.plan_columns(["Discount"])
+
+    df = DataLoader.parse_dates(raw_sales_df[sources].copy())
+    derived = DataLoader.add_calculated_fields(df, fields=fields)
+    assert list(derived.columns) == sources + fields
+
+
 def test_parse_dates_converts_columns_to_datetime():
     df = pd.DataFrame(
         {
@@ -87,3 +118,225 @@ def test_get_info(transformed_sales_df):
     assert info["countries"] == transformed_sales_df["Country"].nunique()
     assert info["item_types"] == transformed_sales_df["Item Type"].nunique()
     assert "to" in info["date_range"]  # simple sanity check
+
+
+def test_load_data_reads_glob_in_parallel_and_transforms(tmp_path, raw_sales_df):
+    for i, (_, part) in enumerate(raw_sales_df.groupby("Region")):
+        part.to_csv(tmp_path / f"sales_{i}.csv", index=False)
+
+    loader = DataLoader(str(tmp_path / "sales_*.csv"), max_workers=2)
+    loaded = loader.load_data([DataLoader.clean_data, DataLoader.parse_dates])
+
+    assert len(loaded) == len(raw_sales_df)
+    assert list(loaded.index) == list(range(len(raw_sales_df)))
+    assert set(loaded["Region"]) == {"Europe", "Asia"}
+    assert pd.api.types.is_datetime64_any_dtype(loaded["Order Date"])
+
+
+@pytest.mark.parametrize("transformations", [
+    [DataLoader.clean_data],
+    [lambda df: df.assign(Doubled=df["Units Sold"] * 2)],  # cannot be spawned
+])
+def test_load_data_from_a_thread_never_forks(tmp_path, raw_sales_df, monkeypatch,
+                                             transformations):
+    for i, (_, part) in enumerate(raw_sales_df.groupby("Region")):
+        part.to_csv(tmp_path / f"sales_{i}.csv", index=False)
+    forked = []
+    get_context = multiprocessing.get_context
+    monkeypatch.setattr(multiprocessing, "get_context",
+                        lambda method=None: forked.append(method) or get_context(method))
+    loader = DataLoader(str(tmp_path / "sales_*.csv"), max_workers=2)
+
+    with ThreadPoolExecutor(1) as pool:
+        loaded = pool.submit(loader.load_data, transformations).result()
+
+    assert len(loaded) == len(raw_sales_df)
+    assert "fork" not in forked
+
+
+def test_load_data_accepts_list_of_files(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"part{i}.csv"
+        pd.DataFrame({"A": [i, i]}).to_csv(path, index=False)
+        paths.append(str(path))
+
+    loaded = DataLoader(paths).load_data()
+
+    assert list(loaded["A"]) == [0, 0, 1, 1, 2, 2]
+
+
+def test_deduplicates_across_files_and_chunks(tmp_path, raw_sales_df):
+    # Overlapping exports: the second file repeats two orders of the first
+    raw_sales_df.iloc[:3].to_csv(tmp_path / "export_1.csv", index=False)
+    raw_sales_df.iloc[1:].to_csv(tmp_path / "export_2.csv", index=False)
+    loader = DataLoader(str(tmp_path / "export_*.csv"), max_workers=2)
+
+    loaded = loader.load_data([DataLoader.clean_data], deduplicate=True)
+    chunks = list(loader.iter_chunks(chunksize=2, deduplicate=True))
+
+    assert loaded["Order ID"].tolist() == [1, 2, 3, 4]
+    assert pd.concat(chunks)["Order ID"].tolist() == [1, 2, 3, 4]
+
+
+def test_reads_compressed_files_and_zip_members(tmp_path, raw_sales_df):
+    csv_text = raw_sales_df.to_csv(index=False)
+    with gzip.open(tmp_path / "sales.csv.gz", "wt") as f:
+        f.write(csv_text)
+    with zipfile.ZipFile(tmp_path / "exports.zip", "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("2015/sales.csv", raw_sales_df.iloc[:2].to_csv(index=False))
+        archive.writestr("2016/sales.csv", raw_sales_df.iloc[2:].to_csv(index=False))
+        archive.writestr("README.txt", "not a csv")
+
+    gzipped = DataLoader(str(tmp_path / "sales.csv.gz")).load_data()
+    zipped = DataLoader(str(tmp_path / "exports.zip")).load_data()
+    member = DataLoader(str(tmp_path / "exports.zip::2016/sales.csv")).load_data()
+    chunks = list(DataLoader(str(tmp_path / "*.zip")).iter_chunks(chunksize=1))
+
+    pd.testing.assert_frame_equal(gzipped, raw_sales_df)
+    pd.testing.assert_frame_equal(zipped, raw_sales_df)
+    assert member["Order ID"].tolist() == [3, 4]
+    assert [len(chunk) for chunk in chunks] == [1, 1, 1, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), raw_sales_df)
+
+
+def test_reads_zstandard_files(tmp_path, raw_sales_df):
+    pytest.importorskip("zstandard")
+    raw_sales_df.to_csv(tmp_path / "sales.csv.zst", index=False)
+
+    pd.testing.assert_frame_equal(DataLoader(str(tmp_path / "sales.csv.zst")).load_data(),
+                                  raw_sales_df)
+
+
+def test_concat_unifies_categorical_dictionaries():
+    frames = [
+        pd.DataFrame({"Region": pd.Categorical(["Asia", "Europe"])}),
+        pd.DataFrame({"Region": pd.Categorical(["Africa", "Asia"])}),
+    ]
+
+    combined = _concat_frames(frames)
+
+    assert isinstance(combined["Region"].dtype, pd.CategoricalDtype)
+    assert list(combined["Region"]) == ["Asia", "Europe", "Africa", "Asia"]
+
+
+def test_build_sketches_over_chunks(tmp_path, raw_sales_df):
+    csv_path = tmp_path / "sales.csv"
+    raw_sales_df.to_csv(csv_path, index=False)
+    loader = DataLoader(str(csv_path))
+
+    sketches = loader.build_sketches(
+        chunksize=3,
+        transformations=[DataLoader.parse_dates, DataLoader.add_calculated_fields],
+    )
+
+    assert sketches["Country"].count() == 4
+    assert sketches["Item Type"].count() == 2
+    assert sketches["Processing Days"].quantile(1) == 5
+
+
+def test_profile_memory_records_load_and_each_step(tmp_path, raw_sales_df):
+    csv_path = tmp_path / "sales.csv"
+    raw_sales_df.to_csv(csv_path, index=False)
+    loader = DataLoader(str(csv_path), profile_memory=True)
+    loader.load_data()
+
+    loader.apply_transformations([DataLoader.parse_dates, DataLoader.add_calculated_fields])
+
+    assert list(loader.memory_profiles) == ["load", "parse_dates", "add_calculated_fields"]
+    profile = loader.memory_profiles["add_calculated_fields"]
+    assert "Year-Month" in profile.index
+    assert profile["Share (%)"].sum() == pytest.approx(100)
+    assert list(loader.memory_summary().index) == list(loader.memory_profiles)
+
+
+def test_optimize_dtypes_narrows_types_without_changing_values(transformed_sales_df):
+    df = transformed_sales_df.assign(
+        **{"Year-Month": transformed_sales_df["Year-Month"].astype(object),
+           "Total Revenue": transformed_sales_df["Total Revenue"] + 0.1}
+    )
+
+    optimized = DataLoader.optimize_dtypes(df)
+
+    assert optimized["Units Sold"].dtype == "int8"
+    assert optimized["Unit Price"].dtype == "float32"
+    assert optimized["Total Revenue"].dtype == "float64"
+    assert isinstance(optimized["Region"].dtype, pd.CategoricalDtype)
+    assert not isinstance(optimized["Country"].dtype, pd.CategoricalDtype)
+    assert optimized["Year-Month"].dtype == pd.PeriodDtype("M")
+    for column in df.columns:
+        assert list(optimized[column]) == list(df[column])
+
+    report = DataLoader.compare_memory(df, optimized)
+    assert report.loc["Units Sold", "After Dtype"] == "int8"
+    assert report.loc["Total", "After Bytes"] < report.loc["Total", "Before Bytes"]
+    assert report.loc["Total", "Saved (%)"] > 0
+
+
+def test_apply_transformations_trace_records_each_stage(tmp_path, raw_sales_df):
+    csv_path = tmp_path / "sales.csv"
+    pd.concat([raw_sales_df, raw_sales_df.head(1)]).to_csv(csv_path, index=False)
+    loader = DataLoader(str(csv_path))
+    loader.load_data()
+    received = []
+
+    loader.apply_transformations(
+        [DataLoader.clean_data, DataLoader.parse_dates, DataLoader.add_calculated_fields],
+        trace=received.append,
+    )
+
+    assert received == loader.stage_trace
+    assert [r["stage"] for r in received] == ["clean_data", "parse_dates", "add_calculated_fields"]
+    assert (received[0]["rows_in"], received[0]["rows_out"]) == (5, 4)
+    assert received[2]["memory_delta_bytes"] > 0
+    assert all(r["wall_seconds"] >= 0 and r["cpu_seconds"] >= 0 for r in received)
+
+    summary = loader.trace_summary()
+    assert summary["wall_share (%)"].sum() == pytest.approx(100)
+    exported = json.loads(loader.export_trace(str(tmp_path / "trace.json")))
+    assert exported["stages"] == json.loads((tmp_path / "trace.json").read_text())["stages"]
+    assert [s["position"] for s in exported["stages"]] == [0, 1, 2]
+
+
+def test_untraced_apply_transformations_records_nothing(transformed_sales_df):
+    loader = DataLoader("unused.csv")
+    loader.data = transformed_sales_df
+
+    loader.apply_transformations([lambda df: df])
+
+    assert loader.stage_trace == []
+
+
+def test_fused_transformations_match_unfused(raw_sales_df):
+    raw = pd.concat([raw_sales_df, raw_sales_df.head(2)], ignore_index=True)
+    raw.loc[1, "Country"] = None
+    raw.loc[2, "Units Sold"] = 0
+    raw.loc[len(raw)] = raw.loc[3].copy()
+    raw.loc[len(raw) - 1, "Units Sold"] = 7  # same Order ID, different row
+    steps = [DataLoader.clean_data, DataLoader.parse_dates, DataLoader.add_calculated_fields]
+    loader = DataLoader("unused.csv")
+
+    loader.data = raw.copy()
+    expected = loader.apply_transformations(steps)
+    loader.data = raw.copy()
+    fused = loader.apply_transformations(steps, fused=True, trace=True)
+
+    pd.testing.assert_frame_equal(fused, expected)
+    pd.testing.assert_frame_equal(loader.data, raw)
+    assert [r["stage"] for r in loader.stage_trace] == [
+        "clean_data+parse_dates+add_calculated_fields"
+    ]
+
+
+def test_fused_plan_keeps_custom_steps_and_order():
+    def custom(df):
+        return df
+
+    plan = DataLoader._plan_fused([
+        DataLoader.parse_dates, DataLoader.clean_data, custom,
+        DataLoader.parse_dates, DataLoader.add_calculated_fields,
+    ])
+
+    assert [step.__name__ for step in plan] == [
+        "parse_dates", "clean_data", "custom", "parse_dates+add_calculated_fields"
+    ]
@@ -0,0 +1,87 @@
+# tests/test_deduplication.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from deduplication import Deduplicator
+
+
+def orders(ids, **columns):
+    return pd.DataFrame({"Order ID": ids, "Units Sold": np.arange(len(ids)), **columns})
+
+
+@pytest.mark.parametrize("expected_keys", [None, 1_000])
+def test_drops_keys_seen_in_earlier_chunks_and_keeps_first(expected_keys):
+    deduplicator = Deduplicator(expected_keys=expected_keys)
+
+    first = deduplicator.filter(orders([1, 2, 2, 3]))
+    second = deduplicator.filter(orders([3, 4, 1, 5]))
+
+    assert first["Order ID"].tolist() == [1, 2, 3]
+    assert first["Units Sold"].tolist() == [0, 1, 3]
+    assert second["Order ID"].tolist() == [4, 5]
+    assert len(deduplicator) == 5
+    assert (deduplicator.rows_seen, deduplicator.rows_dropped) == (8, 3)
+
+
+def test_matches_drop_duplicates_over_many_chunks():
+    ids = np.random.default_rng(0).integers(0, 20_000, size=50_000)
+    data = orders(ids)
+    deduplicator = Deduplicator()
+
+    result = pd.concat(deduplicator.filter(data.iloc[start:start + 1_337])
+                       for start in range(0, len(data), 1_337))
+
+    pd.testing.assert_frame_equal(result, data.drop_duplicates(subset=["Order ID"]))
+    assert deduplicator.memory_bytes == 8 * len(deduplicator)
+
+
+def test_memory_bytes_counts_bloom_filter():
+    deduplicator = Deduplicator(expected_keys=10_000)
+    deduplicator.filter(orders(np.arange(500)))
+
+    assert deduplicator.memory_bytes == 8 * 500 + deduplicator.bloom.words.nbytes
+    assert deduplicator.bloom.words.nbytes > 0
+
+
+def test_composite_and_non_integer_keys():
+    deduplicator = Deduplicator(key=["Country", "Order ID"])
+    data = orders([1, 1, 2], Country=["France", "Spain", "France"])
+
+    assert len(deduplicator.filter(data)) == 3
+    assert len(deduplicator.filter(data)) == 0
+
+    by_name = Deduplicator(key="Country")
+    assert by_name.filter(data)["Country"].tolist() == ["France", "Spain"]
+
+
+def test_float_ids_match_integer_ids():
+    deduplicator = Deduplicator()
+    deduplicator.filter(orders([1, 2]))
+
+    assert deduplicator.filter(orders([2.0, 3.0]))["Order ID"].tolist() == [3.0]
+
+
+def test_float_ids_with_missing_values_match_integer_ids():
+    deduplicator = Deduplicator()
+    deduplicator.filter(orders([5]))
+
+    result = deduplicator.filter(orders([5.0, np.nan, 6.0]))
+
+    assert result["Units Sold"].tolist() == [1, 2]
+    assert deduplicator.filter(orders([6]))["Order ID"].tolist() == []
+
+
+@pytest.mark.parametrize("ids", [[1.0, np.nan, np.nan, 2.0], ["a", None, None, "b"]])
+def test_records_with_missing_keys_are_always_kept(ids):
+    deduplicator = Deduplicator()
+
+    assert deduplicator.filter(orders(ids))["Units Sold"].tolist() == [0, 1, 2, 3]
+    assert deduplicator.filter(orders(ids))["Units Sold"].tolist() == [1, 2]
+    assert len(deduplicator) == 2
+    assert (deduplicator.rows_seen, deduplicator.rows_dropped) == (8, 2)
+
+
+def test_missing_key_column_raises():
+    with pytest.raises(KeyError):
+        Deduplicator().filter(pd.DataFrame({"A": [1]}))
@@ -0,0 +1,82 @@
+# tests/test_expressions.py
+import json
+
+import pandas as pd
+import pytest
+
+from expressions import Expression, col, lit
+
+
+def sample_df():
+    return pd.DataFrame(
+        {
+            "value": [10, 20, 30, 40],
+            "cost": [5, 25, 10, 50],
+            "category": ["A", "A", "B", "B"],
+        }
+    )
+
+
+def test_comparison_builds_boolean_mask():
+    df = sample_df()
+
+    mask = (col("value") > 15).evaluate(df)
+
+    assert list(mask) == [False, True, True, True]
+
+
+def test_combined_predicates_and_arithmetic():
+    df = sample_df()
+
+    expr = ((col("value") - col("cost")) > 0) & (col("category") == "B") | (col("value") == 10)
+
+    assert list(expr.evaluate(df)) == [True, False, True, False]
+    assert list((col("value") * 2 + 1).evaluate(df)) == [21, 41, 61, 81]
+    assert list((~col("category").isin(["A"])).evaluate(df)) == [False, False, True, True]
+    assert list(col("value").between(20, 30).evaluate(df)) == [False, True, True, False]
+
+
+def test_expression_called_on_row_matches_vectorized_result():
+    df = sample_df()
+    expr = (col("value") > 15) & col("category").isin(["A"])
+
+    row_results = [expr(row) for _, row in df.iterrows()]
+
+    assert row_results == list(expr.evaluate(df))
+
+
+def test_literal_is_broadcast_and_columns_are_reported():
+    df = sample_df()
+
+    assert list(lit(True).evaluate(df)) == [True] * 4
+    assert ((col("value") > 1) & (col("cost") < 2)).columns() == {"value", "cost"}
+
+
+def test_python_boolean_operators_are_rejected():
+    with pytest.raises(TypeError):
+        (col("value") > 1) and (col("cost") > 1)
+
+
+def test_expression_round_trips_through_dict():
+    expr = ((col("Total Revenue") > 100) & col("Region").isin(["Asia", "Europe"])) | \
+        ~col("Units Sold").between(1, 5)
+
+    rebuilt = Expression.from_dict(json.loads(json.dumps(expr.to_dict())))
+
+    assert repr(rebuilt) == repr(expr)
+    assert repr(Expression.from_dict({"op": "gt", "args": [{"col": "x"}, 1]})) == "(col('x') > 1)"
+    with pytest.raises(ValueError):
+        Expression.from_dict({"op": "system", "args": [1]})
+
+
+@pytest.mark.parametrize("spec", [
+    {"op": "gt", "args": [{"col": "x"}]},
+    {"op": "gt", "args": [{"col": "x"}, 1, 2]},
+    {"op": "neg", "args": [{"col": "x"}, 1]},
+    {"op": "between", "args": [{"col": "x"}, 1]},
+    {"op": "isin", "args": [{"col": "x"}]},
+    {"op": "and", "args": {"col": "x"}},
+])
+def test_from_dict_rejects_wrong_operand_counts(spec):
+    with pytest.raises(ValueError, match="argument"):
+        Expression.from_dict(spec)
@@ -0,0 +1,97 @@
+# tests/test_external_sort.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from external_sort import ExternalSort
+from partitioned_dataset import PartitionedDataset
+from stream_operations import StreamOperations
+from synthetic_data import generate_sales
+
+
+@pytest.fixture(scope="module")
+def sales():
+    data = generate_sales(3000, seed=5)
+    data["Units Sold"] = data["Units Sold"] % 40  # plenty of ties
+    data.loc[data.index[::97], "Units Sold"] = np.nan
+    return data
+
+
+def chunks(data, size=700):
+    return (data.iloc[start:start + size] for start in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("key", ["Units Sold", "Country", "Total Revenue"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_matches_stable_in_memory_sort(sales, key, ascending):
+    expected = sales.sort_values(key, ascending=ascending, kind="stable")
+
+    # 6 runs of 500 rows with max_runs=4 need an intermediate merge pass
+    with ExternalSort(chunks(sales), key, ascending, run_rows=500, max_runs=4) as external:
+        pd.testing.assert_frame_equal(external.read(), expected)
+        pd.testing.assert_frame_equal(external.slice(1234).slice(0, 100).read(),
+                                      expected.iloc[1234:1334])
+        assert len(external.slice(2990, 3100)) == 10
+
+
+def test_spilled_runs_are_removed(sales, tmp_path):
+    external = ExternalSort(chunks(sales), "Units Sold", run_rows=1000, spill_dir=str(tmp_path))
+    assert any(tmp_path.iterdir())
+
+    external.close()
+
+    assert not any(tmp_path.iterdir())
+
+
+def test_out_of_core_stream_stays_lazy_through_skip_and_limit(sales, tmp_path):
+    expected = sales.sort_values("Total Revenue", ascending=False, kind="stable")
+
+    ranked = StreamOperations(sales).sorted_by("Total Revenue", ascending=False, run_rows=400)
+    page = ranked.skip(100).limit(25)
+
+    assert page.count() == 25 and page._data is None
+    pd.testing.assert_frame_equal(page.collect(), expected.iloc[100:125])
+    assert sum(len(batch) for batch in ranked.iter_batches()) == len(sales)
+
+    path = tmp_path / "ranked.csv"
+    assert ranked.to_csv(str(path)) == len(sales)
+    exported = pd.read_csv(path)
+    assert list(exported["Order ID"]) == list(expected["Order ID"])
+
+
+def test_out_of_core_sort_reads_dataset_partitions_one_at_a_time(sales, tmp_path):
+    dataset = PartitionedDataset.write(sales.assign(Year=2015), str(tmp_path / "ds"),
+                                       partition_cols=["Region"])
+
+    stream = StreamOperations(dataset).sorted_by("Order ID", run_rows=1000)
+
+    assert list(stream.limit(50).collect()["Order ID"]) == sorted(sales["Order ID"])[:50]
+
+
+def test_searches_and_distinct_never_materialize_the_sort(sales, monkeypatch):
+    expected = sales.sort_values("Units Sold", kind="stable")
+    ranked = StreamOperations(sales).sorted_by("Units Sold", run_rows=400)
+    read = ExternalSort.read
+    reads = []
+    monkeypatch.setattr(ExternalSort, "read",
+                        lambda self, *args: reads.append(len(self)) or read(self, *args))
+
+    assert ranked.find_first()["Order ID"] == expected["Order ID"].iloc[0]
+    assert ranked.find_any()["Order ID"] == expected["Order ID"].iloc[0]
+    first_big = ranked.find_first(lambda row: row["Total Revenue"] > 1_000_000)
+    assert first_big["Order ID"] == \
+        expected.loc[expected["Total Revenue"] > 1_000_000, "Order ID"].iloc[0]
+    assert ranked.any_match(lambda row: row["Units Sold"] == 39)
+    assert ranked.distinct("Region") == list(expected["Region"].unique())
+    pd.testing.assert_frame_equal(pd.DataFrame(ranked.distinct()),
+                                  pd.DataFrame(expected.drop_duplicates().values.tolist()))
+    assert ranked._data is None
+    assert set(reads) == {1}  # find_first and find_any read a one-record slice
+
+
+def test_sorting_no_records_out_of_core_keeps_the_columns(sales):
+    empty = StreamOperations(sales.iloc[:0]).sorted_by("Units Sold", run_rows=10)
+
+    pd.testing.assert_frame_equal(empty.collect(), sales.iloc[:0])
+    assert empty.find_first() is None and empty.find_any() is None
+    assert empty.distinct("Region") == []
@@ -0,0 +1,48 @@
+# tests/test_indexes.py
+import pandas as pd
+
+from expressions import col
+from indexes import HashIndex, SortedIndex, TableIndexes
+from stream_operations import StreamOperations
+
+
+def test_hash_index_lookup():
+    index = HashIndex(pd.Series([30, 10, 20, 10]))
+
+    assert list(index.lookup([10])) == [1, 3]
+    assert list(index.lookup([20, 99])) == [2]
+
+
+def test_sorted_index_range_bounds():
+    index = SortedIndex(pd.Series([5, 1, None, 3, 4]))
+
+    assert list(index.range(3, 5)) == [0, 3, 4]
+    assert list(index.range(low=3, low_inclusive=False)) == [0, 4]
+    assert list(index.range(high=3, high_inclusive=False)) == [1]
+
+
+def test_candidates_for_compound_predicates(transformed_sales_df):
+    indexes = TableIndexes(transformed_sales_df)
+
+    assert list(indexes.candidates(col("Order ID") == 3)) == [2]
+    assert list(indexes.candidates(col("Order Date") >= "2016-01-01")) == [2, 3]
+    both = (col("Order Date") >= "2016-01-01") & (col("Region") == "Asia")
+    assert list(indexes.candidates(both)) == [2, 3]
+    assert indexes.candidates((col("Order ID") == 1) | (col("Region") == "Asia")) is None
+
+
+def test_indexed_filters_match_full_scan(transformed_sales_df):
+    indexes = TableIndexes(transformed_sales_df)
+    indexed = StreamOperations(transformed_sales_df, indexes=indexes)
+    scanned = StreamOperations(transformed_sales_df)
+
+    for predicate in [
+        col("Order ID") == 2,
+        col("Order ID").isin([1, 4, 99]),
+        col("Order Date").between("2015-01-05", "2016-02-10"),
+        (col("Ship Date") < "2016-02-25") & (col("Units Sold") > 5),
+        (col("Order ID") == 1) | (col("Order Date") > "2016-02-01"),
+    ]:
+        pd.testing.assert_frame_equal(
+            indexed.filter(predicate).collect(), scanned.filter(predicate).collect()
+        )
@@ -0,0 +1,32 @@
+# tests/test_main.py
+import pandas as pd
+import pytest
+
+from data_loader import DataLoader
+from main import load_report_data
+from sales_analytics import SalesAnalytics
+from synthetic_data import generate_sales
+
+
+@pytest.mark.parametrize("report", ["total_revenue_by_region", "yearly_comparison"])
+def test_report_runs_keep_the_records_of_a_full_load(tmp_path, report):
+    data = generate_sales(500, seed=11)
+    # Nulls in columns the report never reads, and an order repeated in a later file
+    data.loc[data.index[::7], "Unit Cost"] = None
+    data.loc[data.index[3::11], "Country"] = None
+    first, second = data.iloc[:300], pd.concat([data.iloc[300:], data.iloc[[5, 10]]])
+    first.to_csv(tmp_path / "a.csv", index=False)
+    second.to_csv(tmp_path / "b.csv", index=False)
+    pattern = str(tmp_path / "*.csv")
+
+    loader = DataLoader(pattern)
+    loader.load_data()
+    full = loader.apply_transformations(
+        [DataLoader.clean_data, DataLoader.parse_dates, DataLoader.add_calculated_fields])
+    projected, sources, _ = load_report_data(pattern, [report], {"Year": [2014, 2015, 2016]})
+
+    assert "Unit Cost" not in sources and "Country" not in sources
+    in_scope = full[full["Year"].isin([2014, 2015, 2016])].reset_index(drop=True)
+    assert len(projected) == len(in_scope) < len(data)
+    pd.testing.assert_frame_equal(getattr(SalesAnalytics(projected), report)(),
+                                  getattr(SalesAnalytics(in_scope), report)())
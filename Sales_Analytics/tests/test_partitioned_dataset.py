@@ -0,0 +1,87 @@
+# tests/test_partitioned_dataset.py
+import os
+
+import pandas as pd
+
+from data_loader import DataLoader
+from expressions import col
+from partitioned_dataset import PartitionedDataset
+from sales_analytics import SalesAnalytics
+from stream_operations import StreamOperations
+
+
+def write_dataset(transformed_sales_df, root):
+    return PartitionedDataset.write(transformed_sales_df, str(root))
+
+
+def test_write_creates_hive_directories(transformed_sales_df, tmp_path):
+    dataset = write_dataset(transformed_sales_df, tmp_path)
+
+    assert dataset.partition_cols == ["Year", "Region"]
+    assert os.path.exists(tmp_path / "Year=2015" / "Region=Europe" / "part-0.csv")
+    assert len(dataset.partitions) == 2
+    assert set(dataset.partitions["Year"]) == {2015, 2016}
+
+
+def test_prune_uses_only_partition_columns(transformed_sales_df, tmp_path):
+    dataset = write_dataset(transformed_sales_df, tmp_path)
+
+    assert len(dataset.prune(col("Year") == 2015)) == 1
+    assert len(dataset.prune((col("Region") == "Asia") & (col("Total Revenue") > 0))) == 1
+    assert len(dataset.prune((col("Region") == "Asia") | (col("Total Revenue") > 0))) == 2
+    assert len(dataset.prune(col("Year") > 2020)) == 0
+
+
+def test_loader_reads_only_matching_partitions(transformed_sales_df, tmp_path):
+    write_dataset(transformed_sales_df, tmp_path)
+
+    loader = DataLoader(str(tmp_path))
+    data = loader.load_data(
+        [DataLoader.parse_dates],
+        partition_filter=(col("Year") == 2016) & (col("Units Sold") > 10),
+    )
+
+    assert list(data["Order ID"]) == [4]
+    assert pd.api.types.is_datetime64_any_dtype(data["Order Date"])
+
+
+def test_stream_filter_prunes_lazy_dataset(transformed_sales_df, tmp_path):
+    dataset = write_dataset(transformed_sales_df, tmp_path)
+    stream = StreamOperations(dataset)
+
+    europe = stream.filter(col("Region") == "Europe")
+
+    assert stream._data is None  # the full dataset was never read
+    assert set(europe.collect()["Order ID"]) == {1, 2}
+    assert stream.count() == len(transformed_sales_df)
+
+
+def test_analytics_from_scoped_dataset(transformed_sales_df, tmp_path):
+    dataset = write_dataset(transformed_sales_df, tmp_path)
+
+    analytics = SalesAnalytics.from_dataset(
+        dataset,
+        scope=col("Region") == "Asia",
+        transformations=[DataLoader.parse_dates, DataLoader.add_calculated_fields],
+    )
+
+    result = analytics.total_revenue_by_region()
+    assert list(result["Region"]) == ["Asia"]
+    assert result["Orders"].iloc[0] == 2
+
+
+def test_partition_values_round_trip_with_their_types(tmp_path):
+    data = pd.DataFrame({
+        "Code": ["007", "nan", "inf", "1", "A", "007"],
+        "Share": [0.5, 1.0, 0.5, 2.5, 1.0, 0.5],
+        "Year": [2015, 2016, 2015, 2016, 2015, 2015],
+        "Units Sold": range(6),
+    })
+
+    dataset = PartitionedDataset.write(data, str(tmp_path), partition_cols=["Code", "Share", "Year"])
+    result = dataset.read().sort_values("Units Sold").reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(result[data.columns], data, check_dtype=False)
+    assert result["Code"].tolist() == data["Code"].tolist()
+    assert result["Share"].dtype.kind == "f" and result["Year"].dtype.kind == "i"
+    assert len(dataset.prune(col("Code") == "007")) == 1
@@ -0,0 +1,68 @@
+# tests/test_report_cache.py
+import pandas as pd
+
+from report_cache import MISSING, ReportCache, cached_report
+from expressions import col
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = ReportCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is MISSING
+    assert cache.get("c") == 3
+
+
+def test_memory_bound_evicts_entries():
+    frame = pd.DataFrame({"x": range(1000)})
+    size = int(frame.memory_usage(deep=True).sum())
+    cache = ReportCache(max_bytes=int(size * 2.5))
+
+    for key in "abcd":
+        cache.put(key, frame)
+
+    assert len(cache) == 2
+
+
+def test_results_persist_across_cache_instances(tmp_path):
+    frame = pd.DataFrame({"x": [1, 2, 3]})
+    ReportCache(cache_dir=str(tmp_path)).put("report", frame)
+
+    reloaded = ReportCache(cache_dir=str(tmp_path)).get("report")
+
+    pd.testing.assert_frame_equal(reloaded, frame)
+
+
+class Counter:
+    def __init__(self):
+        self.cache = ReportCache()
+        self.calls = 0
+
+    def data_version(self, persistent=False):
+        return "v1"
+
+    @cached_report
+    def report(self, n=10, where=None):
+        self.calls += 1
+        return pd.DataFrame({"n": [n]})
+
+
+def test_cached_report_normalizes_arguments_and_skips_lambdas():
+    counter = Counter()
+
+    counter.report()
+    counter.report(10)
+    counter.report(n=10)
+    assert counter.calls == 1
+
+    counter.report(where=col("x") > 1)
+    counter.report(where=col("x") > 1)
+    assert counter.calls == 2
+
+    counter.report(where=lambda row: True)
+    counter.report(where=lambda row: True)
+    assert counter.calls == 4
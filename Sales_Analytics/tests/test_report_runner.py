@@ -0,0 +1,132 @@
+# tests/test_report_runner.py
+import pickle
+
+import pandas as pd
+import pytest
+
+from report_runner import ReportRequest, ReportRunner
+from sales_analytics import SalesAnalytics
+
+
+def requests():
+    return [
+        ReportRequest("total_revenue_by_region"),
+        ReportRequest("top_countries_by_revenue", 2),
+        ReportRequest("monthly_revenue_trend"),
+        ReportRequest("custom_aggregation", ["Region"], {"Total Revenue": "sum"}),
+    ]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_runner_matches_sequential_reports(transformed_sales_df, executor):
+    analytics = SalesAnalytics(transformed_sales_df)
+    expected = {r.name: getattr(SalesAnalytics(transformed_sales_df, cache=False), r.method)(
+        *r.args, **r.kwargs) for r in requests()}
+
+    results = ReportRunner(analytics, max_workers=2, executor=executor).run_all(requests())
+
+    assert list(results) == list(expected)
+    for name, frame in expected.items():
+        pd.testing.assert_frame_equal(results[name], frame)
+
+
+def test_identical_requests_run_once(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df, cache=False)
+    calls = []
+    report = analytics.top_countries_by_revenue
+    analytics.top_countries_by_revenue = lambda *a, **k: calls.append(1) or report(*a, **k)
+
+    results = list(ReportRunner(analytics).run([
+        ReportRequest("top_countries_by_revenue"),
+        ReportRequest("top_countries_by_revenue", n=10, name="top 10"),
+        ReportRequest("top_countries_by_revenue", 3),
+    ]))
+
+    assert len(calls) == 2
+    assert len(results) == 3
+    assert {r.request.name for r in results} == {
+        "top_countries_by_revenue()", "top 10", "top_countries_by_revenue(3)"}
+
+
+def test_failing_report_does_not_stop_others(transformed_sales_df):
+    runner = ReportRunner(SalesAnalytics(transformed_sales_df))
+    batch = [ReportRequest("custom_aggregation", ["Missing"], {"Total Revenue": "sum"}),
+             ReportRequest("total_revenue_by_region")]
+
+    results = {r.request.name: r for r in runner.run(batch)}
+
+    assert not results[batch[0].name].ok
+    assert results[batch[1].name].ok
+    with pytest.raises(KeyError):
+        runner.run_all(batch)
+
+
+def test_bad_arguments_fail_only_their_report(transformed_sales_df):
+    runner = ReportRunner(SalesAnalytics(transformed_sales_df))
+    batch = [ReportRequest("top_countries_by_revenue", bogus=1),
+             ReportRequest("total_revenue_by_region", 1, 2),
+             ReportRequest("top_countries_by_revenue", 2)]
+
+    results = {r.request.name: r for r in runner.run(batch)}
+
+    assert [isinstance(results[r.name].error, TypeError) for r in batch] == [True, True, False]
+    assert len(results[batch[2].name].result) == 2
+    with pytest.raises(TypeError):
+        runner.run_all(batch)
+
+
+def test_only_cubes_shared_by_the_requested_reports_are_built(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df)
+    runner = ReportRunner(analytics)
+
+    runner.run_all([ReportRequest("approx_distinct", "Region"),
+                    ReportRequest("high_value_orders"),
+                    ReportRequest("top_countries_by_revenue")])
+    assert analytics._cubes == {}
+
+    runner.run_all([ReportRequest("total_revenue_by_region"),
+                    ReportRequest("yearly_comparison")])
+    assert list(analytics._cubes) == [tuple(SalesAnalytics.cube_dimensions[0])]
+
+
+def test_unknown_report_is_rejected(transformed_sales_df):
+    runner = ReportRunner(SalesAnalytics(transformed_sales_df))
+
+    with pytest.raises(AttributeError):
+        list(runner.run([ReportRequest("_build_cube")]))
+
+
+@pytest.mark.parametrize("method", ["append", "invalidate", "from_dataset", "data_version"])
+def test_state_changing_methods_are_not_reports(transformed_sales_df, method):
+    analytics = SalesAnalytics(transformed_sales_df)
+    runner = ReportRunner(analytics)
+
+    with pytest.raises(AttributeError):
+        list(runner.run([ReportRequest(method, transformed_sales_df)]))
+    assert len(analytics.data) == len(transformed_sales_df)
+
+
+def test_run_all_rejects_duplicate_names(transformed_sales_df):
+    runner = ReportRunner(SalesAnalytics(transformed_sales_df))
+    requests = [ReportRequest("top_countries_by_revenue", 2, name="top"),
+                ReportRequest("top_countries_by_revenue", 3, name="top")]
+
+    with pytest.raises(ValueError, match="top"):
+        runner.run_all(requests)
+
+    results = runner.run_all([ReportRequest("approx_distinct", "Region", name="regions"),
+                              ReportRequest("custom_aggregation", ["Region"],
+                                            {"Units Sold": "sum"}, name="units")])
+    assert results["regions"] == transformed_sales_df["Region"].nunique()
+
+
+def test_analytics_pickles_with_cube_and_without_cache(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df)
+    analytics.cube
+
+    restored = pickle.loads(pickle.dumps(analytics))
+
+    assert restored.cache is None
+    pd.testing.assert_frame_equal(restored.cube, analytics.cube)
+    pd.testing.assert_frame_equal(restored.total_revenue_by_region(),
+                                  analytics.total_revenue_by_region())
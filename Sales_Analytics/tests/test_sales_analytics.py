@@ -1,8 +1,13 @@
 # tests/test_sales_analytics.py
+from functools import partial
+
 import pandas as pd
+import pytest
 
-from sales_analytics import SalesAnalytics
+from sales_analytics import REPORT_COLUMNS, SalesAnalytics, required_columns
 from data_loader import DataLoader
+from report_cache import ReportCache
+from synthetic_data import generate_sales
 
 
 def test_total_revenue_by_region(transformed_sales_df):
@@ -171,3 +176,263 @@ def test_custom_aggregation(transformed_sales_df):
 
     assert (merged["Total Revenue"] == merged["Total Revenue_expected"]).all()
     assert (merged["Total Profit"] == merged["Total Profit_expected"]).all()
+
+
+def test_reports_roll_up_from_single_cube(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df)
+
+    analytics.total_revenue_by_region()
+    cube = analytics.cube
+    analytics.revenue_by_item_type()
+    analytics.yearly_comparison()
+
+    # The cube is built once and shared by every report
+    assert analytics.cube is cube
+    assert cube[("Order ID", "count")].sum() == len(transformed_sales_df)
+
+
+GROUPED_REPORTS = [
+    "total_revenue_by_region", "top_countries_by_revenue", "revenue_by_item_type",
+    "sales_channel_comparison", "order_priority_analysis", "monthly_revenue_trend",
+    "top_profitable_items_by_region", "profit_margin_by_category", "yearly_comparison",
+    "rolling_window", "cumulative_totals", "period_over_period", "year_over_year",
+]
+
+
+def test_cubes_stay_coarse_and_are_built_once_reports_share_them():
+    data = generate_sales(20_000, seed=3)
+    data = DataLoader.add_calculated_fields(DataLoader.parse_dates(data))
+    analytics = SalesAnalytics(data, cache=False)
+    rows = SalesAnalytics(data, cache=False)
+    rows.cube_dimensions = []
+
+    # A single report groups the rows; the second report needing a cube builds it
+    analytics.total_revenue_by_region()
+    assert analytics._cubes == {}
+    for report in GROUPED_REPORTS:
+        pd.testing.assert_frame_equal(getattr(analytics, report)(), getattr(rows, report)())
+
+    assert set(analytics._cubes) == {tuple(dims) for dims in SalesAnalytics.cube_dimensions}
+    assert sum(len(cube) for (_, cube), in analytics._cubes.values()) < len(data) / 4
+    assert rows._cubes == {}
+
+    # Ahead of time, cubes are only built for groupings several reports share
+    ahead = SalesAnalytics(data, cache=False)
+    ahead.build_cubes(["total_revenue_by_region", "top_countries_by_revenue",
+                       "monthly_revenue_trend", "rolling_window"])
+    assert ahead._cubes == {}
+    ahead.build_cubes(["total_revenue_by_region", "yearly_comparison"])
+    assert list(ahead._cubes) == [tuple(SalesAnalytics.cube_dimensions[0])]
+
+
+def test_cube_rollup_matches_direct_groupby(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df)
+    agg = {
+        "Total Revenue": ["sum", "mean", "max", "min"],
+        "Processing Days": "mean",
+        "Order ID": "count",
+    }
+
+    analytics.cube
+    rolled = analytics._rollup(["Region", "Sales Channel"], agg)
+    expected = transformed_sales_df.groupby(["Region", "Sales Channel"]).agg(agg)
+
+    pd.testing.assert_frame_equal(rolled, expected)
+
+
+def test_append_matches_full_recompute(transformed_sales_df):
+    first, second = transformed_sales_df.iloc[:2], transformed_sales_df.iloc[2:]
+    # A repeat order hits existing cube cells, the second half adds new ones
+    repeat = first.iloc[[0]].assign(**{"Order ID": 5, "Total Revenue": 75.0})
+    full = pd.concat([first, second, repeat])
+
+    incremental = SalesAnalytics(first)
+    incremental.cube  # materialize the cube before appending
+    incremental.append(second)
+    incremental.append(repeat)
+    recomputed = SalesAnalytics(full)
+
+    for report in [
+        "total_revenue_by_region",
+        "top_countries_by_revenue",
+        "revenue_by_item_type",
+        "sales_channel_comparison",
+        "order_priority_analysis",
+        "monthly_revenue_trend",
+        "top_profitable_items_by_region",
+        "profit_margin_by_category",
+        "yearly_comparison",
+        "high_value_orders",
+        "low_margin_items",
+    ]:
+        pd.testing.assert_frame_equal(
+            getattr(incremental, report)(), getattr(recomputed, report)()
+        )
+    assert len(incremental.data) == len(full)
+
+
+def test_append_leaves_the_cube_readers_hold_unchanged(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df)
+    cube = analytics.cube
+    snapshot = cube.copy()
+
+    # Every row repeats an existing cell, so the merge only combines cells
+    analytics.append(transformed_sales_df.assign(**{"Total Revenue": 1.0}))
+
+    pd.testing.assert_frame_equal(cube, snapshot)
+    assert analytics.cube is not cube
+    assert analytics.cube[("Order ID", "count")].sum() == 2 * len(transformed_sales_df)
+
+
+def test_appends_never_touch_the_base_cube():
+    data = generate_sales(6_000, seed=5)
+    data = DataLoader.add_calculated_fields(DataLoader.parse_dates(data))
+    analytics = SalesAnalytics(data.iloc[:4_000], cache=False)
+    base = analytics.cube
+    grain = tuple(SalesAnalytics.cube_dimensions[0])
+
+    for start in range(4_000, 6_000, 100):
+        analytics.append(data.iloc[start:start + 100])
+        tiers = analytics._cubes[grain]
+        assert tiers[0][1] is base
+        assert [rows for rows, _ in tiers] == sorted((rows for rows, _ in tiers), reverse=True)
+    assert sum(rows for rows, _ in tiers) == len(data)
+    assert len(tiers) <= 6
+
+    # Reading the cube folds the tiers into one
+    pd.testing.assert_frame_equal(analytics.cube.sort_index(),
+                                  SalesAnalytics(data).cube.sort_index())
+    assert len(analytics._cubes[grain]) == 1
+
+
+def test_repeated_reports_are_served_from_cache(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df)
+
+    first = analytics.top_countries_by_revenue(2)
+    first["Total Revenue"] = 0  # callers get copies
+    second = analytics.top_countries_by_revenue(n=2)
+
+    assert analytics.cache.hits == 1
+    assert (second["Total Revenue"] > 0).all()
+
+
+def test_append_and_assignment_invalidate_cache(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df.iloc[:2])
+    before = analytics.total_revenue_by_region()
+
+    analytics.append(transformed_sales_df.iloc[2:])
+    after_append = analytics.total_revenue_by_region()
+    analytics.data = transformed_sales_df.iloc[:1]
+    after_assign = analytics.total_revenue_by_region()
+
+    assert after_append["Orders"].sum() == len(transformed_sales_df)
+    assert before["Orders"].sum() == 2
+    assert after_assign["Orders"].sum() == 1
+    assert analytics.cache.hits == 0
+
+
+def test_changed_data_is_never_served_stale(transformed_sales_df, tmp_path):
+    analytics = SalesAnalytics(transformed_sales_df, cache=ReportCache(cache_dir=str(tmp_path)))
+    before = analytics.total_revenue_by_region()["Total Revenue"].sum()
+
+    changed = analytics.data
+    changed["Total Revenue"] *= 2  # does not reach the analytics' snapshot
+    assert analytics.total_revenue_by_region()["Total Revenue"].sum() == before
+
+    analytics.data = changed
+    assert analytics.total_revenue_by_region()["Total Revenue"].sum() == pytest.approx(2 * before)
+
+    # An in-place change to the snapshot itself (possible without
+    # copy-on-write) is picked up once invalidate() is called
+    snapshot = analytics._chunks[0]
+    snapshot["Total Revenue"] = snapshot["Total Revenue"] * 2
+    analytics.approx_distinct("Region")
+    analytics.invalidate()
+    assert analytics.total_revenue_by_region()["Total Revenue"].sum() == pytest.approx(4 * before)
+    assert analytics._sketches == {}
+
+
+def test_persistent_cache_keyed_by_content(transformed_sales_df, tmp_path):
+    cache_dir = str(tmp_path)
+    SalesAnalytics(transformed_sales_df, cache=ReportCache(cache_dir=cache_dir)).yearly_comparison()
+
+    other = SalesAnalytics(transformed_sales_df.copy(), cache=ReportCache(cache_dir=cache_dir))
+    other.yearly_comparison()
+
+    assert other.cache.hits == 1
+
+
+def test_approximate_distinct_and_quantiles_track_appends(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df.iloc[:2])
+
+    assert analytics.approx_distinct("Country") == 2
+    analytics.approx_quantiles("Total Revenue")
+    analytics.append(transformed_sales_df.iloc[2:])
+
+    assert analytics.approx_distinct("Country") == 4
+    quantiles = analytics.approx_quantiles("Total Revenue", [0, 1])
+    assert quantiles[0] == transformed_sales_df["Total Revenue"].min()
+    assert quantiles[1] == transformed_sales_df["Total Revenue"].max()
+
+
+def test_rolling_window_per_region_fills_missing_months(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df)
+
+    result = analytics.rolling_window(window=2, partition_by=["Region"])
+
+    europe = result[result["Region"] == "Europe"].reset_index(drop=True)
+    # Jan 2015 through Feb 2016 for every region
+    assert len(europe) == 14
+    assert europe.loc[0, "Total Revenue"] == 50 + 80
+    assert pd.isna(europe.loc[0, "Rolling 2M Sum"])
+    assert europe.loc[1, "Rolling 2M Sum"] == 130
+    assert europe.loc[1, "Rolling 2M Mean"] == 65
+
+
+def test_cumulative_totals_and_year_over_year(transformed_sales_df):
+    analytics = SalesAnalytics(transformed_sales_df)
+
+    cumulative = analytics.cumulative_totals()
+    assert cumulative["Cumulative Total Revenue"].iloc[-1] == transformed_sales_df["Total Revenue"].sum()
+
+    yoy = analytics.year_over_year(partition_by=["Region"])
+    europe_jan = yoy[(yoy["Region"] == "Europe") & (yoy["Year-Month"] == pd.Period("2016-01", "M"))]
+    assert europe_jan["Previous"].iloc[0] == 130
+    assert europe_jan["Change %"].iloc[0] == -100
+
+
+@pytest.mark.parametrize("report", list(REPORT_COLUMNS))
+def test_reports_from_projected_columns_match_full_data(tmp_path, report):
+    csv_path = tmp_path / "sales.csv"
+    generate_sales(500, seed=3).to_csv(csv_path, index=False)
+    steps = [DataLoader.clean_data, DataLoader.parse_dates, DataLoader.add_calculated_fields]
+    full = DataLoader(str(csv_path)).load_data(steps)
+
+    sources, fields = DataLoader.plan_columns(required_columns([report]) + ["Order ID"])
+    projected = DataLoader(str(csv_path)).load_data(
+        [DataLoader.clean_data, DataLoader.parse_dates,
+         partial(DataLoader.add_calculated_fields, fields=fields)],
+        columns=sources)
+
+    assert len(projected.columns) < len(full.columns)
+    pd.testing.assert_frame_equal(getattr(SalesAnalytics(projected), report)(),
+                                  getattr(SalesAnalytics(full), report)())
+
+
+def test_required_columns_rejects_unknown_reports():
+    with pytest.raises(ValueError, match="Unknown report"):
+        required_columns(["total_revenue_by_region", "nope"])
+
+
+def test_parallel_aggregation_matches_serial(monkeypatch):
+    monkeypatch.setattr(SalesAnalytics, "parallel_min_rows", 0)
+    data = DataLoader.add_calculated_fields(DataLoader.parse_dates(generate_sales(3000, seed=11)))
+    data.loc[data.index[:20], "Region"] = None  # missing keys: dropped, or kept in the cube
+    serial, parallel = SalesAnalytics(data, cache=False), SalesAnalytics(data, cache=False, workers=3)
+    keys = ["Region", "Item Type", "Year-Month"]
+    agg = {"Total Revenue": ["sum", "mean"], "Units Sold": "max", "Order ID": "nunique"}
+
+    pd.testing.assert_frame_equal(serial.custom_aggregation(keys, agg),
+                                  parallel.custom_aggregation(keys, agg))
+    pd.testing.assert_frame_equal(serial.cube, parallel.cube)
+    pd.testing.assert_frame_equal(serial.yearly_comparison(), parallel.yearly_comparison())
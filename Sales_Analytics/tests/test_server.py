@@ -0,0 +1,158 @@
+# tests/test_server.py
+import http.client
+import json
+import multiprocessing
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from server import SalesService, make_server
+
+
+class UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def request(connection, method, path, body=None):
+    connection.request(method, path, body=None if body is None else json.dumps(body),
+                       headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+@pytest.fixture
+def served(tmp_path, raw_sales_df):
+    csv_path = tmp_path / "sales.csv"
+    raw_sales_df.to_csv(csv_path, index=False)
+    server = make_server(SalesService(str(csv_path)), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, csv_path
+    server.shutdown()
+    server.server_close()
+
+
+def connect(server):
+    return http.client.HTTPConnection("127.0.0.1", server.server_address[1])
+
+
+def test_reports_in_records_and_columns(served):
+    server, _ = served
+    connection = connect(server)
+
+    status, health = request(connection, "GET", "/health")
+    assert (status, health["rows"]) == (200, 4)
+
+    status, payload = request(connection, "GET", "/reports/top_countries_by_revenue?n=2")
+    assert status == 200
+    assert [row["Country"] for row in payload["data"]] == ["India", "China"]
+
+    status, payload = request(connection, "POST", "/reports/revenue_by_item_type?format=columns")
+    assert payload["columns"][:2] == ["Item Type", "Total Revenue sum"]
+    assert payload["data"]["Item Type"] == ["Clothes", "Baby Food"]
+
+
+def test_stream_query_dsl(served):
+    server, _ = served
+    connection = connect(server)
+    query = {
+        "steps": [{"filter": {"op": "eq", "args": [{"col": "Region"}, "Europe"]}},
+                  {"sorted_by": "Total Revenue", "ascending": False},
+                  {"limit": 1}],
+        "columns": ["Country", "Order Date"],
+    }
+
+    status, payload = request(connection, "POST", "/query", query)
+    assert status == 200
+    assert payload["data"] == [{"Country": "Germany", "Order Date": "2015-01-10T00:00:00.000"}]
+
+    status, payload = request(connection, "POST", "/query",
+                              {"result": "distinct", "column": "Region"})
+    assert payload == {"result": ["Europe", "Asia"]}
+
+    status, payload = request(connection, "POST", "/query",
+                              {"steps": [{"filter": {"op": "nope", "args": []}}]})
+    assert status == 400 and "Invalid expression" in payload["error"]
+
+    status, payload = request(connection, "POST", "/query",
+                              {"result": "find_first",
+                               "predicate": {"op": "lt", "args": [{"col": "Units Sold"}, 0]}})
+    assert (status, payload) == (200, {"result": None})
+
+    assert request(connection, "GET", "/reports/unknown")[0] == 404
+
+
+def test_error_replies_keep_the_connection_in_sync(served):
+    server, _ = served
+    connection = connect(server)
+    query = {"steps": [{"limit": 1}]}
+
+    assert request(connection, "POST", "/query?format=bad", query)[0] == 400
+    assert request(connection, "POST", "/nowhere", query)[0] == 404
+    assert request(connection, "POST", "/reports/top_countries_by_revenue?format=bad",
+                   {"args": [1]})[0] == 400
+    status, health = request(connection, "GET", "/health")
+    assert (status, health["rows"]) == (200, 4)
+
+    status, payload = request(connection, "GET", "/reports/approx_distinct?column=%22Region%22")
+    assert (status, payload) == (200, {"result": 2})
+    assert {"approx_distinct", "approx_quantiles"} <= set(request(connection, "GET", "/reports")[1])
+
+
+def test_reload_of_several_files_never_forks(tmp_path, raw_sales_df, monkeypatch):
+    for i, (_, part) in enumerate(raw_sales_df.groupby("Region")):
+        part.to_csv(tmp_path / f"sales_{i}.csv", index=False)
+    server = make_server(SalesService(str(tmp_path / "sales_*.csv")), port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    contexts = []
+    get_context = multiprocessing.get_context
+    monkeypatch.setattr(multiprocessing, "get_context",
+                        lambda method=None: contexts.append(method) or get_context(method))
+    try:
+        status, payload = request(connect(server), "POST", "/reload")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert (status, payload["rows"]) == (200, 4)
+    assert "fork" not in contexts
+
+
+def test_concurrent_readers_and_reload(served, raw_sales_df):
+    server, csv_path = served
+
+    def total_revenue(_):
+        status, payload = request(connect(server), "GET", "/reports/total_revenue_by_region")
+        return status, sum(row["Total Revenue"] for row in payload["data"])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(total_revenue, range(16)))
+    assert set(results) == {(200, raw_sales_df["Total Revenue"].sum())}
+
+    pd.concat([raw_sales_df, raw_sales_df.head(1).assign(**{"Order ID": 5})]).to_csv(
+        csv_path, index=False)
+    status, payload = request(connect(server), "POST", "/reload")
+    assert (status, payload["rows"]) == (200, 5)
+
+
+def test_unix_socket_server(tmp_path, raw_sales_df):
+    csv_path = tmp_path / "sales.csv"
+    raw_sales_df.to_csv(csv_path, index=False)
+    socket_path = str(tmp_path / "sales.sock")
+    server = make_server(SalesService(str(csv_path)), socket_path=socket_path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        status, payload = request(UnixConnection(socket_path), "POST", "/query",
+                                  {"result": "count"})
+        assert (status, payload) == (200, {"result": 4})
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,55 @@
+# tests/test_sketches.py
+import numpy as np
+import pandas as pd
+
+from sketches import BloomFilter, HyperLogLog, KLLSketch
+
+
+def test_hyperloglog_within_error_bounds():
+    sketch = HyperLogLog().update(np.arange(100_000))
+
+    assert abs(sketch.count() - 100_000) / 100_000 < 4 * sketch.relative_error
+
+
+def test_hyperloglog_small_counts_and_merge():
+    left = HyperLogLog().update(pd.Series(["Asia", "Europe", "Asia", None]))
+    right = HyperLogLog().update(["Europe", "Africa"])
+
+    assert left.count() == 2
+    assert left.merge(right).count() == 3
+
+
+def test_kll_quantiles_within_rank_error():
+    values = np.random.default_rng(0).lognormal(10, 1, 200_000)
+    sketch = KLLSketch(seed=0)
+    for chunk in np.array_split(values, 20):
+        sketch.update(chunk)
+    ordered = np.sort(values)
+
+    for q, estimate in zip([0.1, 0.5, 0.9], sketch.quantiles([0.1, 0.5, 0.9])):
+        rank = np.searchsorted(ordered, estimate) / len(values)
+        assert abs(rank - q) < 0.0165
+    assert sum(len(level) for level in sketch.levels) < 3 * sketch.k
+
+
+def test_kll_merge_matches_single_sketch_bounds():
+    values = np.arange(100_000, dtype=float)
+    merged = KLLSketch(seed=1).update(values[:50_000]).merge(KLLSketch(seed=2).update(values[50_000:]))
+
+    assert merged.n == 100_000
+    assert abs(merged.quantile(0.5) - 50_000) < 1_650
+    assert merged.quantile(0) == 0 and merged.quantile(1) == 99_999
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(50_000, error_rate=0.01).update(np.arange(50_000))
+
+    assert bloom.contains(np.arange(50_000)).all()
+    assert bloom.contains(np.arange(50_000, 150_000)).mean() < 0.02
+
+
+def test_bloom_filter_merge():
+    left = BloomFilter(1_000).update(["Asia", "Europe"])
+    right = BloomFilter(1_000).update(["Africa"])
+
+    assert left.merge(right).contains(["Asia", "Africa"]).all()
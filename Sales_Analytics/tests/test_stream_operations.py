@@ -1,8 +1,15 @@
 # tests/test_stream_operations.py
 import pandas as pd
 import operator
+import math
+import tracemalloc
+from functools import reduce
 
+import numpy as np
+
+from backends import PandasBackend, copy_on_write_enabled
 from stream_operations import StreamOperations
+from expressions import col
 
 
 def sample_df():
@@ -116,3 +123,236 @@ def test_find_first_and_find_any():
     assert "id" in first.index
     assert any_row is not None
     assert "id" in any_row.index
+
+
+def test_expressions_match_lambda_results():
+    df = sample_df()
+    stream = StreamOperations(df)
+
+    by_expr = stream.filter((col("value") > 15) & (col("category") == "B")).collect()
+    by_lambda = stream.filter(lambda row: row["value"] > 15 and row["category"] == "B").collect()
+
+    assert by_expr.equals(by_lambda)
+    assert list(stream.map(col("value") * 2)) == list(stream.map(lambda row: row["value"] * 2))
+    assert stream.any_match(col("value") > 35)
+    assert stream.all_match(col("value") >= 10)
+    assert stream.none_match(col("value") < 0)
+
+
+def test_collect_is_isolated_from_stream_and_source():
+    df = sample_df()
+    stream = StreamOperations(df)
+
+    collected = stream.filter(col("value") > 0).collect()
+    collected.loc[:, "value"] = 0
+    collected["extra"] = 1
+
+    assert list(df["value"]) == [10, 20, 30, 40]
+    assert list(stream.collect()["value"]) == [10, 20, 30, 40]
+    assert "extra" not in stream.collect().columns
+
+
+def test_chained_operations_copy_only_the_rows_filters_keep():
+    n = 200_000
+    df = pd.DataFrame({"a": np.arange(n, dtype="float64"), "b": np.ones(n)})
+    dataset_bytes = df.memory_usage(index=False).sum()
+
+    tracemalloc.start()
+    stream = StreamOperations(df)
+    # Keep every intermediate stream alive, as a reused `stream` variable would
+    chain = [stream, stream.filter(col("a") < n // 4)]
+    for _ in range(50):
+        chain.append(chain[-1].filter(col("b") > 0).skip(1).limit(n))
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert chain[-1].count() == n // 4 - 50
+    # The selective filter copies a quarter of the rows (its mask and row
+    # positions briefly add about as much); everything after it (filters
+    # keeping every row, skip, limit) shares them
+    input_copy = 0 if copy_on_write_enabled() else dataset_bytes
+    assert held < input_copy + 0.3 * dataset_bytes
+    assert peak < input_copy + 0.5 * dataset_bytes
+
+
+def test_stream_is_isolated_from_later_changes_to_its_input():
+    df = sample_df()
+    stream = StreamOperations(df)
+
+    df.loc[0, "value"] = -1
+
+    assert stream.reduce_sum("value") == 100
+
+
+def test_match_operations_stop_at_first_decisive_chunk():
+    df = pd.DataFrame({"value": np.arange(20_000)})
+    stream = StreamOperations(df)
+    calls = []
+
+    def is_small(row):
+        calls.append(row["value"])
+        return row["value"] < 5
+
+    assert stream.any_match(is_small)
+    assert len(calls) == StreamOperations.initial_chunk_size
+
+    calls.clear()
+    assert not stream.all_match(is_small)
+    assert len(calls) == StreamOperations.initial_chunk_size
+
+    assert stream.any_match(col("value") == 19_999)
+    assert not stream.none_match(col("value") == 19_999)
+    assert stream.all_match(col("value") >= 0)
+
+
+def test_find_first_with_predicate():
+    df = sample_df()
+    stream = StreamOperations(df)
+
+    assert stream.find_first(col("value") > 25)["id"] == 3
+    assert stream.find_first(lambda row: row["category"] == "B")["id"] == 3
+    assert stream.find_first(col("value") > 100) is None
+
+
+def test_reduce_custom_vectorized_operations_match_python_fold():
+    df = sample_df()
+    stream = StreamOperations(df)
+
+    assert stream.reduce_custom("value", operator.add) == 100
+    assert stream.reduce_custom("value", operator.mul, initial=1) == 240000
+    assert stream.reduce_custom("value", min, initial=100) == 10
+    assert stream.reduce_custom("value", np.maximum, initial=0) == 40
+    # Arbitrary callables still fold in Python
+    assert stream.reduce_custom("value", lambda acc, v: acc + v * v) == 3000
+    # ...on Python scalars, so narrow integer columns cannot overflow
+    narrow = StreamOperations(pd.DataFrame({"value": np.array([30000, 30000], dtype=np.int16)}))
+    assert narrow.reduce_custom("value", lambda acc, v: acc + v) == 60000
+    assert narrow.reduce_custom("value", operator.add) == 60000
+
+
+def test_reduce_custom_folds_where_kernels_would_differ():
+    # int64 multiplication and sums past 2**63 would wrap around
+    millions = StreamOperations(pd.DataFrame({"value": [10 ** 6] * 4}))
+    assert millions.reduce_custom("value", operator.mul, initial=1) == 10 ** 24
+    huge = StreamOperations(pd.DataFrame({"value": [2 ** 62] * 4}))
+    assert huge.reduce_custom("value", operator.add) == 2 ** 64
+
+    # min and max skip NaN in a fold (comparisons with NaN are false)
+    gaps = StreamOperations(pd.DataFrame({"value": [3.0, np.nan, 1.0, 5.0]}))
+    assert gaps.reduce_custom("value", min, initial=2.0) == 1.0
+    assert gaps.reduce_custom("value", max, initial=0.0) == 5.0
+    assert math.isnan(gaps.reduce_custom("value", operator.add, initial=0.0))
+
+    assert StreamOperations(pd.DataFrame({"value": []}, dtype=float)).reduce_custom(
+        "value", operator.add) == 0
+
+
+def test_reduce_custom_vectorizes_only_exact_reductions(monkeypatch):
+    folded = []
+    column_list = PandasBackend.column_list
+    monkeypatch.setattr(PandasBackend, "column_list",
+                        lambda self, data, column: folded.append(column) or
+                        column_list(self, data, column))
+    floats = StreamOperations(pd.DataFrame({"value": [3.0, 1.0, 5.0], "count": [4, 5, 6]}))
+
+    assert floats.reduce_custom("value", min, initial=2) == 1.0
+    assert floats.reduce_custom("value", max, initial=10) == 10
+    assert floats.reduce_custom("value", operator.add) == 9.0
+    assert floats.reduce_custom("count", operator.add, initial=1) == 16
+    assert floats.reduce_custom("count", operator.mul, initial=2) == 240
+    assert floats.reduce_custom("value", operator.mul, initial=2) == 30.0
+    assert floats.reduce_custom("count", np.bitwise_or) == 7
+    assert floats.reduce_custom("value", np.subtract, initial=10) == 1.0
+    assert folded == []
+
+    # Products that could pass 2**63 fold on Python ints
+    assert floats.reduce_custom("count", operator.mul, initial=2 ** 60) == 120 * 2 ** 60
+    assert folded == ["count"]
+
+
+def test_reduce_custom_float_kernels_follow_numpy_rounding():
+    values = np.random.default_rng(1).normal(1, 0.1, 1_000)
+    stream = StreamOperations(pd.DataFrame({"value": values}))
+
+    # Products reduce left to right, exactly as the fold does
+    assert stream.reduce_custom("value", operator.mul, initial=1.0) == \
+        reduce(operator.mul, values.tolist(), 1.0)
+    # Sums are pairwise-rounded like reduce_sum, so only close to the fold
+    assert stream.reduce_custom("value", operator.add) == stream.reduce_sum("value")
+    assert math.isclose(stream.reduce_custom("value", operator.add),
+                        reduce(operator.add, values.tolist(), 0), rel_tol=1e-12)
+
+
+def test_reduce_sum_of_large_integers_does_not_overflow():
+    huge = StreamOperations(pd.DataFrame({"value": [2 ** 62] * 4}))
+    narrow = StreamOperations(pd.DataFrame({"value": np.array([30000, 30000], dtype=np.int16)}))
+
+    assert huge.reduce_sum("value") == 2 ** 64
+    assert narrow.reduce_sum("value") == 60000
+
+
+def test_reduce_sum_is_numerically_stable():
+    values = [0.1] * 1_000_000
+    stream = StreamOperations(pd.DataFrame({"amount": values}))
+
+    assert abs(stream.reduce_sum("amount") - 100_000) < 1e-6
+    assert stream.reduce_sum("amount", exact=True) == math.fsum(values)
+
+
+def test_parallel_callables_match_serial_results(monkeypatch):
+    monkeypatch.setattr(StreamOperations, "parallel_min_rows", 0)
+    df = pd.DataFrame({
+        "id": np.arange(1000),
+        "value": np.arange(1000) * 1.5,
+        "category": np.where(np.arange(1000) % 3 == 0, "A", "B"),
+    })
+    serial, parallel = StreamOperations(df), StreamOperations(df, workers=2)
+    threshold = 600
+    predicate = lambda row: row["value"] > threshold and row["category"] == "A"
+    mapper = lambda row: type(row["id"]).__name__  # rows keep the full frame's dtype
+
+    pd.testing.assert_frame_equal(serial.filter(predicate).collect(),
+                                  parallel.filter(predicate).collect())
+    pd.testing.assert_series_equal(serial.map(mapper), parallel.map(mapper))
+    assert parallel.filter(predicate).workers == 2
+    assert parallel.any_match(lambda row: row.id == 999)
+
+
+def test_parallel_whole_row_callables_match_serial_results(monkeypatch):
+    monkeypatch.setattr(StreamOperations, "parallel_min_rows", 0)
+    df = pd.DataFrame({
+        "id": np.arange(600),
+        "value": np.where(np.arange(600) % 5 == 0, np.nan, np.arange(600.0)),
+        "category": np.where(np.arange(600) % 7 == 0, None, "A"),
+    })
+    serial, parallel = StreamOperations(df), StreamOperations(df, workers=2)
+    predicate = lambda row: row.notna().all() and row["id"] > 10
+
+    pd.testing.assert_frame_equal(serial.filter(predicate).collect(),
+                                  parallel.filter(predicate).collect())
+    pd.testing.assert_series_equal(serial.map(lambda row: row.id + len(row)),
+                                   parallel.map(lambda row: row.id + len(row)))
+
+
+def test_parallel_apply_projects_declared_columns_only():
+    from parallel import parallel_apply
+
+    df = sample_df()
+
+    result = parallel_apply(lambda row: row["value"] + len(row), df, workers=2, columns=["value"])
+
+    assert list(result) == [11, 21, 31, 41]
+    assert list(parallel_apply(lambda row: len(row), df, workers=2)) == [3, 3, 3, 3]
+
+
+def test_parallel_apply_runs_in_process_from_threads():
+    import threading
+    from parallel import parallel_apply
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(
+        parallel_apply(lambda row: row["value"] * 2, sample_df(), workers=2)))
+    thread.start()
+    thread.join()
+
+    assert list(results[0]) == [20, 40, 60, 80]
@@ -0,0 +1,44 @@
+# tests/test_synthetic_data.py
+import pandas as pd
+
+from data_loader import DataLoader
+from synthetic_data import (COLUMNS, ITEM_PRICES, dataset_sizes, generate_sales,
+                            write_sales_csv)
+
+
+def test_generate_sales_matches_csv_schema_and_is_seeded():
+    df = generate_sales(2000, seed=7)
+
+    assert list(df.columns) == COLUMNS
+    assert df["Order ID"].is_unique
+    assert df["Order ID"].between(100_000_000, 999_999_999).all()
+    assert set(df["Item Type"]) <= set(ITEM_PRICES)
+    assert df["Region"].nunique() == 7
+    assert (df["Total Profit"] - (df["Total Revenue"] - df["Total Cost"])).abs().max() < 0.01
+    pd.testing.assert_frame_equal(df, generate_sales(2000, seed=7))
+    assert not df.equals(generate_sales(2000, seed=8))
+
+
+def test_chunks_have_disjoint_order_ids():
+    first = generate_sales(500, seed=1, start=0)
+    second = generate_sales(500, seed=1, start=500)
+
+    assert not set(first["Order ID"]) & set(second["Order ID"])
+
+
+def test_write_sales_csv_loads_through_pipeline(tmp_path):
+    path = write_sales_csv(str(tmp_path / "synthetic.csv"), 250, chunk_rows=100)
+    loader = DataLoader(path)
+    loader.load_data()
+
+    data = loader.apply_transformations([
+        DataLoader.clean_data, DataLoader.parse_dates, DataLoader.add_calculated_fields
+    ])
+
+    assert len(data) == 250
+    assert data["Processing Days"].between(0, 50).all()
+    assert data["Order Date"].notna().all()
+
+
+def test_dataset_sizes_parses_suffixes():
+    assert dataset_sizes("10k, 1M,2.5M,500") == [10_000, 1_000_000, 2_500_000, 500]